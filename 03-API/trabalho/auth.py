@@ -1,6 +1,8 @@
 from fastapi import Security, HTTPException, Depends
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from settings import SECRET_KEY
+from structured_logging import set_log_context
+from tracing import tracer
 import jwt
 
 security = HTTPBearer()
@@ -8,7 +10,9 @@ security = HTTPBearer()
 def get_current_user(credentials: HTTPAuthorizationCredentials = Security(security)):
     try:
         token = credentials.credentials
-        payload = jwt.decode(token, SECRET_KEY, algorithms=["HS256"])
+        with tracer.start_as_current_span("jwt.decode"):
+            payload = jwt.decode(token, SECRET_KEY, algorithms=["HS256"])
+        set_log_context(username=payload.get("username"))
         return payload
     except jwt.ExpiredSignatureError:
         raise HTTPException(status_code=401, detail="Token expirado")
@@ -24,3 +28,13 @@ def check_user_access(payload: dict = Depends(get_current_user)):
     if payload["role"] not in ["user", "admin"]:
         raise HTTPException(status_code=403, detail="Permissão negada")
     return payload
+
+def get_admin_from_header(authorization: str):
+    # Usado fora do sistema de dependências (ex.: middlewares); não lança exceções
+    if not authorization or not authorization.startswith("Bearer "):
+        return None
+    try:
+        payload = jwt.decode(authorization.split(" ")[1], SECRET_KEY, algorithms=["HS256"])
+    except jwt.InvalidTokenError:
+        return None
+    return payload if payload.get("role") == "admin" else None
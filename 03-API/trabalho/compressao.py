@@ -0,0 +1,39 @@
+import logging
+import zlib
+
+from settings import TEXT_COMPRESSION, TEXT_COMPRESSION_LEVEL
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+logger = logging.getLogger("API")
+
+CODEC_ZLIB = "zlib"
+CODEC_ZSTD = "zstd"
+
+
+def _codec_padrao() -> str:
+    if TEXT_COMPRESSION == CODEC_ZSTD and zstandard is None:
+        logger.warning("Pacote zstandard não instalado; usando zlib para compressão de textos")
+        return CODEC_ZLIB
+    return TEXT_COMPRESSION
+
+
+CODEC_PADRAO = _codec_padrao()
+
+
+def comprimir(texto: str):
+    dados = texto.encode("utf-8")
+    if CODEC_PADRAO == CODEC_ZSTD:
+        return CODEC_ZSTD, zstandard.ZstdCompressor(level=TEXT_COMPRESSION_LEVEL).compress(dados)
+    return CODEC_ZLIB, zlib.compress(dados, TEXT_COMPRESSION_LEVEL)
+
+
+def descomprimir(codec: str, dados: bytes) -> str:
+    if codec == CODEC_ZSTD:
+        if zstandard is None:
+            raise RuntimeError("Texto comprimido com zstd, mas o pacote zstandard não está instalado")
+        return zstandard.ZstdDecompressor().decompress(dados).decode("utf-8")
+    return zlib.decompress(dados).decode("utf-8")
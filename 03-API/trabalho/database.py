@@ -1,5 +1,5 @@
 from sqlalchemy import create_engine
-from models.base import Base
+from models.base import Base, LogBase
 from sqlalchemy.orm import sessionmaker
 from logging import Handler
 from contextlib import contextmanager
@@ -32,6 +32,11 @@ def get_db():
         db.close()
 
 
+def create_tables():
+    # Cria apenas as tabelas que ainda não existem
+    Base.metadata.create_all(bind=engine)
+    LogBase.metadata.create_all(bind=log_engine)
+
 def recreate_database():
     Base.metadata.drop_all(bind=engine)
     Base.metadata.create_all(bind=engine)
@@ -42,7 +47,14 @@ class DatabaseHandler(Handler):
         log_entry = LogEntry(
             timestamp=datetime.fromtimestamp(record.created),
             level=record.levelname,
-            message=record.getMessage()
+            message=record.getMessage(),
+            trace=getattr(record, "trace_id", None),
+            request_id=getattr(record, "request_id", None),
+            username=getattr(record, "username", None),
+            route=getattr(record, "route", None),
+            acordao_id=getattr(record, "acordao_id", None),
+            duration_ms=getattr(record, "duration_ms", None),
+            error_code=getattr(record, "error_code", None)
         )
         db.add(log_entry)
         db.commit()
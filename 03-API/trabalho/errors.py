@@ -0,0 +1,12 @@
+class APIError(Exception):
+    def __init__(
+        self,
+        status_code: int,
+        detail: str,
+        internal_code: str = None,
+        headers: dict = None
+    ):
+        self.status_code = status_code
+        self.detail = detail
+        self.internal_code = internal_code
+        self.headers = headers
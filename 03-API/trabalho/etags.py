@@ -0,0 +1,94 @@
+from itertools import chain
+
+from fastapi import Request, Response, status
+from sqlalchemy import event, func, select
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.orm import Session
+
+from database import SessionLocal
+from models import TableVersion
+
+# Tabelas com contador de alterações, agrupadas pela listagem que as expõe
+TABELAS_VERSIONADAS = {
+    "acordaos": "acordaos",
+    "acordao_textos": "acordaos",
+    "users": "users",
+}
+
+
+@event.listens_for(SessionLocal, "after_flush")
+def _incrementar_versoes(session: Session, flush_context):
+    # Inserções, alterações e exclusões incrementam o contador da tabela no mesmo commit,
+    # já que atualizações e exclusões não mudam o maior id
+    tabelas = {
+        TABELAS_VERSIONADAS[obj.__table__.name]
+        for obj in chain(session.new, session.deleted, (o for o in session.dirty if session.is_modified(o)))
+        if getattr(obj, "__table__", None) is not None and obj.__table__.name in TABELAS_VERSIONADAS
+    }
+    incrementar_versoes(session.connection(), tabelas)
+
+
+@event.listens_for(SessionLocal, "do_orm_execute")
+def _incrementar_versoes_em_massa(estado):
+    # query.update()/delete() e session.execute(update(...)) não passam pelo flush
+    if not (estado.is_update or estado.is_delete):
+        return None
+    tabela = TABELAS_VERSIONADAS.get(estado.statement.table.name)
+    if tabela is None:
+        return None
+    resultado = estado.invoke_statement()
+    if resultado.rowcount:
+        incrementar_versoes(estado.session.connection(), {tabela})
+    return resultado
+
+
+def incrementar_versoes(conexao, tabelas):
+    """
+    Incrementa o contador das listagens na transação de `conexao`. Alterações feitas fora
+    de uma sessão (ex.: migrações com a conexão do engine) devem chamá-la explicitamente.
+    """
+    for tabela in sorted(tabelas):
+        conexao.execute(
+            insert(TableVersion)
+            .values(table_name=tabela, version=1)
+            .on_conflict_do_update(index_elements=["table_name"], set_={"version": TableVersion.version + 1})
+        )
+
+
+def etag_tabela(db: Session, model) -> str:
+    """ETag fraca a partir do maior id e do contador de alterações, em uma única consulta indexada."""
+    tabela = model.__tablename__
+    maior_id, versao = db.execute(select(
+        select(func.max(model.id)).scalar_subquery(),
+        select(TableVersion.version).where(TableVersion.table_name == tabela).scalar_subquery()
+    )).one()
+    return f'W/"{tabela}-{maior_id or 0}-{versao or 0}"'
+
+
+def etag_insercoes(query, model) -> str:
+    """
+    ETag fraca para tabelas que só recebem inserções (logs): o maior id entre as
+    linhas filtradas determina a página e o total, sem contador de alterações.
+    """
+    maior_id = query.order_by(None).with_entities(func.max(model.id)).scalar()
+    return f'W/"{model.__tablename__}-{maior_id or 0}"'
+
+
+def nao_modificado(request: Request, etag: str) -> bool:
+    # Comparação fraca (RFC 9110): ignora o prefixo W/
+    cabecalho = request.headers.get("If-None-Match")
+    if not cabecalho:
+        return False
+    if cabecalho.strip() == "*":
+        return True
+    alvo = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == alvo for tag in cabecalho.split(","))
+
+
+def resposta_nao_modificada(etag: str) -> Response:
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=cabecalhos_cache(etag))
+
+
+def cabecalhos_cache(etag: str) -> dict:
+    # Respostas autenticadas: o cliente pode guardar, mas deve revalidar a cada uso
+    return {"ETag": etag, "Cache-Control": "private, no-cache"}
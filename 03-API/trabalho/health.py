@@ -0,0 +1,121 @@
+import asyncio
+import logging
+import time
+from datetime import datetime, timezone
+
+import httpx
+from sqlalchemy import text
+
+from database import engine, log_engine
+from settings import HEALTH_CHECK_INTERVAL, HEALTH_CHECK_TIMEOUT, LLM_HEALTH_URL
+
+logger = logging.getLogger("API")
+
+
+def _agora() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+def _select_1(db_engine):
+    with db_engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+
+
+class HealthMonitor:
+    """
+    Verifica periodicamente, em segundo plano, os bancos e o provedor do modelo.
+    As rotas de health apenas leem o último resultado, sem nenhuma E/S.
+    """
+
+    def __init__(self, interval: float, timeout: float):
+        self.interval = interval
+        self.timeout = timeout
+        self.checks = {
+            name: {"status": "unknown", "checked_at": None}
+            for name in ("database", "log_database", "llm_provider")
+        }
+        self.updated_at = None
+        self._updated_monotonic = None
+        self._task = None
+
+    async def _probe_database(self, db_engine) -> dict:
+        started = time.perf_counter()
+        try:
+            # Em thread separada para não bloquear o event loop
+            await asyncio.wait_for(asyncio.to_thread(_select_1, db_engine), self.timeout)
+            return {"status": "up", "latency_ms": round((time.perf_counter() - started) * 1000, 1), "checked_at": _agora()}
+        except Exception as e:
+            return {"status": "down", "error": str(e) or e.__class__.__name__, "checked_at": _agora()}
+
+    async def _probe_llm(self) -> dict:
+        if not LLM_HEALTH_URL:
+            return {"status": "disabled", "checked_at": _agora()}
+        started = time.perf_counter()
+        try:
+            async with httpx.AsyncClient(timeout=self.timeout) as client:
+                response = await client.get(LLM_HEALTH_URL)
+            # Qualquer resposta abaixo de 500 (inclusive 401) indica provedor alcançável
+            status = "up" if response.status_code < 500 else "down"
+            return {
+                "status": status,
+                "http_status": response.status_code,
+                "latency_ms": round((time.perf_counter() - started) * 1000, 1),
+                "checked_at": _agora()
+            }
+        except Exception as e:
+            return {"status": "down", "error": str(e) or e.__class__.__name__, "checked_at": _agora()}
+
+    async def refresh(self):
+        database, log_database, llm_provider = await asyncio.gather(
+            self._probe_database(engine),
+            self._probe_database(log_engine),
+            self._probe_llm()
+        )
+        # Substitui o dicionário inteiro para que as leituras vejam um estado consistente
+        self.checks = {
+            "database": database,
+            "log_database": log_database,
+            "llm_provider": llm_provider
+        }
+        self.updated_at = _agora()
+        self._updated_monotonic = time.monotonic()
+
+    async def _run(self):
+        while True:
+            try:
+                await self.refresh()
+            except Exception as e:
+                logger.error(f"Erro na verificação de saúde: {str(e)}")
+            await asyncio.sleep(self.interval)
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def is_stale(self) -> bool:
+        return self._updated_monotonic is None or time.monotonic() - self._updated_monotonic > 3 * self.interval
+
+    def readiness(self) -> dict:
+        checks = self.checks
+        ready = (
+            not self.is_stale()
+            and checks["database"]["status"] == "up"
+            and checks["log_database"]["status"] == "up"
+        )
+        return {
+            "status": "ready" if ready else "not_ready",
+            "checks": checks,
+            "updated_at": self.updated_at
+        }
+
+
+health_monitor = HealthMonitor(HEALTH_CHECK_INTERVAL, HEALTH_CHECK_TIMEOUT)
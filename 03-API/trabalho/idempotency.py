@@ -0,0 +1,227 @@
+import asyncio
+import hashlib
+import logging
+import time
+import uuid
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+
+from fastapi import status
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from database import SessionLocal
+import query_budget
+from errors import APIError
+from models import IdempotencyKey
+from settings import IDEMPOTENCY_LEASE_SECONDS, IDEMPOTENCY_TTL_HOURS, IDEMPOTENCY_WAIT_SECONDS
+
+logger = logging.getLogger("API")
+
+EM_ANDAMENTO = "em_andamento"
+CONCLUIDO = "concluido"
+
+# Eventos das gerações em andamento neste processo, para acordar as retentativas
+_pendentes = {}
+
+
+@dataclass
+class Reserva:
+    """Resultado de `reservar`: a reserva obtida (lease_id) ou o acórdão já gerado (acordao_id)."""
+    lease_id: str | None = None
+    acordao_id: int | None = None
+
+
+def hash_request(*partes) -> str:
+    digest = hashlib.sha256()
+    for parte in partes:
+        digest.update(parte if isinstance(parte, bytes) else str(parte).encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def _agora() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def _buscar(db: Session, username: str, key: str):
+    db.expire_all()
+    registro = db.get(IdempotencyKey, (key, username))
+    if registro is not None and registro.expires_at < _agora():
+        db.delete(registro)
+        db.commit()
+        return None
+    return registro
+
+
+def _expirada(registro: IdempotencyKey, agora: datetime) -> bool:
+    # Reserva sem renovação: o processo que gerava caiu. Linhas antigas não têm locked_until
+    locked_until = registro.locked_until or registro.created_at + timedelta(seconds=IDEMPOTENCY_LEASE_SECONDS)
+    return locked_until < agora
+
+
+def _assumir(db: Session, registro: IdempotencyKey, **condicao) -> str | None:
+    """Assume a reserva de `registro` se ela não mudou desde a leitura; retorna o novo lease_id."""
+    lease_id = uuid.uuid4().hex
+    agora = _agora()
+    atualizados = db.query(IdempotencyKey).filter(
+        IdempotencyKey.key == registro.key,
+        IdempotencyKey.username == registro.username,
+        IdempotencyKey.status == registro.status,
+        IdempotencyKey.lease_id.is_(registro.lease_id) if registro.lease_id is None
+        else IdempotencyKey.lease_id == registro.lease_id,
+        *(getattr(IdempotencyKey, campo) == valor for campo, valor in condicao.items())
+    ).update({
+        IdempotencyKey.status: EM_ANDAMENTO,
+        IdempotencyKey.acordao_id: None,
+        IdempotencyKey.lease_id: lease_id,
+        IdempotencyKey.locked_until: agora + timedelta(seconds=IDEMPOTENCY_LEASE_SECONDS)
+    }, synchronize_session=False)
+    db.commit()
+    if atualizados != 1:
+        # Outra requisição assumiu a chave antes
+        return None
+    _pendentes[(registro.username, registro.key)] = asyncio.Event()
+    return lease_id
+
+
+async def reservar(
+    db: Session, username: str, key: str, route: str, request_hash: str, substituir: int | None = None
+) -> Reserva:
+    """
+    Reserva a chave para esta requisição. Retorna a reserva (lease_id) quando o chamador deve
+    processar, ou o id do acórdão já gerado por uma requisição anterior. Uma reserva em andamento
+    cujo prazo (locked_until) não foi renovado é assumida por esta requisição.
+
+    `substituir` é o id de um acórdão já devolvido que não existe mais: a chave concluída com
+    esse acórdão é reservada de novo para uma nova geração.
+    """
+    limite = time.monotonic() + IDEMPOTENCY_WAIT_SECONDS
+    while True:
+        registro = _buscar(db, username, key)
+        if registro is None:
+            agora = _agora()
+            lease_id = uuid.uuid4().hex
+            db.query(IdempotencyKey).filter(IdempotencyKey.expires_at < agora).delete()
+            db.add(IdempotencyKey(
+                key=key,
+                username=username,
+                route=route,
+                request_hash=request_hash,
+                status=EM_ANDAMENTO,
+                lease_id=lease_id,
+                locked_until=agora + timedelta(seconds=IDEMPOTENCY_LEASE_SECONDS),
+                created_at=agora,
+                expires_at=agora + timedelta(hours=IDEMPOTENCY_TTL_HOURS)
+            ))
+            try:
+                db.commit()
+            except IntegrityError:
+                # Outra requisição reservou a mesma chave ao mesmo tempo
+                db.rollback()
+                continue
+            _pendentes[(username, key)] = asyncio.Event()
+            return Reserva(lease_id=lease_id)
+
+        if registro.route != route or registro.request_hash != request_hash:
+            raise APIError(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail="Idempotency-Key já utilizada com outra requisição",
+                internal_code="IDEMPOTENCY_KEY_MISMATCH"
+            )
+        if registro.status == CONCLUIDO:
+            if substituir is None or registro.acordao_id != substituir:
+                return Reserva(acordao_id=registro.acordao_id)
+            lease_id = _assumir(db, registro, acordao_id=substituir)
+            if lease_id is not None:
+                return Reserva(lease_id=lease_id)
+            continue
+        if _expirada(registro, _agora()):
+            lease_id = _assumir(db, registro)
+            if lease_id is not None:
+                logger.warning("Idempotency-Key com reserva expirada assumida pela retentativa")
+                return Reserva(lease_id=lease_id)
+            continue
+
+        restante = limite - time.monotonic()
+        if restante <= 0:
+            raise APIError(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="Requisição com esta Idempotency-Key ainda em processamento",
+                internal_code="IDEMPOTENCY_IN_PROGRESS",
+                headers={"Retry-After": "5"}
+            )
+        # Aguarda a geração original: pelo evento se estiver neste processo,
+        # senão consultando o banco periodicamente
+        evento = _pendentes.get((username, key))
+        try:
+            if evento is not None:
+                await asyncio.wait_for(evento.wait(), timeout=restante)
+            else:
+                await asyncio.sleep(min(1.0, restante))
+        except asyncio.TimeoutError:
+            pass
+
+
+@asynccontextmanager
+async def manter_reserva(username: str, key: str, lease_id: str):
+    """Renova o prazo da reserva enquanto a geração estiver em andamento."""
+    async def renovar():
+        # A renovação não faz parte do trabalho da requisição nem do seu orçamento de consultas
+        query_budget.ignorar()
+        while True:
+            await asyncio.sleep(IDEMPOTENCY_LEASE_SECONDS / 3)
+            # Sessão própria: a sessão da requisição está em uso pela geração
+            with SessionLocal() as db:
+                db.query(IdempotencyKey).filter(
+                    IdempotencyKey.key == key,
+                    IdempotencyKey.username == username,
+                    IdempotencyKey.lease_id == lease_id
+                ).update({
+                    IdempotencyKey.locked_until: _agora() + timedelta(seconds=IDEMPOTENCY_LEASE_SECONDS)
+                }, synchronize_session=False)
+                db.commit()
+
+    tarefa = asyncio.create_task(renovar())
+    try:
+        yield
+    finally:
+        tarefa.cancel()
+        try:
+            await tarefa
+        except asyncio.CancelledError:
+            pass
+
+
+def _da_reserva(db: Session, username: str, key: str, lease_id: str):
+    return db.query(IdempotencyKey).filter(
+        IdempotencyKey.key == key,
+        IdempotencyKey.username == username,
+        IdempotencyKey.lease_id == lease_id
+    )
+
+
+def concluir(db: Session, username: str, key: str, lease_id: str, acordao_id: int):
+    # Só altera a chave se a reserva ainda for desta requisição
+    _da_reserva(db, username, key, lease_id).update({
+        IdempotencyKey.status: CONCLUIDO,
+        IdempotencyKey.acordao_id: acordao_id,
+        IdempotencyKey.locked_until: None
+    }, synchronize_session=False)
+    db.commit()
+    _notificar(username, key)
+
+
+def liberar(db: Session, username: str, key: str, lease_id: str):
+    # Falha na geração: remove a reserva para que uma retentativa possa processar
+    db.rollback()
+    _da_reserva(db, username, key, lease_id).delete(synchronize_session=False)
+    db.commit()
+    _notificar(username, key)
+
+
+def _notificar(username: str, key: str):
+    evento = _pendentes.pop((username, key), None)
+    if evento is not None:
+        evento.set()
@@ -0,0 +1,358 @@
+import asyncio
+import hashlib
+import json
+import logging
+import math
+import os
+import random
+import threading
+import time
+from collections import defaultdict, deque
+
+import httpx
+import litellm
+from fastapi import status
+
+import metrics
+from errors import APIError
+from settings import (
+    MODEL_NAME, LLM_TIMEOUT, LLM_TRANSPORT, LLM_CASSETTE, LLM_REPLAY_MISS, LLM_REPLAY_SPEED,
+    LLM_CIRCUIT_WINDOW, LLM_CIRCUIT_MIN_CALLS,
+    LLM_CIRCUIT_ERROR_RATE, LLM_CIRCUIT_SLOW_RATE, LLM_CIRCUIT_SLOW_SECONDS,
+    LLM_CIRCUIT_OPEN_SECONDS, LLM_CIRCUIT_MAX_OPEN_SECONDS, LLM_HEALTH_URL
+)
+
+logger = logging.getLogger("API")
+
+FECHADO = "closed"
+SEMIABERTO = "half_open"
+ABERTO = "open"
+
+# Falhas que indicam problema no provedor; erros da requisição (ex.: 400) não abrem o circuito
+FALHAS_PROVEDOR = (
+    litellm.Timeout, litellm.APIConnectionError, litellm.RateLimitError,
+    litellm.ServiceUnavailableError, litellm.InternalServerError, asyncio.TimeoutError
+)
+
+# Erros em que o provedor respondeu, mas recusou a chamada: não indicam indisponibilidade e não
+# contam para o circuito. Ordem importa (subclasses antes): (exceções, status, mensagem, código)
+ERROS_REQUISICAO = (
+    (litellm.exceptions.ContextWindowExceededError, status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+     "Texto excede o limite de contexto do modelo", "LLM_CONTEXT_WINDOW_EXCEEDED"),
+    (litellm.exceptions.ContentPolicyViolationError, status.HTTP_422_UNPROCESSABLE_ENTITY,
+     "Texto recusado pela política de conteúdo do provedor", "LLM_CONTENT_POLICY"),
+    ((litellm.exceptions.BadRequestError, litellm.exceptions.UnprocessableEntityError),
+     status.HTTP_422_UNPROCESSABLE_ENTITY, "Requisição recusada pelo provedor do modelo", "LLM_BAD_REQUEST"),
+    ((litellm.exceptions.AuthenticationError, litellm.exceptions.PermissionDeniedError,
+      litellm.exceptions.NotFoundError, litellm.exceptions.BudgetExceededError),
+     status.HTTP_502_BAD_GATEWAY, "Provedor do modelo recusou a configuração da API", "LLM_PROVIDER_CONFIG_ERROR"),
+    (litellm.exceptions.APIError, status.HTTP_502_BAD_GATEWAY,
+     "Resposta inesperada do provedor do modelo", "LLM_PROVIDER_BAD_RESPONSE"),
+)
+EXCECOES_REQUISICAO = tuple(
+    excecao for excecoes, *_ in ERROS_REQUISICAO
+    for excecao in (excecoes if isinstance(excecoes, tuple) else (excecoes,))
+)
+
+LIVE = "live"
+RECORD = "record"
+REPLAY = "replay"
+
+
+class LiveTransport:
+    """Chamada real ao provedor via litellm."""
+
+    async def complete(self, messages: list, **kwargs):
+        return await litellm.acompletion(model=MODEL_NAME, messages=messages, **kwargs)
+
+
+def _cassette_key(model: str, messages: list, kwargs: dict) -> str:
+    # O timeout não altera a resposta e fica fora da chave
+    params = {k: v for k, v in kwargs.items() if k != "timeout"}
+    payload = json.dumps([model, messages, params], sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class RecordingTransport(LiveTransport):
+    """Chama o provedor e grava cada interação (resposta, uso e duração) no cassete, um JSON por linha."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+
+    async def complete(self, messages: list, **kwargs):
+        started = time.perf_counter()
+        resposta = await super().complete(messages, **kwargs)
+        duration = time.perf_counter() - started
+        dados = resposta.model_dump() if hasattr(resposta, "model_dump") else dict(resposta)
+        entrada = {
+            "key": _cassette_key(MODEL_NAME, messages, kwargs),
+            "model": MODEL_NAME,
+            "duration_seconds": round(duration, 4),
+            "usage": dados.get("usage"),
+            "response": dados,
+            "recorded_at": time.time()
+        }
+        diretorio = os.path.dirname(self.path)
+        if diretorio:
+            os.makedirs(diretorio, exist_ok=True)
+        with self._lock, open(self.path, "a") as f:
+            f.write(json.dumps(entrada, ensure_ascii=False, default=str) + "\n")
+        return resposta
+
+
+class ReplayTransport:
+    """
+    Reproduz respostas gravadas sem chamar o provedor, aguardando a duração
+    registrada de cada interação (escalada por `speed`). Interações repetidas
+    são devolvidas em rodízio, preservando a distribuição de latências.
+    """
+
+    def __init__(self, path: str, on_miss: str, speed: float):
+        self.on_miss = on_miss
+        self.speed = speed
+        self.entries = defaultdict(list)
+        self._next = defaultdict(int)
+        self.hits = 0
+        self.misses = 0
+        with open(path) as f:
+            for linha in f:
+                if linha.strip():
+                    entrada = json.loads(linha)
+                    self.entries[entrada["key"]].append(entrada)
+        self._all = [e for entradas in self.entries.values() for e in entradas]
+        logger.info(f"Cassete {path} carregado: {len(self._all)} interações")
+
+    async def complete(self, messages: list, **kwargs):
+        entradas = self.entries.get(_cassette_key(MODEL_NAME, messages, kwargs))
+        if entradas:
+            self.hits += 1
+            i = self._next[entradas[0]["key"]]
+            self._next[entradas[0]["key"]] = i + 1
+            entrada = entradas[i % len(entradas)]
+        else:
+            self.misses += 1
+            if self.on_miss != "sample" or not self._all:
+                # Não conta como falha do provedor: o circuit breaker não é afetado
+                raise APIError(
+                    status_code=status.HTTP_502_BAD_GATEWAY,
+                    detail="Interação não encontrada no cassete de respostas do modelo",
+                    internal_code="LLM_CASSETTE_MISS"
+                )
+            # Prompt ou texto alterado: resposta e latência sorteadas entre as gravadas
+            entrada = random.choice(self._all)
+        await asyncio.sleep(entrada["duration_seconds"] * self.speed)
+        return entrada["response"]
+
+
+def _criar_transporte():
+    if LLM_TRANSPORT == RECORD:
+        logger.info(f"Gravando chamadas ao modelo em {LLM_CASSETTE}")
+        return RecordingTransport(LLM_CASSETTE)
+    if LLM_TRANSPORT == REPLAY:
+        return ReplayTransport(LLM_CASSETTE, LLM_REPLAY_MISS, LLM_REPLAY_SPEED)
+    return LiveTransport()
+
+
+transport = _criar_transporte()
+
+metrics.registrar("llm_requests_total", "counter", "Chamadas ao modelo por resultado")
+metrics.registrar("llm_request_duration_seconds", "summary", "Duração das chamadas ao modelo")
+metrics.registrar("llm_circuit_state", "gauge", "Estado do circuit breaker (0 fechado, 1 semiaberto, 2 aberto)")
+metrics.registrar("llm_circuit_transitions_total", "counter", "Mudanças de estado do circuit breaker")
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker das chamadas ao modelo. Abre quando, entre as últimas chamadas,
+    a taxa de falhas ou de chamadas lentas passa do limite; enquanto aberto, as
+    requisições falham imediatamente e a recuperação é sondada em segundo plano.
+    """
+
+    def __init__(
+        self,
+        window: int,
+        min_calls: int,
+        error_rate: float,
+        slow_rate: float,
+        slow_call_seconds: float,
+        open_seconds: float,
+        max_open_seconds: float
+    ):
+        self.min_calls = min_calls
+        self.error_rate = error_rate
+        self.slow_rate = slow_rate
+        self.slow_call_seconds = slow_call_seconds
+        self.open_seconds = open_seconds
+        self.max_open_seconds = max_open_seconds
+        self.state = FECHADO
+        self.results = deque(maxlen=window)
+        self.cooldown = open_seconds
+        self.retry_at = None
+        self.reason = None
+        self.trips = 0
+        self._probe_task = None
+
+    def check(self):
+        if self.state == FECHADO:
+            return
+        metrics.incrementar("llm_requests_total", result="rejected")
+        retry_after = max(1, math.ceil(self.retry_at - time.monotonic())) if self.retry_at else 1
+        raise APIError(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Provedor do modelo indisponível. Tente novamente em instantes",
+            internal_code="LLM_CIRCUIT_OPEN",
+            headers={"Retry-After": str(retry_after)}
+        )
+
+    def record(self, success: bool, duration: float):
+        if self.state != FECHADO:
+            return
+        self.results.append((success, duration > self.slow_call_seconds))
+        if len(self.results) < self.min_calls:
+            return
+        falhas = sum(1 for ok, _ in self.results if not ok) / len(self.results)
+        lentas = sum(1 for _, lenta in self.results if lenta) / len(self.results)
+        if falhas >= self.error_rate:
+            self._open(f"taxa de falhas {falhas:.0%}")
+        elif lentas >= self.slow_rate:
+            self._open(f"taxa de chamadas lentas {lentas:.0%}")
+
+    def _transition(self, state: str):
+        self.state = state
+        metrics.incrementar("llm_circuit_transitions_total", state=state)
+
+    def _open(self, reason: str):
+        self._transition(ABERTO)
+        self.reason = reason
+        self.trips += 1
+        self.results.clear()
+        self.retry_at = time.monotonic() + self.cooldown
+        logger.warning(f"Circuito do modelo aberto ({reason}); nova sondagem em {self.cooldown:.0f}s")
+        if self._probe_task is None or self._probe_task.done():
+            self._probe_task = asyncio.create_task(self._probe_loop())
+
+    async def _probe(self) -> bool:
+        if LLM_TRANSPORT == REPLAY:
+            # Sem provedor a sondar: o circuito fecha ao fim da espera
+            return True
+        started = time.perf_counter()
+        try:
+            if LLM_HEALTH_URL:
+                async with httpx.AsyncClient(timeout=LLM_TIMEOUT) as client:
+                    resposta = await client.get(LLM_HEALTH_URL)
+                # Como no health check, respostas abaixo de 500 (inclusive 401) indicam provedor alcançável
+                if resposta.status_code >= 500:
+                    raise RuntimeError(f"HTTP {resposta.status_code}")
+            else:
+                # Direto no provedor, sem o transporte configurado: a sondagem não é gravada no cassete
+                await asyncio.wait_for(
+                    LiveTransport().complete([{"role": "user", "content": "ping"}], max_tokens=1),
+                    timeout=LLM_TIMEOUT
+                )
+        except Exception as e:
+            logger.info(f"Sondagem do modelo falhou: {str(e) or e.__class__.__name__}")
+            return False
+        return time.perf_counter() - started <= self.slow_call_seconds
+
+    async def _probe_loop(self):
+        # Apenas esta tarefa testa o provedor no estado semiaberto; as requisições seguem rejeitadas
+        while self.state != FECHADO:
+            await asyncio.sleep(max(0.0, self.retry_at - time.monotonic()))
+            self._transition(SEMIABERTO)
+            if await self._probe():
+                self.cooldown = self.open_seconds
+                self.retry_at = None
+                self.reason = None
+                self._transition(FECHADO)
+                logger.info("Circuito do modelo fechado: provedor recuperado")
+                return
+            self.cooldown = min(self.cooldown * 2, self.max_open_seconds)
+            self.retry_at = time.monotonic() + self.cooldown
+            self._transition(ABERTO)
+
+    def snapshot(self) -> dict:
+        return {
+            "state": self.state,
+            "reason": self.reason,
+            "retry_in_seconds": round(max(0.0, self.retry_at - time.monotonic()), 1) if self.retry_at else None,
+            "recent_calls": len(self.results),
+            "trips": self.trips
+        }
+
+
+circuit_breaker = CircuitBreaker(
+    window=LLM_CIRCUIT_WINDOW,
+    min_calls=LLM_CIRCUIT_MIN_CALLS,
+    error_rate=LLM_CIRCUIT_ERROR_RATE,
+    slow_rate=LLM_CIRCUIT_SLOW_RATE,
+    slow_call_seconds=LLM_CIRCUIT_SLOW_SECONDS,
+    open_seconds=LLM_CIRCUIT_OPEN_SECONDS,
+    max_open_seconds=LLM_CIRCUIT_MAX_OPEN_SECONDS
+)
+
+
+@metrics.coletor
+def _estado_circuito():
+    return [("llm_circuit_state", {}, [FECHADO, SEMIABERTO, ABERTO].index(circuit_breaker.state))]
+
+
+def escapar(texto: str) -> str:
+    return texto.replace('"', '\\"').replace('`', '\\`')
+
+
+def mensagens_geracao(texto_prompt: str, texto: str) -> list:
+    return [
+        {"role": "system", "content": escapar(texto_prompt)},
+        {"role": "user", "content": f"Gere uma ementa para este acórdão: {escapar(texto)}"}
+    ]
+
+
+def mensagens_verificacao(texto_prompt: str, ementa: str) -> list:
+    return [
+        {"role": "system", "content": escapar(texto_prompt)},
+        {"role": "user", "content": f"Verifique a seguinte ementa: {escapar(ementa)}"}
+    ]
+
+
+def mensagens_geracao_verificada(texto_prompt: str, instrucoes: str, texto: str) -> list:
+    # Mesmo prompt da geração, acrescido da análise e do formato JSON da resposta
+    return [
+        {"role": "system", "content": escapar(f"{texto_prompt}\n\n{instrucoes}")},
+        {"role": "user", "content": f"Gere e verifique uma ementa para este acórdão: {escapar(texto)}"}
+    ]
+
+
+async def completar(messages: list, **kwargs):
+    """Chama o modelo através do circuit breaker, com timeout."""
+    circuit_breaker.check()
+    started = time.perf_counter()
+    try:
+        resposta = await transport.complete(messages, timeout=LLM_TIMEOUT, **kwargs)
+    except FALHAS_PROVEDOR as e:
+        duration = time.perf_counter() - started
+        circuit_breaker.record(False, duration)
+        metrics.incrementar("llm_requests_total", result="error")
+        metrics.observar("llm_request_duration_seconds", duration)
+        logger.error(f"Falha no provedor do modelo: {str(e) or e.__class__.__name__}")
+        raise APIError(
+            status_code=status.HTTP_502_BAD_GATEWAY,
+            detail="Falha ao consultar o provedor do modelo",
+            internal_code="LLM_PROVIDER_ERROR"
+        )
+    except EXCECOES_REQUISICAO as e:
+        # O provedor respondeu: a chamada não conta como falha para o circuito
+        duration = time.perf_counter() - started
+        metrics.incrementar("llm_requests_total", result="error")
+        metrics.observar("llm_request_duration_seconds", duration)
+        status_code, detail, internal_code = next(
+            (codigo, mensagem, interno) for excecoes, codigo, mensagem, interno in ERROS_REQUISICAO
+            if isinstance(e, excecoes)
+        )
+        logger.error(f"Chamada recusada pelo provedor do modelo ({internal_code}): {str(e) or e.__class__.__name__}")
+        raise APIError(status_code=status_code, detail=detail, internal_code=internal_code)
+    duration = time.perf_counter() - started
+    circuit_breaker.record(True, duration)
+    metrics.incrementar("llm_requests_total", result="success")
+    metrics.observar("llm_request_duration_seconds", duration)
+    return resposta
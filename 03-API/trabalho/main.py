@@ -1,52 +1,115 @@
-from fastapi import FastAPI, Depends, UploadFile, File, Query, Path, status, Request
+from fastapi import FastAPI, Depends, UploadFile, File, Query, Path, Header, status, Request, Response
 from fastapi.openapi.utils import get_openapi
 from fastapi.params import Body
 from fastapi.routing import APIRouter
+from fastapi.concurrency import run_in_threadpool
 import logging
 import jwt
-import litellm
 import PyPDF2
 from datetime import datetime, timedelta, timezone
-from sqlalchemy.orm import Session
+from sqlalchemy import or_
+from sqlalchemy.orm import Session, defer
 from passlib.context import CryptContext
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse, RedirectResponse
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import JSONResponse, ORJSONResponse, PlainTextResponse, RedirectResponse
+from typing import List
+from pydantic import ValidationError
 import textwrap
+import time
+import uuid
+from contextlib import asynccontextmanager
 
 
 # Import settings and database
 from models.acordaos import AcordaoRequest
 from settings import (
     API_TITLE, SECRET_KEY, MODEL_NAME, INSTALL_KEY,
-    TOKEN_EXPIRE_HOURS, LOG_LEVEL, LOG_FORMAT
+    TOKEN_EXPIRE_HOURS, LOG_LEVEL, LOG_FORMAT, LOG_JSON, GZIP_MINIMUM_SIZE,
+    REPROCESSING_TOKENS_PER_HOUR
 )
 
 
 from database import DatabaseHandler, get_db, get_log_db
+from migrations import atualizar_esquema
+from prompts import carregar_prompt
+from normalizacao import TextoNormalizado, normalizar_paginas, normalizar_texto
 from models.logs import LogEntry
 
 from models import (
-    User, Acordao
+    User, Acordao, EmentaAnterior, ReprocessingCampaign
 )
+from models.acordaos import STATUS_CONCLUIDO
 
-from auth import check_admin_access, check_user_access
+from auth import check_admin_access, check_user_access, get_admin_from_header
+from errors import APIError
+from rate_limit import admission, estimar_tokens
+import idempotency
+from etags import etag_tabela, etag_insercoes, nao_modificado, resposta_nao_modificada, cabecalhos_cache
+from tracing import tracer, configure_tracing, shutdown_tracing
+from opentelemetry import propagate
+from opentelemetry import trace
+from opentelemetry.trace import SpanKind
+from structured_logging import (
+    ContextFilter, JsonFormatter, start_log_context, reset_log_context, set_log_context
+)
+from health import health_monitor
+import query_budget
+from query_budget import orcamento
+from uploads import upload_store, carregar_paginas, guardar_paginas
+from reprocessamento import reprocessador, PAUSADA, EM_ANDAMENTO
+from llm import (
+    circuit_breaker, completar, mensagens_geracao, mensagens_verificacao, mensagens_geracao_verificada
+)
+import metrics
+from metrics import renderizar as renderizar_metricas
+from profiling import (
+    profiling_requested, start_profiler, finish_profiler, save_profile, list_profiles, read_profile
+)
 
 from models.schemas import (
     LoginRequest, UserCreate, UserUpdate, 
-    AcordaoCreate, AcordaoFeedback, BootstrapRequest
+    AcordaoCreate, AcordaoFeedback, BootstrapRequest,
+    AcordaoResponse, AcordaoList, MessageResponse, TokenResponse,
+    AuthStatusResponse, UserResponse, UserList, LogList, RateLimitUsage,
+    ProfileInfo, HealthResponse, LivenessResponse, ReadinessResponse,
+    CampanhaCreate, CampanhaResponse, EmentaAnteriorResponse, EmentaVerificada
 )
 
 # Configure logging
 logger = logging.getLogger("API")
 logger.setLevel(getattr(logging, LOG_LEVEL))
 console_handler = logging.StreamHandler()
-console_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+console_handler.setFormatter(JsonFormatter() if LOG_JSON else logging.Formatter(LOG_FORMAT))
+logger.addFilter(ContextFilter())
 logger.addHandler(console_handler)
 logger.addHandler(DatabaseHandler())
 
 
 sao_paulo_tz = timezone(timedelta(hours=-3))
 
+MODO_COMBINADO = "combinado"
+MODO_DUAS_ETAPAS = "duas_etapas"
+metrics.registrar("ementa_gerar_verificar_total", "counter", "Gerações com verificação por modo (chamada única ou duas etapas)")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    configure_tracing()
+    atualizar_esquema()
+    health_monitor.start()
+    # Retoma a campanha de reprocessamento interrompida pelo desligamento, se houver
+    reprocessador.start()
+    yield
+    await reprocessador.stop()
+    await health_monitor.stop()
+    shutdown_tracing()
+
+async def route_log_context(request: Request):
+    # Registra o template da rota (ex.: /v1/acordaos/{acordao_id}) nos logs da requisição
+    route = request.scope.get("route")
+    if route is not None:
+        set_log_context(route=route.path)
+
 # Initialize FastAPI with metadata
 app = FastAPI(
     title=API_TITLE,
@@ -68,6 +131,9 @@ app = FastAPI(
     license_info={
         "name": "MIT",
     },
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,
+    dependencies=[Depends(route_log_context)],
 )
 
 v1_router = APIRouter(prefix="/v1")
@@ -79,35 +145,31 @@ pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 # Define constants
 ACORDAO_NOT_FOUND = "Acórdão não encontrado"
 
-class APIError(Exception):
-    def __init__(
-        self,
-        status_code: int,
-        detail: str,
-        internal_code: str = None
-    ):
-        self.status_code = status_code
-        self.detail = detail
-        self.internal_code = internal_code
-
 @app.exception_handler(APIError)
 async def api_error_handler(request: Request, exc: APIError) -> JSONResponse:
-    logger.error(f"APIError: {exc.status_code} - {exc.detail} ({exc.internal_code})")
+    logger.error(
+        f"APIError: {exc.status_code} - {exc.detail} ({exc.internal_code})",
+        extra={"error_code": exc.internal_code}
+    )
     return JSONResponse(
         status_code=exc.status_code,
         content={
             "detail": exc.detail,
             "internal_code": exc.internal_code
-        }
+        },
+        headers=exc.headers
     )
 
 @v1_router.post("/auth/login", 
                 description="Autenticar usuário e obter token de acesso",
-                tags=["Autenticação"])
+                tags=["Autenticação"],
+                response_model=TokenResponse)
+@orcamento(1)
 async def login(
     credentials: LoginRequest,
     db: Session = Depends(get_db)
 ):
+    set_log_context(username=credentials.usuario)
     logger.debug(f"Tentativa de login para usuário: {credentials.usuario}")
     user = db.query(User).filter(User.username == credentials.usuario).first()
     if not user or not pwd_context.verify(credentials.senha, user.password):
@@ -129,7 +191,9 @@ async def login(
 
 @v1_router.post("/auth/refresh",
                 description="Renovar token JWT",
-                tags=["Autenticação"])
+                tags=["Autenticação"],
+                response_model=TokenResponse)
+@orcamento(1)
 async def refresh_token(
     request: Request,
     db: Session = Depends(get_db)
@@ -181,7 +245,8 @@ async def refresh_token(
 
 @v1_router.get("/auth/status",
                description="Verificar status da autenticação",
-               tags=["Autenticação"])
+               tags=["Autenticação"],
+               response_model=AuthStatusResponse)
 async def auth_status(
     current_user: dict = Depends(check_user_access)
 ):
@@ -195,77 +260,263 @@ async def auth_status(
         "expires": exp_datetime.isoformat()
     }
 
+async def executar_idempotente(db, current_user, idempotency_key, route, request_hash, gerar):
+    # Sem Idempotency-Key, cada requisição gera normalmente
+    if not idempotency_key:
+        return await gerar()
+
+    username = current_user["username"]
+    reserva = await idempotency.reservar(db, username, idempotency_key, route, request_hash)
+    while reserva.acordao_id is not None:
+        acordao = db.query(Acordao).filter(Acordao.id == reserva.acordao_id).first()
+        if acordao:
+            set_log_context(acordao_id=reserva.acordao_id)
+            logger.info(f"Retentativa com Idempotency-Key reaproveitou o acórdão {reserva.acordao_id}")
+            return acordao
+        # O acórdão da geração anterior foi excluído: reserva a chave de novo antes de gerar
+        reserva = await idempotency.reservar(
+            db, username, idempotency_key, route, request_hash, substituir=reserva.acordao_id
+        )
+    try:
+        async with idempotency.manter_reserva(username, idempotency_key, reserva.lease_id):
+            novo_acordao = await gerar()
+    except Exception:
+        idempotency.liberar(db, username, idempotency_key, reserva.lease_id)
+        raise
+    idempotency.concluir(db, username, idempotency_key, reserva.lease_id, novo_acordao.id)
+    db.refresh(novo_acordao)
+    return novo_acordao
+
+def normalizar(normalizacao, response: Response) -> TextoNormalizado:
+    # Remove cabeçalhos, rodapés e outros trechos repetidos antes de enviar ao modelo
+    with tracer.start_as_current_span("text.normalize") as span:
+        normalizado = normalizacao()
+        span.set_attribute("normalize.tokens_saved", normalizado.tokens_economizados)
+    logger.info(
+        f"Normalização economizou {normalizado.tokens_economizados} de {normalizado.tokens_originais} "
+        f"tokens estimados ({normalizado.linhas_removidas} linhas removidas)"
+    )
+    response.headers["X-Tokens-Saved"] = str(normalizado.tokens_economizados)
+    return normalizado
+
+async def _chamar_modelo(messages: list, current_user: dict, **kwargs):
+    # Admissão pela cota do usuário, vaga de concorrência e ajuste pelo uso real
+    tokens_estimados = estimar_tokens(*(m["content"] for m in messages))
+    circuit_breaker.check()
+    admission.admit(current_user["username"], tokens_estimados)
+    try:
+        async with admission.slot():
+            with tracer.start_as_current_span("llm.completion", attributes={"llm.model": MODEL_NAME}) as span:
+                resposta = await completar(messages, **kwargs)
+                span.set_attribute("llm.total_tokens", resposta.get("usage", {}).get("total_tokens") or 0)
+    except BaseException:
+        # A chamada não consumiu a cota do usuário: devolve o débito da admissão
+        admission.refund(current_user["username"], tokens_estimados)
+        raise
+    admission.settle(current_user["username"], tokens_estimados, resposta.get("usage", {}).get("total_tokens"))
+    logger.debug(f"Resposta do modelo: {resposta['choices'][0]['message']['content'][:100]}...")
+    return resposta["choices"][0]["message"]["content"]
+
+def _registrar_acordao(db: Session, current_user: dict, acordao: str, ementa: str, prompt_version: str, **campos):
+    novo_acordao = Acordao(
+        texto=acordao,
+        ementa=ementa,
+        created_by=current_user["username"],
+        model=MODEL_NAME,
+        prompt_version=prompt_version,
+        status=STATUS_CONCLUIDO,
+        **campos
+    )
+    with tracer.start_as_current_span("db.commit"):
+        db.add(novo_acordao)
+        db.commit()
+        db.refresh(novo_acordao)
+    set_log_context(acordao_id=novo_acordao.id)
+    logger.info(f"Acórdão {novo_acordao.id} registrado")
+    return novo_acordao
+
+async def _gerar_ementa(acordao: str, texto_modelo: str, db: Session, current_user: dict, pdf_sha256: str = None):
+    # acordao é o texto original, armazenado; texto_modelo é a versão normalizada enviada ao modelo
+    logger.debug("Iniciando geração de ementa")
+    with tracer.start_as_current_span("prompt.load"):
+        texto_prompt, prompt_version = carregar_prompt("prompt.md")
+
+    ementa = await _chamar_modelo(mensagens_geracao(texto_prompt, texto_modelo), current_user)
+    logger.info("Ementa gerada com sucesso pelo modelo")
+    return _registrar_acordao(db, current_user, acordao, ementa, prompt_version, pdf_sha256=pdf_sha256)
+
+async def _verificar(ementa: str, current_user: dict) -> str:
+    with tracer.start_as_current_span("prompt.load"):
+        texto_prompt, _ = carregar_prompt("prompt_verificacao.md")
+    return await _chamar_modelo(mensagens_verificacao(texto_prompt, ementa), current_user)
+
+async def _gerar_e_verificar(acordao: str, texto_modelo: str, db: Session, current_user: dict, response: Response):
+    logger.debug("Iniciando geração de ementa com verificação")
+    with tracer.start_as_current_span("prompt.load"):
+        texto_prompt, prompt_version = carregar_prompt("prompt.md")
+        instrucoes, _ = carregar_prompt("prompt_gerar_verificar.md")
+
+    # Uma única chamada devolve ementa e análise em JSON
+    conteudo = await _chamar_modelo(
+        mensagens_geracao_verificada(texto_prompt, instrucoes, texto_modelo), current_user,
+        response_format={"type": "json_object"}
+    )
+    try:
+        resultado = EmentaVerificada.model_validate_json(conteudo)
+        ementa, verificacao, modo = resultado.ementa, resultado.verificacao, MODO_COMBINADO
+    except ValidationError as e:
+        # Saída fora do formato: recorre às duas chamadas separadas
+        logger.warning(
+            f"Resposta estruturada inválida ({e.error_count()} erros); gerando e verificando em duas etapas",
+            extra={"error_code": "LLM_STRUCTURED_OUTPUT_INVALID"}
+        )
+        ementa = await _chamar_modelo(mensagens_geracao(texto_prompt, texto_modelo), current_user)
+        verificacao = await _verificar(ementa, current_user)
+        modo = MODO_DUAS_ETAPAS
+    metrics.incrementar("ementa_gerar_verificar_total", mode=modo)
+    trace.get_current_span().set_attribute("ementa.mode", modo)
+    response.headers["X-Ementa-Mode"] = modo
+    logger.info(f"Ementa gerada e verificada pelo modelo ({modo})")
+    # A versão registrada é a do prompt.md: a ementa segue as mesmas regras da geração simples
+    return _registrar_acordao(db, current_user, acordao, ementa, prompt_version, verificacao=verificacao)
+
 @v1_router.post("/acordao/gerar",
                 description="Gerar ementa a partir de texto do acórdão",
-                tags=["Ementas"])
+                tags=["Ementas"],
+                response_model=AcordaoResponse)
+@orcamento(11)
 async def gerar_ementa(
+    response: Response,
     acordao: str = Body(..., description="Texto do acórdão", min_length=3, media_type="text/plain"),
     db: Session = Depends(get_db),
-    _: dict = Depends(check_user_access)
+    current_user: dict = Depends(check_user_access),
+    idempotency_key: str = Header(
+        default=None,
+        alias="Idempotency-Key",
+        max_length=255,
+        description="Chave para que retentativas reaproveitem a mesma geração"
+    )
     ):
-    logger.debug("Iniciando geração de ementa")
-    with open("prompt.md", "r") as f:
-        texto_prompt = f.read()
-        
-    resposta = litellm.completion(model=MODEL_NAME, messages=[
-        {"role": "system", "content": texto_prompt.replace('"', '\\"').replace('`', '\\`')},
-        {"role": "user", "content": f"Gere uma ementa para este acórdão: {acordao.replace('"', '\\"').replace('`', '\\`')}"}
-    ])
-    logger.info("Ementa gerada com sucesso pelo modelo")
-    logger.debug(f"Resposta do modelo: {resposta['choices'][0]['message']['content'][:100]}...")
-    ementa = resposta["choices"][0]["message"]["content"]
-    novo_acordao = Acordao(texto=acordao, ementa=ementa)
-    db.add(novo_acordao)
-    db.commit()
-    db.refresh(novo_acordao)
-    return novo_acordao
+    normalizado = normalizar(lambda: normalizar_texto(acordao), response)
+    # O hash usa o texto normalizado: variações só de espaçamento ou paginação contam como a mesma requisição
+    return await executar_idempotente(
+        db, current_user, idempotency_key, "/v1/acordao/gerar",
+        idempotency.hash_request(normalizado.texto),
+        lambda: _gerar_ementa(acordao, normalizado.texto, db, current_user)
+    )
+
+@v1_router.post("/acordao/gerar_verificar",
+                description="Gerar ementa a partir de texto do acórdão e verificá-la com o Manual de Padronização de Ementas do CNJ em uma única chamada ao modelo",
+                tags=["Ementas"],
+                response_model=AcordaoResponse)
+@orcamento(11)
+async def gerar_verificar_ementa(
+    response: Response,
+    acordao: str = Body(..., description="Texto do acórdão", min_length=3, media_type="text/plain"),
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(check_user_access),
+    idempotency_key: str = Header(
+        default=None,
+        alias="Idempotency-Key",
+        max_length=255,
+        description="Chave para que retentativas reaproveitem a mesma geração"
+    )
+    ):
+    normalizado = normalizar(lambda: normalizar_texto(acordao), response)
+    return await executar_idempotente(
+        db, current_user, idempotency_key, "/v1/acordao/gerar_verificar",
+        idempotency.hash_request(normalizado.texto),
+        lambda: _gerar_e_verificar(acordao, normalizado.texto, db, current_user, response)
+    )
 
 @v1_router.post("/ementa/verificar",
                 description="Verificar se ementa está de acordo com o Manual de Padronização de Ementas do CNJ",
-                tags=["Ementas"])
+                tags=["Ementas"],
+                response_model=str)
 async def verificar_ementa(
     texto: str = Body(..., description="Texto da ementa", min_length=3, media_type="text/plain"),
     db: Session = Depends(get_db),
-    _: dict = Depends(check_user_access)
+    current_user: dict = Depends(check_user_access)
     ):
     logger.debug("Iniciando verificação de ementa")
-    with open("prompt_verificacao.md", "r") as f:
-        texto_prompt = f.read()
-        
-    resposta = litellm.completion(model=MODEL_NAME, messages=[
-        {"role": "system", "content": texto_prompt.replace('"', '\\"').replace('`', '\\`')},
-        {"role": "user", "content": f"Verifique a seguinte ementa: {texto.replace('"', '\\"').replace('`', '\\`')}"}
-    ])
+    verificacao = await _verificar(texto, current_user)
     logger.info("Ementa verificada com sucesso pelo modelo")
-    logger.debug(f"Resposta do modelo: {resposta['choices'][0]['message']['content'][:100]}...")
-    ementa = resposta["choices"][0]["message"]["content"]
-    #novo_acordao = Acordao(texto=texto, ementa=ementa)
-    #db.add(novo_acordao)
-    #db.commit()
-    #db.refresh(novo_acordao)
-    return ementa
+    return verificacao
 
 
 @v2_router.post("/acordao/gerar_pdf",
                 description="Gerar ementa a partir de arquivo PDF do acórdão",
-                tags=["Ementas"])
+                tags=["Ementas"],
+                response_model=AcordaoResponse)
+@orcamento(10)
 async def gerar_ementa_pdf(
+    response: Response,
     file: UploadFile = File(..., description="Arquivo PDF do acórdão"),
     db: Session = Depends(get_db),
-    _: dict = Depends(check_user_access)
+    current_user: dict = Depends(check_user_access),
+    idempotency_key: str = Header(
+        default=None,
+        alias="Idempotency-Key",
+        max_length=255,
+        description="Chave para que retentativas reaproveitem a mesma geração"
+    )
 ):
-    logger.debug(f"Iniciando processamento do PDF: {file.filename}")
-    pdf_reader = PyPDF2.PdfReader(file.file)
-    texto_extraido = "".join([page.extract_text() for page in pdf_reader.pages if page.extract_text()])
-    if not texto_extraido.strip():
-        logger.info(f"PDF sem texto extraível: {file.filename}")
-        raise APIError(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="O PDF enviado não contém texto extraível.",
-            internal_code="PDF_NO_TEXT"
+    # Hash calculado durante a gravação no armazenamento endereçado por conteúdo; o arquivo fica reservado
+    pdf_sha256, tamanho = await upload_store.save(file)
+
+    async def gerar():
+        logger.debug(f"Iniciando processamento do PDF: {file.filename} ({pdf_sha256[:12]})")
+        _, prompt_version = carregar_prompt("prompt.md")
+        existente = (
+            db.query(Acordao)
+            .filter(
+                Acordao.pdf_sha256 == pdf_sha256,
+                Acordao.model == MODEL_NAME,
+                Acordao.prompt_version == prompt_version,
+                Acordao.status == STATUS_CONCLUIDO
+            )
+            .order_by(Acordao.id.desc())
+            .first()
         )
-    logger.info(f"PDF processado com sucesso: {file.filename}")
-    return await gerar_ementa(texto=texto_extraido, db=db, _=_)
+        if existente:
+            # Mesmo arquivo, modelo e prompt: reaproveita a ementa já gerada
+            set_log_context(acordao_id=existente.id)
+            logger.info(f"PDF já processado; reaproveitando o acórdão {existente.id}")
+            return existente
+
+        paginas = carregar_paginas(db, pdf_sha256)
+        if paginas is None:
+            with tracer.start_as_current_span("pdf.extract", attributes={"pdf.size": tamanho}) as span:
+                # Leitura e extração síncronas (PyPDF2) fora do event loop
+                paginas = await run_in_threadpool(extrair_paginas, upload_store.path(pdf_sha256))
+                span.set_attribute("pdf.pages", len(paginas))
+            guardar_paginas(db, pdf_sha256, paginas)
+        else:
+            logger.debug(f"Texto do PDF {pdf_sha256[:12]} obtido do cache de extração")
+        normalizado = normalizar(lambda: normalizar_paginas(paginas), response)
+        if not normalizado.texto:
+            logger.info(f"PDF sem texto extraível: {file.filename}")
+            raise APIError(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="O PDF enviado não contém texto extraível.",
+                internal_code="PDF_NO_TEXT"
+            )
+        logger.info(f"PDF processado com sucesso: {file.filename}")
+        # Páginas separadas por form feed, para que o texto armazenado possa ser normalizado de novo
+        return await _gerar_ementa("\f".join(paginas), normalizado.texto, db, current_user, pdf_sha256=pdf_sha256)
+
+    try:
+        return await executar_idempotente(
+            db, current_user, idempotency_key, "/v2/acordao/gerar_pdf",
+            idempotency.hash_request(pdf_sha256), gerar
+        )
+    finally:
+        # O arquivo ficou reservado desde a gravação, para não ser removido antes da extração
+        await run_in_threadpool(upload_store.liberar, pdf_sha256)
+
+def extrair_paginas(caminho: str) -> list:
+    pdf_reader = PyPDF2.PdfReader(caminho)
+    return [page.extract_text() or "" for page in pdf_reader.pages]
 
 def init_database(db: Session = Depends(get_db)):
     logger.info("Iniciando inicialização do banco de dados")
@@ -293,7 +544,8 @@ def init_database(db: Session = Depends(get_db)):
 
 @app.post("/bootstrap",
           description="Inicializar o sistema com usuário admin",
-          tags=["Administração"])
+          tags=["Administração"],
+          response_model=MessageResponse)
 async def bootstrap_admin(
     request: BootstrapRequest,
     db: Session = Depends(get_db)
@@ -333,11 +585,119 @@ async def bootstrap_admin(
             internal_code="DB_INIT_ERROR"
         )
 
+@v1_router.get("/admin/limites",
+               description="Consultar uso atual dos limites de requisições ao modelo",
+               tags=["Administração"],
+               response_model=RateLimitUsage)
+async def get_rate_limits(
+    _: dict = Depends(check_admin_access)
+):
+    logger.debug("Consultando uso dos limites de requisições")
+    return admission.usage()
+
+@v1_router.get("/admin/profiles",
+               description="Listar perfis de execução de requisições",
+               tags=["Administração"],
+               response_model=List[ProfileInfo])
+async def get_profiles(
+    _: dict = Depends(check_admin_access)
+):
+    return list_profiles()
+
+@v1_router.get("/admin/profiles/{profile_id}",
+               description="Obter perfil de execução no formato folded (flame graph)",
+               tags=["Administração"],
+               response_class=PlainTextResponse)
+async def get_profile(
+    profile_id: str = Path(..., description="ID do perfil"),
+    _: dict = Depends(check_admin_access)
+):
+    profile = read_profile(profile_id)
+    if profile is None:
+        raise APIError(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Perfil não encontrado",
+            internal_code="PROFILE_NOT_FOUND"
+        )
+    return PlainTextResponse(profile)
+
+@v1_router.post("/admin/reprocessamentos",
+                description="Iniciar campanha de reprocessamento das ementas geradas com versões anteriores do prompt",
+                tags=["Administração"],
+                response_model=CampanhaResponse)
+@orcamento(4)
+async def create_reprocessing_campaign(
+    campanha: CampanhaCreate,
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(check_admin_access)
+):
+    return reprocessador.criar_campanha(
+        db, current_user["username"], campanha.tokens_por_hora or REPROCESSING_TOKENS_PER_HOUR
+    )
+
+@v1_router.get("/admin/reprocessamentos",
+               description="Listar campanhas de reprocessamento",
+               tags=["Administração"],
+               response_model=List[CampanhaResponse])
+@orcamento(1)
+async def list_reprocessing_campaigns(
+    db: Session = Depends(get_db),
+    _: dict = Depends(check_admin_access)
+):
+    return db.query(ReprocessingCampaign).order_by(ReprocessingCampaign.id.desc()).all()
+
+@v1_router.get("/admin/reprocessamentos/{campanha_id}",
+               description="Consultar progresso de uma campanha de reprocessamento",
+               tags=["Administração"],
+               response_model=CampanhaResponse)
+@orcamento(1)
+async def get_reprocessing_campaign(
+    campanha_id: int = Path(..., description="ID da campanha", gt=0),
+    db: Session = Depends(get_db),
+    _: dict = Depends(check_admin_access)
+):
+    campanha = db.get(ReprocessingCampaign, campanha_id)
+    if campanha is None:
+        raise APIError(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Campanha não encontrada",
+            internal_code="CAMPAIGN_NOT_FOUND"
+        )
+    return campanha
+
+@v1_router.post("/admin/reprocessamentos/{campanha_id}/pausar",
+                description="Pausar campanha de reprocessamento",
+                tags=["Administração"],
+                response_model=CampanhaResponse)
+@orcamento(3)
+async def pause_reprocessing_campaign(
+    campanha_id: int = Path(..., description="ID da campanha", gt=0),
+    db: Session = Depends(get_db),
+    _: dict = Depends(check_admin_access)
+):
+    return reprocessador.alterar_status(db, campanha_id, PAUSADA)
+
+@v1_router.post("/admin/reprocessamentos/{campanha_id}/retomar",
+                description="Retomar campanha de reprocessamento pausada",
+                tags=["Administração"],
+                response_model=CampanhaResponse)
+@orcamento(3)
+async def resume_reprocessing_campaign(
+    campanha_id: int = Path(..., description="ID da campanha", gt=0),
+    db: Session = Depends(get_db),
+    _: dict = Depends(check_admin_access)
+):
+    return reprocessador.alterar_status(db, campanha_id, EM_ANDAMENTO)
+
 # CRUD Operations - Users
 @v1_router.get("/users", 
                description="Listar todos os usuários",
-               tags=["Usuários"])
+               tags=["Usuários"],
+               response_model=UserList)
+@orcamento(3)
 async def list_users(
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db),
     _: dict = Depends(check_user_access),
     skip: int = Query(
@@ -356,6 +716,10 @@ async def list_users(
 ):
     logger.debug(f"Listando usuários: skip={skip}, limit={limit}")
     logger.info("Listando usuários")
+    etag = etag_tabela(db, User)
+    if nao_modificado(request, etag):
+        return resposta_nao_modificada(etag)
+    response.headers.update(cabecalhos_cache(etag))
     users = db.query(User).offset(skip).limit(limit).all()
     total = db.query(User).count()
     return {
@@ -367,7 +731,9 @@ async def list_users(
 
 @v1_router.get("/users/{user_id}", 
                description="Obter detalhes de um usuário",
-               tags=["Usuários"])
+               tags=["Usuários"],
+               response_model=UserResponse)
+@orcamento(1)
 async def get_user(
     user_id: int = Path(
         ..., 
@@ -391,7 +757,9 @@ async def get_user(
 
 @v1_router.post("/users", 
                 description="Criar novo usuário",
-                tags=["Usuários"])
+                tags=["Usuários"],
+                response_model=UserResponse)
+@orcamento(4)
 async def create_user(
     user: UserCreate,
     db: Session = Depends(get_db),
@@ -425,7 +793,9 @@ async def create_user(
 
 @v1_router.put("/users/{user_id}",
                description="Atualizar usuário",
-               tags=["Usuários"])
+               tags=["Usuários"],
+               response_model=UserResponse)
+@orcamento(2)
 async def update_user(
     user: UserUpdate,
     user_id: int = Path(
@@ -468,7 +838,9 @@ async def update_user(
 
 @v1_router.delete("/users/{user_id}", 
                   description="Excluir usuário",
-                  tags=["Usuários"])
+                  tags=["Usuários"],
+                  response_model=MessageResponse)
+@orcamento(3)
 async def delete_user(
     user_id: int = Path(
         ..., 
@@ -504,7 +876,9 @@ async def delete_user(
 
 @v1_router.put("/acordaos/{acordao_id}/feedback",
                description="Atualizar feedback do acórdão",
-               tags=["Ementas"])
+               tags=["Ementas"],
+               response_model=AcordaoResponse)
+@orcamento(5)
 async def update_acordao_feedback(
     feedback: AcordaoFeedback,
     acordao_id: int = Path(
@@ -516,6 +890,7 @@ async def update_acordao_feedback(
     db: Session = Depends(get_db),
     _: dict = Depends(check_admin_access)
 ):
+    set_log_context(acordao_id=acordao_id)
     logger.info(f"Atualizando feedback do acórdão {acordao_id}")
     try:
         acordao = db.query(Acordao).filter(Acordao.id == acordao_id).first()
@@ -540,9 +915,34 @@ async def update_acordao_feedback(
             internal_code="ACORDAO_FEEDBACK_UPDATE_ERROR"
         )
 
+@v1_router.get("/acordaos/{acordao_id}/ementas_anteriores",
+               description="Listar ementas substituídas por reprocessamentos, para comparação",
+               tags=["Ementas"],
+               response_model=List[EmentaAnteriorResponse])
+@orcamento(1)
+async def list_previous_ementas(
+    acordao_id: int = Path(
+        ..., 
+        description="ID do acórdão",
+        gt=0,
+        example=1
+    ),
+    db: Session = Depends(get_db),
+    _: dict = Depends(check_user_access)
+):
+    set_log_context(acordao_id=acordao_id)
+    return (
+        db.query(EmentaAnterior)
+        .filter(EmentaAnterior.acordao_id == acordao_id)
+        .order_by(EmentaAnterior.id.desc())
+        .all()
+    )
+
 @v1_router.delete("/acordaos/{acordao_id}",
                   description="Excluir acórdão",
-                  tags=["Ementas"])
+                  tags=["Ementas"],
+                  response_model=MessageResponse)
+@orcamento(6)
 async def delete_acordao(
     acordao_id: int = Path(
         ..., 
@@ -553,6 +953,7 @@ async def delete_acordao(
     db: Session = Depends(get_db),
     _: dict = Depends(check_admin_access)
 ):
+    set_log_context(acordao_id=acordao_id)
     logger.info(f"Tentativa de excluir acórdão {acordao_id}")
     try:
         acordao = db.query(Acordao).filter(Acordao.id == acordao_id).first()
@@ -578,8 +979,12 @@ async def delete_acordao(
 
 @v1_router.get("/logs", 
                description="Listar logs do sistema",
-               tags=["Sistema"])
+               tags=["Sistema"],
+               response_model=LogList)
+@orcamento(3)
 async def list_logs(
+    request: Request,
+    response: Response,
     db: Session = Depends(get_log_db),
     _: dict = Depends(check_admin_access),
     skip: int = Query(
@@ -606,10 +1011,43 @@ async def list_logs(
         description="Filtrar logs a partir desta data (formato: YYYY-MM-DD)",
         regex=r"^\d{4}-\d{2}-\d{2}$",
         example="2024-01-01"
+    ),
+    request_id: str = Query(
+        default=None,
+        description="Filtrar pelo ID da requisição (cabeçalho X-Request-ID)"
+    ),
+    username: str = Query(
+        default=None,
+        description="Filtrar pelo usuário autenticado na requisição",
+        example="user1"
+    ),
+    route: str = Query(
+        default=None,
+        description="Filtrar pela rota (template, ex.: /v1/acordaos/{acordao_id}/feedback)",
+        example="/v1/acordao/gerar"
+    ),
+    acordao_id: int = Query(
+        default=None,
+        gt=0,
+        description="Filtrar pelo acórdão relacionado",
+        example=1
+    ),
+    error_code: str = Query(
+        default=None,
+        description="Filtrar pelo código interno de erro",
+        example="ACORDAO_NOT_FOUND"
+    ),
+    min_duration_ms: float = Query(
+        default=None,
+        ge=0,
+        description="Filtrar requisições com duração mínima (ms)",
+        example=1000
+    ),
+    trace_id: str = Query(
+        default=None,
+        description="Filtrar pelo ID do trace OpenTelemetry"
     )
 ):
-    logger.debug(f"Listando logs: skip={skip}, limit={limit}, level={level}, start_date={start_date}")
-    logger.info("Listando logs do sistema")
     try:
         query = db.query(LogEntry).order_by(LogEntry.id.desc())
         
@@ -617,7 +1055,35 @@ async def list_logs(
             query = query.filter(LogEntry.level == level)
         if start_date:
             query = query.filter(LogEntry.timestamp >= f"{start_date} 00:00:00")
-            
+        if request_id:
+            query = query.filter(LogEntry.request_id == request_id)
+        if username:
+            query = query.filter(LogEntry.username == username)
+        if route:
+            query = query.filter(LogEntry.route == route)
+        if acordao_id:
+            query = query.filter(LogEntry.acordao_id == acordao_id)
+        if error_code:
+            query = query.filter(LogEntry.error_code == error_code)
+        if min_duration_ms is not None:
+            query = query.filter(LogEntry.duration_ms >= min_duration_ms)
+        if trace_id:
+            query = query.filter(LogEntry.trace == trace_id)
+
+        # As próprias consultas a esta rota gravam logs (inclusive o de acesso, após a resposta):
+        # essas linhas não entram na versão, senão cada consulta mudaria a ETag da seguinte
+        rota_logs = request.scope["route"].path
+        etag = etag_insercoes(
+            query.filter(or_(LogEntry.route.is_(None), LogEntry.route != rota_logs)), LogEntry
+        )
+        if nao_modificado(request, etag):
+            return resposta_nao_modificada(etag)
+        response.headers.update(cabecalhos_cache(etag))
+
+        logger.debug(f"Listando logs: skip={skip}, limit={limit}, level={level}, start_date={start_date}, "
+                     f"request_id={request_id}, username={username}, route={route}, acordao_id={acordao_id}, "
+                     f"error_code={error_code}, min_duration_ms={min_duration_ms}, trace_id={trace_id}")
+        logger.info("Listando logs do sistema")
         total = query.count()
         logs = query.offset(skip).limit(limit).all()
         
@@ -628,7 +1094,14 @@ async def list_logs(
             "limit": limit,
             "filters": {
                 "level": level,
-                "start_date": start_date
+                "start_date": start_date,
+                "request_id": request_id,
+                "username": username,
+                "route": route,
+                "acordao_id": acordao_id,
+                "error_code": error_code,
+                "min_duration_ms": min_duration_ms,
+                "trace_id": trace_id
             }
         }
     except Exception as e:
@@ -641,8 +1114,12 @@ async def list_logs(
 
 @v1_router.get("/acordaos",
                description="Listar todos os acórdãos",
-               tags=["Ementas"])
+               tags=["Ementas"],
+               response_model=AcordaoList)
+@orcamento(3)
 async def list_acordaos(
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db),
     _: dict = Depends(check_user_access),
     skip: int = Query(
@@ -662,9 +1139,47 @@ async def list_acordaos(
         default=None,
         description="Filtrar por acórdãos com/sem feedback",
         example=True
+    ),
+    created_by: str = Query(
+        default=None,
+        description="Filtrar pelo usuário que gerou a ementa",
+        example="user1"
+    ),
+    status_filter: str = Query(
+        default=None,
+        alias="status",
+        description="Filtrar pelo status do acórdão",
+        example=STATUS_CONCLUIDO
+    ),
+    model: str = Query(
+        default=None,
+        description="Filtrar pelo modelo usado na geração",
+        example="gpt-4o-mini"
+    ),
+    prompt_version: str = Query(
+        default=None,
+        description="Filtrar pela versão do prompt usada na geração",
+    ),
+    start_date: str = Query(
+        default=None,
+        description="Filtrar acórdãos criados a partir desta data (formato: YYYY-MM-DD)",
+        regex=r"^\d{4}-\d{2}-\d{2}$",
+        example="2024-01-01"
+    ),
+    end_date: str = Query(
+        default=None,
+        description="Filtrar acórdãos criados até esta data, inclusive (formato: YYYY-MM-DD)",
+        regex=r"^\d{4}-\d{2}-\d{2}$",
+        example="2024-12-31"
     )
 ):
-    logger.debug(f"Listando acórdãos: skip={skip}, limit={limit}, has_feedback={has_feedback}")
+    logger.debug(f"Listando acórdãos: skip={skip}, limit={limit}, has_feedback={has_feedback}, "
+                 f"created_by={created_by}, status={status_filter}, model={model}, "
+                 f"prompt_version={prompt_version}, start_date={start_date}, end_date={end_date}")
+    etag = etag_tabela(db, Acordao)
+    if nao_modificado(request, etag):
+        return resposta_nao_modificada(etag)
+    response.headers.update(cabecalhos_cache(etag))
     try:
         query = db.query(Acordao)
         
@@ -673,9 +1188,28 @@ async def list_acordaos(
                 query = query.filter(Acordao.feedback.isnot(None))
             else:
                 query = query.filter(Acordao.feedback.is_(None))
+        if created_by:
+            query = query.filter(Acordao.created_by == created_by)
+        if status_filter:
+            query = query.filter(Acordao.status == status_filter)
+        if model:
+            query = query.filter(Acordao.model == model)
+        if prompt_version:
+            query = query.filter(Acordao.prompt_version == prompt_version)
+        if start_date:
+            query = query.filter(Acordao.created_at >= _inicio_do_dia(start_date))
+        if end_date:
+            query = query.filter(Acordao.created_at < _inicio_do_dia(end_date) + timedelta(days=1))
             
         total = query.count()
-        acordaos = query.order_by(Acordao.id.desc()).offset(skip).limit(limit).all()
+        acordaos = (
+            # Sem o texto: nem o blob comprimido nem a coluna legada são lidos na listagem
+            query.options(defer(Acordao.texto_legado))
+            .order_by(Acordao.id.desc())
+            .offset(skip)
+            .limit(limit)
+            .all()
+        )
         
         return {
             "total": total,
@@ -683,7 +1217,13 @@ async def list_acordaos(
             "skip": skip,
             "limit": limit,
             "filters": {
-                "has_feedback": has_feedback
+                "has_feedback": has_feedback,
+                "created_by": created_by,
+                "status": status_filter,
+                "model": model,
+                "prompt_version": prompt_version,
+                "start_date": start_date,
+                "end_date": end_date
             }
         }
     except Exception as e:
@@ -694,6 +1234,10 @@ async def list_acordaos(
             internal_code="ACORDAO_RETRIEVAL_ERROR"
         )
 
+def _inicio_do_dia(data: str) -> datetime:
+    # created_at é gravado em UTC; os limites do filtro também são em UTC
+    return datetime.strptime(data, "%Y-%m-%d").replace(tzinfo=timezone.utc)
+
 # Customize OpenAPI schema
 def custom_openapi():
     if app.openapi_schema:
@@ -747,24 +1291,47 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Health check endpoint
+# Compressão das respostas grandes (listagens com textos completos)
+app.add_middleware(GZipMiddleware, minimum_size=GZIP_MINIMUM_SIZE)
+
+# Health check endpoints: respondem com o último resultado das verificações em segundo plano
 @app.get("/health",
          description="Verificar status da API",
-         tags=["Sistema"])
+         tags=["Sistema"],
+         response_model=HealthResponse)
 async def health_check():
+    readiness = health_monitor.readiness()
     return {
-        "status": "healthy",
-        "database": check_database_connection(),
+        "status": "healthy" if readiness["status"] == "ready" else "unhealthy",
+        "database": "connected" if readiness["checks"]["database"]["status"] == "up" else "disconnected",
+        "checks": readiness["checks"],
+        "updated_at": readiness["updated_at"],
+        "llm_circuit": circuit_breaker.snapshot(),
         "version": "1.0.0"
     }
 
-def check_database_connection():
-    try:
-        with get_db() as db:
-            db.execute("SELECT 1")
-        return "connected"
-    except Exception:
-        return "disconnected"
+@app.get("/health/live",
+         description="Liveness probe: indica que o processo está respondendo",
+         tags=["Sistema"],
+         response_model=LivenessResponse)
+async def liveness_probe():
+    return {"status": "alive"}
+
+@app.get("/health/ready",
+         description="Readiness probe: bancos de dados disponíveis segundo a última verificação",
+         tags=["Sistema"],
+         response_model=ReadinessResponse)
+async def readiness_probe():
+    readiness = health_monitor.readiness()
+    status_code = status.HTTP_200_OK if readiness["status"] == "ready" else status.HTTP_503_SERVICE_UNAVAILABLE
+    return ORJSONResponse(status_code=status_code, content=readiness)
+
+@app.get("/metrics",
+         description="Métricas no formato texto do Prometheus",
+         tags=["Sistema"],
+         response_class=PlainTextResponse)
+async def get_metrics():
+    return PlainTextResponse(renderizar_metricas(), media_type="text/plain; version=0.0.4")
 
 # Add error handling middleware
 @app.middleware("http")
@@ -777,3 +1344,56 @@ async def error_handling_middleware(request, call_next):
             status_code=500,
             content={"detail": "Erro interno do servidor"}
         )
+
+# Profiling sob demanda: apenas administradores, via cabeçalho X-Profile: 1 ou ?profile=1
+@app.middleware("http")
+async def profiling_middleware(request, call_next):
+    if not profiling_requested(request) or not get_admin_from_header(request.headers.get("Authorization")):
+        return await call_next(request)
+
+    profiler, token = start_profiler()
+    started = time.perf_counter()
+    try:
+        response = await call_next(request)
+    finally:
+        finish_profiler(token)
+        # join da thread de amostragem e gravação dos arquivos fora do event loop
+        await run_in_threadpool(profiler.stop)
+    profile_id = await run_in_threadpool(
+        save_profile, profiler, request.method, request.url.path, time.perf_counter() - started
+    )
+    logger.info(f"Perfil {profile_id} gerado para {request.method} {request.url.path}")
+    response.headers["X-Profile-Id"] = profile_id
+    return response
+
+# Contexto de log por requisição (request id, rota, usuário) e registro da duração.
+# Declarado por último para envolver os demais middlewares.
+@app.middleware("http")
+async def request_context_middleware(request, call_next):
+    request_id = request.headers.get("X-Request-ID")
+    if not request_id or len(request_id) > 64:
+        request_id = uuid.uuid4().hex
+    token = start_log_context(request_id=request_id, route=request.url.path)
+    sql_token = query_budget.iniciar()
+    started = time.perf_counter()
+    # Span raiz da requisição, continuando um trace recebido via cabeçalho traceparent
+    with tracer.start_as_current_span(
+        f"{request.method} {request.url.path}",
+        context=propagate.extract(request.headers),
+        kind=SpanKind.SERVER,
+        attributes={"http.method": request.method, "http.target": request.url.path, "request.id": request_id}
+    ) as span:
+        try:
+            response = await call_next(request)
+            span.set_attribute("http.status_code", response.status_code)
+            response.headers["X-Request-ID"] = request_id
+            query_budget.finalizar(request, response)
+            if not request.url.path.startswith(("/health", "/metrics")):
+                logger.info(
+                    f"{request.method} {request.url.path} {response.status_code}",
+                    extra={"duration_ms": round((time.perf_counter() - started) * 1000, 1)}
+                )
+            return response
+        finally:
+            query_budget.encerrar(sql_token)
+            reset_log_context(token)
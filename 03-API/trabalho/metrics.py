@@ -0,0 +1,67 @@
+import threading
+from collections import defaultdict
+
+# Métricas no formato texto do Prometheus, sem dependências externas.
+# Contadores e somatórios são acumulados aqui; valores instantâneos (gauges)
+# vêm de coletores registrados pelos módulos e chamados a cada leitura.
+
+_lock = threading.Lock()
+_familias = {}
+_amostras = defaultdict(float)
+_coletores = []
+
+
+def registrar(nome: str, tipo: str, ajuda: str):
+    _familias[nome] = (tipo, ajuda)
+
+
+def _chave(nome: str, sufixo: str, labels: dict):
+    return nome, sufixo, tuple(sorted(labels.items()))
+
+
+def incrementar(nome: str, valor: float = 1.0, **labels):
+    with _lock:
+        _amostras[_chave(nome, "", labels)] += valor
+
+
+def observar(nome: str, valor: float, **labels):
+    # Summary sem quantis: apenas soma e contagem
+    with _lock:
+        _amostras[_chave(nome, "_sum", labels)] += valor
+        _amostras[_chave(nome, "_count", labels)] += 1
+
+
+def coletor(funcao):
+    """Registra uma função que devolve [(nome, labels, valor)] no momento da leitura."""
+    _coletores.append(funcao)
+    return funcao
+
+
+def _escapar(valor) -> str:
+    return str(valor).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _linha(nome: str, labels, valor: float) -> str:
+    if labels:
+        nome += "{" + ",".join(f'{k}="{_escapar(v)}"' for k, v in labels) + "}"
+    return f"{nome} {valor:g}"
+
+
+def renderizar() -> str:
+    with _lock:
+        amostras = dict(_amostras)
+    for funcao in _coletores:
+        for nome, labels, valor in funcao():
+            amostras[_chave(nome, "", labels)] = valor
+
+    por_familia = defaultdict(list)
+    for (nome, sufixo, labels), valor in sorted(amostras.items()):
+        por_familia[nome].append(_linha(nome + sufixo, labels, valor))
+
+    linhas = []
+    for nome, amostras_familia in sorted(por_familia.items()):
+        tipo, ajuda = _familias.get(nome, ("untyped", ""))
+        linhas.append(f"# HELP {nome} {ajuda}")
+        linhas.append(f"# TYPE {nome} {tipo}")
+        linhas.extend(amostras_familia)
+    return "\n".join(linhas) + "\n"
@@ -0,0 +1,100 @@
+import argparse
+import datetime
+import logging
+
+from sqlalchemy import inspect, update
+
+from database import SessionLocal, create_tables, engine, log_engine
+from etags import incrementar_versoes
+from models import Acordao
+from models.acordaos import STATUS_CONCLUIDO
+from models.base import Base, LogBase
+
+logger = logging.getLogger("API")
+
+
+def _sincronizar_tabelas(metadata, db_engine):
+    # create_all não altera tabelas existentes: adiciona colunas e índices que faltam
+    inspector = inspect(db_engine)
+    with db_engine.begin() as conn:
+        for table in metadata.sorted_tables:
+            if not inspector.has_table(table.name):
+                continue
+            existentes = {col["name"] for col in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name not in existentes:
+                    tipo = column.type.compile(dialect=db_engine.dialect)
+                    conn.exec_driver_sql(f'ALTER TABLE {table.name} ADD COLUMN "{column.name}" {tipo}')
+                    logger.info(f"Coluna {table.name}.{column.name} adicionada")
+            for index in table.indexes:
+                index.create(bind=conn, checkfirst=True)
+
+
+def atualizar_esquema():
+    """Migração de esquema executada na inicialização; barata quando não há mudanças."""
+    create_tables()
+    _sincronizar_tabelas(Base.metadata, engine)
+    _sincronizar_tabelas(LogBase.metadata, log_engine)
+    with engine.begin() as conn:
+        # Linhas anteriores às colunas de metadados já eram gerações concluídas
+        status = conn.exec_driver_sql(f"UPDATE acordaos SET status = '{STATUS_CONCLUIDO}' WHERE status IS NULL")
+        # Essas linhas não registravam a data de criação: recebem a data da migração (UTC), para
+        # não ficarem fora dos filtros start_date/end_date da listagem
+        datas = conn.execute(
+            update(Acordao)
+            .where(Acordao.created_at.is_(None))
+            .values(created_at=datetime.datetime.now(datetime.timezone.utc))
+        )
+        if status.rowcount or datas.rowcount:
+            # Fora da sessão, o listener de ETags não vê essas alterações
+            incrementar_versoes(conn, {"acordaos"})
+        # Textos extraídos antes da coluna de último uso: o uso conhecido é a criação
+        conn.exec_driver_sql("UPDATE pdf_textos SET last_used_at = created_at WHERE last_used_at IS NULL")
+
+
+def migrar_textos(batch_size: int = 500, vacuum: bool = True) -> int:
+    """Move os textos legados de `acordaos.texto` para `acordao_textos`, comprimidos, em lotes."""
+    create_tables()
+    total = 0
+    ultimo_id = 0
+    db = SessionLocal()
+    try:
+        while True:
+            lote = (
+                db.query(Acordao)
+                .filter(Acordao.id > ultimo_id, Acordao.texto_legado.isnot(None))
+                .order_by(Acordao.id)
+                .limit(batch_size)
+                .all()
+            )
+            if not lote:
+                break
+            for acordao in lote:
+                acordao.texto = acordao.texto_legado
+            db.commit()
+            ultimo_id = lote[-1].id
+            total += len(lote)
+            # Libera os objetos do lote para manter a memória constante
+            db.expunge_all()
+            logger.info(f"Textos migrados: {total} (último id {ultimo_id})")
+    finally:
+        db.close()
+
+    if vacuum and total:
+        # O SQLite só devolve o espaço das páginas liberadas após o VACUUM
+        with engine.connect() as conn:
+            conn.exec_driver_sql("VACUUM")
+    return total
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser(description="Migrações de dados do banco de ementas")
+    parser.add_argument("comando", choices=["migrar_textos"])
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--sem-vacuum", action="store_true")
+    args = parser.parse_args()
+
+    if args.comando == "migrar_textos":
+        migrados = migrar_textos(batch_size=args.batch_size, vacuum=not args.sem_vacuum)
+        print(f"{migrados} textos migrados")
@@ -1,7 +1,12 @@
 from .usuarios import User, UserBase, UserCreate, UserUpdate
-from .acordaos import Acordao
+from .acordaos import Acordao, AcordaoTexto
+from .idempotency import IdempotencyKey
+from .versions import TableVersion
+from .uploads import PdfTexto
+from .reprocessamento import ReprocessingCampaign, EmentaAnterior
 
 __all__ = [
     'User', 'UserBase', 'UserCreate', 'UserUpdate', 
-    'Acordao'
+    'Acordao', 'AcordaoTexto', 'IdempotencyKey', 'TableVersion',
+    'PdfTexto', 'ReprocessingCampaign', 'EmentaAnterior'
 ]
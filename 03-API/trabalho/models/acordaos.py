@@ -1,13 +1,65 @@
-from sqlalchemy import Column, Integer, Text
+import datetime
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer, LargeBinary, String, Text, text
+from sqlalchemy.ext.hybrid import hybrid_property
+from sqlalchemy.orm import relationship
 from models.base import Base
 from pydantic import BaseModel
+from compressao import comprimir, descomprimir
+
+STATUS_CONCLUIDO = "concluido"
+
+class AcordaoTexto(Base):
+    __tablename__ = "acordao_textos"
+    acordao_id = Column(Integer, ForeignKey("acordaos.id"), primary_key=True)
+    codec = Column(String)
+    tamanho = Column(Integer)
+    dados = Column(LargeBinary)
 
 class Acordao(Base):
     __tablename__ = "acordaos"
+    __table_args__ = (
+        Index("ix_acordaos_created_by_created_at", "created_by", "created_at"),
+        Index("ix_acordaos_status_created_at", "status", "created_at"),
+        # Índices parciais para o filtro has_feedback da listagem
+        Index("ix_acordaos_sem_feedback", "id", sqlite_where=text("feedback IS NULL")),
+        Index("ix_acordaos_com_feedback", "id", sqlite_where=text("feedback IS NOT NULL")),
+    )
     id = Column(Integer, primary_key=True, index=True)
-    texto = Column(Text)
+    # Texto sem compressão, mantido apenas para linhas ainda não migradas
+    texto_legado = Column("texto", Text, nullable=True)
     ementa = Column(Text)
     feedback = Column(Text, nullable=True)
+    created_at = Column(DateTime, index=True, default=lambda: datetime.datetime.now(datetime.timezone.utc))
+    created_by = Column(String, nullable=True)
+    model = Column(String, index=True, nullable=True)
+    prompt_version = Column(String, index=True, nullable=True)
+    status = Column(String, nullable=True)
+    # Hash do PDF de origem (upload store), para reaproveitar gerações do mesmo arquivo
+    pdf_sha256 = Column(String(64), index=True, nullable=True)
+    # Análise de conformidade com o Manual do CNJ, quando gerada junto com a ementa
+    verificacao = Column(Text, nullable=True)
+    blob = relationship(AcordaoTexto, uselist=False, lazy="select", cascade="all, delete-orphan")
+    ementas_anteriores = relationship("EmentaAnterior", lazy="select", cascade="all, delete-orphan")
+
+    @hybrid_property
+    def texto(self):
+        if self.blob is not None:
+            return descomprimir(self.blob.codec, self.blob.dados)
+        return self.texto_legado
+
+    @texto.setter
+    def texto(self, valor):
+        self.texto_legado = None
+        if valor is None:
+            self.blob = None
+            return
+        codec, dados = comprimir(valor)
+        self.blob = AcordaoTexto(codec=codec, tamanho=len(valor.encode("utf-8")), dados=dados)
+
+    @texto.expression
+    def texto(cls):
+        # O texto comprimido não é consultável em SQL; somente o legado
+        return cls.texto_legado
 
 class AcordaoRequest(BaseModel):
-    texto_acordao: str
\ No newline at end of file
+    texto_acordao: str
@@ -0,0 +1,16 @@
+from sqlalchemy import Column, Integer, String, DateTime
+from models.base import Base
+
+class IdempotencyKey(Base):
+    __tablename__ = "idempotency_keys"
+    key = Column(String, primary_key=True)
+    username = Column(String, primary_key=True)
+    route = Column(String)
+    request_hash = Column(String)
+    status = Column(String)
+    acordao_id = Column(Integer, nullable=True)
+    # Reserva em andamento: dono (lease_id) e prazo renovado durante a geração
+    lease_id = Column(String, nullable=True)
+    locked_until = Column(DateTime, nullable=True)
+    created_at = Column(DateTime)
+    expires_at = Column(DateTime, index=True)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime
+from sqlalchemy import Column, Float, Integer, String, Text, DateTime
 import datetime
 from models.base import LogBase
 
@@ -8,4 +8,11 @@ class LogEntry(LogBase):
     timestamp = Column(DateTime, index=True, default=lambda: datetime.datetime.now(datetime.timezone.utc))
     level = Column(String, index=True)
     message = Column(Text)
-    trace = Column(Text, nullable=True)
\ No newline at end of file
+    # ID do trace OpenTelemetry da requisição
+    trace = Column(Text, index=True, nullable=True)
+    request_id = Column(String, index=True, nullable=True)
+    username = Column(String, index=True, nullable=True)
+    route = Column(String, index=True, nullable=True)
+    acordao_id = Column(Integer, index=True, nullable=True)
+    duration_ms = Column(Float, nullable=True)
+    error_code = Column(String, index=True, nullable=True)
@@ -0,0 +1,40 @@
+import datetime
+from sqlalchemy import Column, DateTime, Float, ForeignKey, Integer, String, Text
+from models.base import Base
+
+def _agora():
+    return datetime.datetime.now(datetime.timezone.utc)
+
+class ReprocessingCampaign(Base):
+    __tablename__ = "reprocessing_campaigns"
+    id = Column(Integer, primary_key=True, index=True)
+    prompt_version = Column(String)
+    model = Column(String)
+    status = Column(String, index=True)
+    tokens_per_hour = Column(Integer)
+    total = Column(Integer, default=0)
+    processed = Column(Integer, default=0)
+    failed = Column(Integer, default=0)
+    tokens_used = Column(Integer, default=0)
+    # Checkpoint: maior id de acórdão já tratado pela campanha
+    last_acordao_id = Column(Integer, default=0)
+    # Saldo do orçamento de tokens por hora no último checkpoint (UTC), restaurado ao retomar
+    budget_tokens = Column(Float, nullable=True)
+    budget_at = Column(DateTime, nullable=True)
+    error = Column(Text, nullable=True)
+    created_by = Column(String)
+    created_at = Column(DateTime, default=_agora)
+    updated_at = Column(DateTime, default=_agora, onupdate=_agora)
+
+class EmentaAnterior(Base):
+    """Ementa substituída por um reprocessamento, mantida para comparação."""
+    __tablename__ = "ementas_anteriores"
+    id = Column(Integer, primary_key=True, index=True)
+    acordao_id = Column(Integer, ForeignKey("acordaos.id", ondelete="CASCADE"), index=True)
+    campaign_id = Column(Integer, ForeignKey("reprocessing_campaigns.id"), nullable=True)
+    ementa = Column(Text)
+    model = Column(String, nullable=True)
+    prompt_version = Column(String, nullable=True)
+    feedback = Column(Text, nullable=True)
+    verificacao = Column(Text, nullable=True)
+    replaced_at = Column(DateTime, default=_agora)
@@ -1,5 +1,6 @@
-from pydantic import BaseModel, Field, constr
-from typing import Optional, Literal
+from pydantic import BaseModel, ConfigDict, Field, constr
+from typing import Dict, List, Optional, Literal
+from datetime import datetime
 
 class LoginRequest(BaseModel):
     usuario: constr(min_length=3, max_length=50) = Field(..., example="user1")
@@ -29,3 +30,179 @@ class BootstrapRequest(BaseModel):
         ..., 
         example="sua-chave-secreta"
     )
+
+class AcordaoResumo(BaseModel):
+    """Acórdão na listagem: sem o texto, que só é descomprimido nas respostas individuais."""
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    ementa: Optional[str] = None
+    feedback: Optional[str] = None
+    created_at: Optional[datetime] = None
+    created_by: Optional[str] = None
+    model: Optional[str] = None
+    prompt_version: Optional[str] = None
+    status: Optional[str] = None
+    pdf_sha256: Optional[str] = None
+    verificacao: Optional[str] = None
+
+class AcordaoResponse(AcordaoResumo):
+    texto: Optional[str] = None
+
+class EmentaVerificada(BaseModel):
+    """Resposta estruturada do modelo na geração com verificação."""
+    ementa: constr(strip_whitespace=True, min_length=1)
+    verificacao: constr(strip_whitespace=True, min_length=1)
+
+class AcordaoFilters(BaseModel):
+    has_feedback: Optional[bool] = None
+    created_by: Optional[str] = None
+    status: Optional[str] = None
+    model: Optional[str] = None
+    prompt_version: Optional[str] = None
+    start_date: Optional[str] = None
+    end_date: Optional[str] = None
+
+class AcordaoList(BaseModel):
+    total: int
+    items: List[AcordaoResumo]
+    skip: int
+    limit: int
+    filters: AcordaoFilters
+
+class MessageResponse(BaseModel):
+    message: str
+
+class TokenResponse(BaseModel):
+    access_token: str
+    token_type: str
+
+class AuthStatusResponse(BaseModel):
+    authenticated: bool
+    username: str
+    role: str
+    expires: str
+
+class UserResponse(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    username: str
+    role: str
+
+class UserList(BaseModel):
+    total: int
+    items: List[UserResponse]
+    skip: int
+    limit: int
+
+class LogEntryResponse(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    timestamp: Optional[datetime] = None
+    level: Optional[str] = None
+    message: Optional[str] = None
+    trace: Optional[str] = None
+    request_id: Optional[str] = None
+    username: Optional[str] = None
+    route: Optional[str] = None
+    acordao_id: Optional[int] = None
+    duration_ms: Optional[float] = None
+    error_code: Optional[str] = None
+
+class LogFilters(BaseModel):
+    level: Optional[str] = None
+    start_date: Optional[str] = None
+    request_id: Optional[str] = None
+    username: Optional[str] = None
+    route: Optional[str] = None
+    acordao_id: Optional[int] = None
+    error_code: Optional[str] = None
+    min_duration_ms: Optional[float] = None
+    trace_id: Optional[str] = None
+
+class LogList(BaseModel):
+    total: int
+    items: List[LogEntryResponse]
+    skip: int
+    limit: int
+    filters: LogFilters
+
+class BucketUsage(BaseModel):
+    available: int
+    capacity: int
+    consumed: int
+
+class QueueUsage(BaseModel):
+    running: int
+    waiting: int
+    max_concurrency: int
+    max_queue: int
+    avg_duration_seconds: float
+
+class RateLimitUsage(BaseModel):
+    model_config = ConfigDict(populate_by_name=True)
+
+    global_: BucketUsage = Field(..., alias="global")
+    users: Dict[str, BucketUsage]
+    queue: QueueUsage
+    rejected: Dict[str, int]
+
+class ProfileInfo(BaseModel):
+    id: str
+    method: str
+    path: str
+    duration_ms: float
+    samples: int
+    created: str
+
+class CampanhaCreate(BaseModel):
+    tokens_por_hora: Optional[int] = Field(None, gt=0, example=200000)
+
+class CampanhaResponse(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    prompt_version: Optional[str] = None
+    model: Optional[str] = None
+    status: str
+    tokens_per_hour: int
+    total: int
+    processed: int
+    failed: int
+    tokens_used: int
+    last_acordao_id: int
+    error: Optional[str] = None
+    created_by: Optional[str] = None
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+
+class EmentaAnteriorResponse(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    acordao_id: int
+    campaign_id: Optional[int] = None
+    ementa: Optional[str] = None
+    model: Optional[str] = None
+    prompt_version: Optional[str] = None
+    feedback: Optional[str] = None
+    verificacao: Optional[str] = None
+    replaced_at: Optional[datetime] = None
+
+class HealthResponse(BaseModel):
+    status: str
+    database: str
+    checks: Dict[str, dict]
+    updated_at: Optional[str] = None
+    llm_circuit: Optional[dict] = None
+    version: str
+
+class LivenessResponse(BaseModel):
+    status: str
+
+class ReadinessResponse(BaseModel):
+    status: str
+    checks: Dict[str, dict]
+    updated_at: Optional[str] = None
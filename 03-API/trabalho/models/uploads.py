@@ -0,0 +1,15 @@
+import datetime
+from sqlalchemy import Column, DateTime, Integer, LargeBinary, String
+from models.base import Base
+
+class PdfTexto(Base):
+    """Texto extraído de um PDF, por hash SHA-256 do arquivo (páginas separadas por form feed)."""
+    __tablename__ = "pdf_textos"
+    sha256 = Column(String(64), primary_key=True)
+    paginas = Column(Integer)
+    codec = Column(String)
+    tamanho = Column(Integer)
+    dados = Column(LargeBinary)
+    created_at = Column(DateTime, index=True, default=lambda: datetime.datetime.now(datetime.timezone.utc))
+    # Atualizado a cada leitura; o cache descarta os textos usados há mais tempo
+    last_used_at = Column(DateTime, index=True, default=lambda: datetime.datetime.now(datetime.timezone.utc))
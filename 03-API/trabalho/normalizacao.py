@@ -0,0 +1,151 @@
+import math
+import re
+from collections import Counter
+from dataclasses import dataclass
+
+from settings import NORMALIZACAO_LINHAS_BORDA, NORMALIZACAO_LIMIAR_REPETICAO
+
+# Linhas que só contêm numeração de página ou de folhas
+PAGINACAO = re.compile(
+    r"^(-\s*\d+\s*-|(p[áa]g(ina)?\.?\s*)?\d+(\s*(de|/)\s*\d+)?|fls?\.?\s*\d+(\s*(v|verso))?)$",
+    re.IGNORECASE
+)
+
+# Rodapés de assinatura eletrônica e conferência de autenticidade
+BOILERPLATE = [
+    re.compile(p, re.IGNORECASE) for p in (
+        r"^documento assinado (eletronicamente|digitalmente)",
+        r"^assinado (eletronicamente|digitalmente) por",
+        r"^para conferir o original",
+        r"^(c[óo]digo|n[úu]mero) (verificador|do documento|de autentica[çc][ãa]o)",
+        r"^este documento pode ser (acessado|verificado)",
+        r"^https?://\S+$",
+    )
+]
+
+# Hífen no fim da linha seguido de palavra na linha seguinte
+HIFENIZACAO = re.compile(r"(\w+)-\n(\w+)")
+
+# Palavras compostas com hífen: o hífen é mantido quando a quebra cai nele
+PRIMEIROS_ELEMENTOS = {
+    "ex", "vice", "pós", "pré", "pró", "recém", "além", "aquém", "sem", "bem",
+    "guarda", "porta", "beija", "segunda", "terça", "quarta", "quinta", "sexta",
+}
+# Pronomes oblíquos em ênclise: "fazê-lo", "vendê-la", "trata-se"
+ENCLISE_ACENTUADA = re.compile(r"[áéêíóô]$", re.IGNORECASE)
+PRONOMES_ACENTUADA = {"lo", "la", "los", "las", "lhe", "lhes"}
+
+ESPACOS = re.compile(r"[ \t ]+")
+LINHAS_VAZIAS = re.compile(r"\n{3,}")
+
+
+def estimar_tokens_texto(texto: str) -> int:
+    # Mesma aproximação usada no controle de admissão (~4 caracteres por token)
+    return len(texto) // 4
+
+
+@dataclass
+class TextoNormalizado:
+    texto: str
+    tokens_originais: int
+    tokens_normalizados: int
+    linhas_removidas: int
+
+    @property
+    def tokens_economizados(self) -> int:
+        return self.tokens_originais - self.tokens_normalizados
+
+
+def _borda(linhas: list) -> int:
+    # Em páginas curtas, topo e rodapé não podem cobrir a página inteira
+    return min(NORMALIZACAO_LINHAS_BORDA, len(linhas) // 2)
+
+
+def _indices_borda(linhas: list) -> set:
+    """Posições das linhas com conteúdo no topo e no rodapé da página; linhas em branco não contam."""
+    conteudo = [i for i, linha in enumerate(linhas) if linha]
+    n = _borda(conteudo)
+    return set(conteudo[:n] + conteudo[len(conteudo) - n:])
+
+
+def _chave(linha: str) -> str:
+    # Números variam entre páginas (ex.: "Página 3 de 10"), então são ignorados na comparação
+    return re.sub(r"\d+", "#", linha.lower())
+
+
+def _linhas_repetidas(paginas: list) -> set:
+    """Chaves das linhas que se repetem nas bordas (topo/rodapé) da maioria das páginas."""
+    if len(paginas) < 2:
+        return set()
+    contagem = Counter()
+    for linhas in paginas:
+        contagem.update({_chave(linhas[i]) for i in _indices_borda(linhas)})
+    minimo = max(2, math.ceil(NORMALIZACAO_LIMIAR_REPETICAO * len(paginas)))
+    return {chave for chave, n in contagem.items() if n >= minimo}
+
+
+def _composta(esquerda: str, direita: str) -> bool:
+    """Se a quebra hifenizada separa uma palavra composta ou um pronome em ênclise."""
+    esquerda, direita = esquerda.lower(), direita.lower()
+    if esquerda in PRIMEIROS_ELEMENTOS:
+        return True
+    if direita in PRONOMES_ACENTUADA and ENCLISE_ACENTUADA.search(esquerda):
+        return True
+    # "-se" após verbos em -a ("trata-se", "aplica-se"); palavras curtas como "ba-se" são juntadas
+    return direita == "se" and len(esquerda) >= 4 and esquerda.endswith("a")
+
+
+def _juntar_hifenizacao(match) -> str:
+    esquerda, direita = match.groups()
+    if not direita[0].islower():
+        # Maiúscula ou número na linha seguinte: não é continuação de palavra
+        return match.group(0)
+    if _composta(esquerda, direita):
+        return f"{esquerda}-{direita}"
+    return esquerda + direita
+
+
+def normalizar_paginas(paginas: list) -> TextoNormalizado:
+    original = "\n".join(paginas)
+    # Linhas em branco são mantidas para preservar os parágrafos; o excesso é colapsado no final
+    linhas_por_pagina = [
+        [ESPACOS.sub(" ", l).strip() for l in pagina.splitlines()]
+        for pagina in paginas
+    ]
+    repetidas = _linhas_repetidas(linhas_por_pagina)
+
+    removidas = 0
+    saida = []
+    for linhas in linhas_por_pagina:
+        borda = _indices_borda(linhas)
+        mantidas = [
+            i for i, linha in enumerate(linhas)
+            if not linha or not (
+                (i in borda and _chave(linha) in repetidas)
+                or any(p.match(linha) for p in BOILERPLATE)
+            )
+        ]
+        # Numeração só é removida na primeira ou na última linha com conteúdo que restou na página;
+        # no meio da página, uma linha só com número é conteúdo (ex.: itens de tabela)
+        conteudo = [i for i in mantidas if linhas[i]]
+        numeracao = {i for i in conteudo[:1] + conteudo[-1:] if PAGINACAO.match(linhas[i])}
+        removidas += len(linhas) - len(mantidas) + len(numeracao)
+        saida.extend(linhas[i] for i in mantidas if i not in numeracao)
+
+    texto = HIFENIZACAO.sub(_juntar_hifenizacao, "\n".join(saida))
+    texto = LINHAS_VAZIAS.sub("\n\n", texto).strip()
+    return TextoNormalizado(
+        texto=texto,
+        tokens_originais=estimar_tokens_texto(original),
+        tokens_normalizados=estimar_tokens_texto(texto),
+        linhas_removidas=removidas
+    )
+
+
+def normalizar_texto(texto: str) -> TextoNormalizado:
+    """
+    Normaliza um texto puro. As páginas são separadas por form feed (como nos textos
+    extraídos de PDF); sem form feed o texto é uma única página, e a remoção de cabeçalhos
+    e rodapés repetidos não se aplica (numeração e assinaturas continuam sendo removidas).
+    """
+    return normalizar_paginas(texto.split("\f"))
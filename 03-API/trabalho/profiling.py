@@ -0,0 +1,168 @@
+import asyncio
+import contextvars
+import json
+import os
+import re
+import sys
+import threading
+import uuid
+import weakref
+from collections import Counter
+from datetime import datetime
+
+from settings import PROFILE_DIR, PROFILE_INTERVAL_MS, PROFILE_MAX_FILES
+
+PROFILE_ID_PATTERN = re.compile(r"^[0-9]{8}-[0-9]{6}-[0-9a-f]{8}$")
+
+# Profiler da requisição atual; copiado para as tarefas e para o threadpool junto com o contexto
+_perfil: contextvars.ContextVar = contextvars.ContextVar("perfil", default=None)
+
+
+class SamplingProfiler:
+    """
+    Profiler por amostragem: uma thread auxiliar lê periodicamente as pilhas e
+    acumula as pilhas no formato "folded" (compatível com flamegraph.pl, speedscope e similares).
+
+    Só entram as amostras em que o código da requisição está executando: na thread do
+    event loop, quando a tarefa corrente é da requisição (as demais requisições concorrentes
+    ficam de fora e o tempo em await não aparece); no threadpool, quando a thread executa uma
+    função enviada pela requisição (run_in_threadpool, dependências síncronas). A primeira
+    entrada de cada pilha é o nome da thread.
+    """
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, interval: float):
+        self.loop = loop
+        self.loop_thread_id = threading.get_ident()
+        self.interval = interval
+        self.samples = Counter()
+        self.tasks = weakref.WeakSet()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="request-profiler", daemon=True)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            nomes = {thread.ident: thread.name for thread in threading.enumerate()}
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == self._thread.ident or not self._da_requisicao(thread_id, frame):
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})")
+                    frame = frame.f_back
+                stack.append(nomes.get(thread_id, str(thread_id)))
+                self.samples[";".join(reversed(stack))] += 1
+
+    def _da_requisicao(self, thread_id: int, frame) -> bool:
+        if thread_id == self.loop_thread_id:
+            return asyncio.current_task(self.loop) in self.tasks
+        # Threads do threadpool (anyio): a função roda dentro do contexto copiado da tarefa que a enviou
+        while frame is not None:
+            contexto = frame.f_locals.get("context")
+            if isinstance(contexto, contextvars.Context):
+                return contexto.get(_perfil) is self
+            frame = frame.f_back
+        return False
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def folded(self) -> str:
+        return "".join(f"{stack} {count}\n" for stack, count in self.samples.most_common())
+
+
+def _registrar_tarefas(loop: asyncio.AbstractEventLoop):
+    """Instala (uma vez) a fábrica de tarefas que associa as tarefas criadas por uma requisição ao seu profiler."""
+    anterior = loop.get_task_factory()
+    if getattr(anterior, "registra_perfil", False):
+        return
+
+    def fabrica(loop, coro, **kwargs):
+        task = anterior(loop, coro, **kwargs) if anterior else asyncio.Task(coro, loop=loop, **kwargs)
+        contexto = kwargs.get("context")
+        profiler = contexto.get(_perfil) if contexto is not None else _perfil.get()
+        if profiler is not None:
+            profiler.tasks.add(task)
+        return task
+
+    fabrica.registra_perfil = True
+    loop.set_task_factory(fabrica)
+
+
+def start_profiler():
+    """Inicia o profiler da requisição atual; retorna o profiler e o token para `finish_profiler`."""
+    loop = asyncio.get_running_loop()
+    _registrar_tarefas(loop)
+    profiler = SamplingProfiler(loop, PROFILE_INTERVAL_MS / 1000)
+    profiler.tasks.add(asyncio.current_task())
+    token = _perfil.set(profiler)
+    profiler.start()
+    return profiler, token
+
+
+def finish_profiler(token):
+    # O contexto deixa de apontar para o profiler antes que stop/save sejam enviados ao threadpool
+    _perfil.reset(token)
+
+
+def save_profile(profiler: SamplingProfiler, method: str, path: str, duration: float) -> str:
+    os.makedirs(PROFILE_DIR, exist_ok=True)
+    profile_id = f"{datetime.now().strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:8]}"
+    with open(os.path.join(PROFILE_DIR, f"{profile_id}.folded"), "w") as f:
+        f.write(profiler.folded())
+    # Metadados em arquivo separado para manter o .folded no formato puro
+    with open(os.path.join(PROFILE_DIR, f"{profile_id}.json"), "w") as f:
+        json.dump({
+            "id": profile_id,
+            "method": method,
+            "path": path,
+            "duration_ms": round(duration * 1000, 1),
+            "samples": sum(profiler.samples.values()),
+            "created": datetime.now().isoformat()
+        }, f)
+    _prune_profiles()
+    return profile_id
+
+
+def _prune_profiles():
+    files = sorted(f for f in os.listdir(PROFILE_DIR) if f.endswith(".folded"))
+    for name in files[:-PROFILE_MAX_FILES]:
+        profile_id = name[:-len(".folded")]
+        for ext in (".folded", ".json"):
+            file_path = os.path.join(PROFILE_DIR, profile_id + ext)
+            if os.path.exists(file_path):
+                os.remove(file_path)
+
+
+def list_profiles() -> list:
+    if not os.path.isdir(PROFILE_DIR):
+        return []
+    profiles = []
+    for name in sorted(os.listdir(PROFILE_DIR), reverse=True):
+        if name.endswith(".json"):
+            with open(os.path.join(PROFILE_DIR, name)) as f:
+                profiles.append(json.load(f))
+    return profiles
+
+
+def read_profile(profile_id: str):
+    if not PROFILE_ID_PATTERN.match(profile_id):
+        return None
+    file_path = os.path.join(PROFILE_DIR, f"{profile_id}.folded")
+    if not os.path.exists(file_path):
+        return None
+    with open(file_path) as f:
+        return f.read()
+
+
+def profiling_requested(request) -> bool:
+    # Verificação barata: só cabeçalho/parâmetro, sem decodificar o token
+    return (
+        request.headers.get("X-Profile") == "1"
+        or request.query_params.get("profile") in ("1", "true")
+    )
+
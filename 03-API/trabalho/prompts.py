@@ -0,0 +1,18 @@
+import hashlib
+import os
+
+# Cache por arquivo: (mtime, texto, versão). Recarrega se o arquivo mudar em disco.
+_cache = {}
+
+
+def carregar_prompt(caminho: str):
+    """Retorna o texto do prompt e sua versão (hash curto do conteúdo)."""
+    mtime = os.stat(caminho).st_mtime_ns
+    cached = _cache.get(caminho)
+    if cached is None or cached[0] != mtime:
+        with open(caminho, "r") as f:
+            texto = f.read()
+        versao = hashlib.sha256(texto.encode("utf-8")).hexdigest()[:12]
+        cached = (mtime, texto, versao)
+        _cache[caminho] = cached
+    return cached[1], cached[2]
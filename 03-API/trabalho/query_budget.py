@@ -0,0 +1,122 @@
+import logging
+import time
+from collections import Counter
+from contextvars import ContextVar
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+import metrics
+from database import log_engine
+from settings import SQL_DEBUG_HEADER, SQL_REPEATED_QUERY_THRESHOLD
+
+logger = logging.getLogger("API")
+
+DEBUG_HEADER = "X-Debug-Queries"
+
+# Contadores da requisição atual: um dicionário mutável, como o contexto de log,
+# para que consultas feitas em threads do pool também sejam contabilizadas
+_contador: ContextVar[dict] = ContextVar("sql_contador", default=None)
+
+metrics.registrar("db_query_duration_seconds", "summary", "Duração das consultas SQL por banco")
+metrics.registrar("db_queries_per_request", "summary", "Consultas SQL por requisição e rota, sem as gravações de log")
+metrics.registrar("db_query_budget_exceeded_total", "counter", "Requisições acima do orçamento de consultas da rota")
+
+
+def _banco(conn) -> str:
+    return "log" if conn.engine is log_engine else "ementas"
+
+
+def _escrita_de_log(banco: str, statement: str) -> bool:
+    # Gravações do DatabaseHandler: contadas à parte, pois variam com LOG_LEVEL
+    return banco == "log" and statement.startswith("INSERT INTO logs")
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _antes(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("sql_inicio", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _depois(conn, cursor, statement, parameters, context, executemany):
+    duracao = time.perf_counter() - conn.info["sql_inicio"].pop()
+    banco = _banco(conn)
+    metrics.observar("db_query_duration_seconds", duracao, database=banco)
+    contador = _contador.get()
+    if contador is not None:
+        tipo = "log_writes" if _escrita_de_log(banco, statement) else "queries"
+        contador[tipo]["count"] += 1
+        contador[tipo]["seconds"] += duracao
+        if tipo == "queries":
+            contador["statements"][statement] += 1
+
+
+def iniciar():
+    return _contador.set({
+        "queries": {"count": 0, "seconds": 0.0},
+        "log_writes": {"count": 0, "seconds": 0.0},
+        "statements": Counter()
+    })
+
+
+def encerrar(token):
+    _contador.reset(token)
+
+
+def ignorar():
+    """Deixa de contabilizar as consultas do contexto atual (ex.: tarefa de fundo criada pela requisição)."""
+    _contador.set(None)
+
+
+def orcamento(max_queries: int):
+    """Declara o máximo de consultas SQL da rota (sem contar as gravações de log)."""
+    def decorator(endpoint):
+        endpoint.query_budget = max_queries
+        return endpoint
+    return decorator
+
+
+def finalizar(request, response):
+    """Registra as métricas da requisição, verifica o orçamento da rota e adiciona os cabeçalhos de depuração."""
+    contador = _contador.get()
+    route = request.scope.get("route")
+    if contador is None or route is None:
+        return
+    consultas = contador["queries"]["count"]
+    metrics.observar("db_queries_per_request", consultas, route=route.path)
+
+    budget = getattr(getattr(route, "endpoint", None), "query_budget", None)
+    if budget is not None and consultas > budget:
+        metrics.incrementar("db_query_budget_exceeded_total", route=route.path)
+        logger.warning(
+            f"Rota {route.path} executou {consultas} consultas (orçamento {budget})",
+            extra={"error_code": "QUERY_BUDGET_EXCEEDED"}
+        )
+    repetidas = [(sql, n) for sql, n in contador["statements"].items() if n >= SQL_REPEATED_QUERY_THRESHOLD]
+    for sql, n in repetidas:
+        # Mesma consulta repetida na requisição: sinal típico de N+1
+        logger.warning(f"Consulta repetida {n} vezes em {route.path} (possível N+1): {sql[:200]}")
+
+    if SQL_DEBUG_HEADER or request.headers.get(DEBUG_HEADER) == "1":
+        response.headers["X-DB-Queries"] = str(consultas)
+        response.headers["X-DB-Time-Ms"] = f"{contador['queries']['seconds'] * 1000:.1f}"
+        response.headers["X-Log-Writes"] = str(contador["log_writes"]["count"])
+        if budget is not None:
+            response.headers["X-DB-Query-Budget"] = str(budget)
+
+
+def verificar_orcamento(client, method: str, url: str, **kwargs):
+    """
+    Auxiliar para testes: executa a requisição com o cliente (ex.: TestClient) e falha
+    com AssertionError se a rota passar do orçamento de consultas declarado.
+    """
+    headers = {**kwargs.pop("headers", {}), DEBUG_HEADER: "1"}
+    response = client.request(method, url, headers=headers, **kwargs)
+    consultas = response.headers.get("X-DB-Queries")
+    budget = response.headers.get("X-DB-Query-Budget")
+    assert consultas is not None, f"{method} {url}: resposta sem contagem de consultas"
+    assert budget is not None, f"{method} {url}: rota sem orçamento de consultas declarado"
+    assert int(consultas) <= int(budget), (
+        f"{method} {url} executou {consultas} consultas, acima do orçamento de {budget}"
+    )
+    return response
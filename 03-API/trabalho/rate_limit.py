@@ -0,0 +1,226 @@
+import asyncio
+import math
+import threading
+import time
+from contextlib import asynccontextmanager
+
+from fastapi import status
+
+from errors import APIError
+from settings import (
+    RATE_LIMIT_USER_TOKENS_PER_MINUTE, RATE_LIMIT_USER_BURST,
+    RATE_LIMIT_GLOBAL_TOKENS_PER_MINUTE, RATE_LIMIT_GLOBAL_BURST, RATE_LIMIT_ENABLED,
+    LLM_MAX_CONCURRENCY, LLM_MAX_QUEUE, LLM_OUTPUT_TOKENS_ESTIMATE
+)
+
+
+def estimar_tokens(*textos: str) -> int:
+    # Aproximação de ~4 caracteres por token, mais a resposta esperada do modelo
+    return sum(len(t) for t in textos) // 4 + LLM_OUTPUT_TOKENS_ESTIMATE
+
+
+class TokenBucket:
+    """Balde de tokens com reposição contínua (tokens por segundo)."""
+
+    def __init__(self, capacity: float, refill_per_second: float):
+        self.capacity = capacity
+        self.refill_per_second = refill_per_second
+        self.tokens = capacity
+        self.updated_at = time.monotonic()
+        self.consumed = 0
+
+    def _refill(self, now: float):
+        elapsed = now - self.updated_at
+        if elapsed > 0:
+            self.tokens = min(self.capacity, self.tokens + elapsed * self.refill_per_second)
+            self.updated_at = now
+
+    def wait_time(self, amount: float, now: float) -> float:
+        # Segundos até haver saldo para `amount`; 0 se já houver
+        self._refill(now)
+        amount = min(amount, self.capacity)
+        if self.tokens >= amount:
+            return 0.0
+        return (amount - self.tokens) / self.refill_per_second
+
+    def available(self, now: float) -> float:
+        self._refill(now)
+        return self.tokens
+
+    def consume(self, amount: float):
+        self.tokens -= min(amount, self.capacity)
+        self.consumed += amount
+
+    def refund(self, amount: float):
+        self.tokens = min(self.capacity, self.tokens + min(amount, self.capacity))
+        self.consumed -= amount
+
+    def is_full(self, now: float) -> bool:
+        self._refill(now)
+        return self.tokens >= self.capacity
+
+    def snapshot(self) -> dict:
+        self._refill(time.monotonic())
+        return {
+            "available": int(self.tokens),
+            "capacity": int(self.capacity),
+            "consumed": int(self.consumed)
+        }
+
+
+class AdmissionController:
+    """
+    Controle de admissão das chamadas ao LLM: baldes por usuário e global,
+    ponderados por tokens estimados, e descarte de carga pela profundidade da fila.
+    Baldes de usuários ociosos (já cheios) são descartados periodicamente.
+    """
+
+    # Intervalo mínimo, em segundos, entre as varreduras de baldes ociosos
+    EVICT_INTERVAL = 60
+
+    def __init__(
+        self,
+        user_tokens_per_minute: int,
+        user_burst: int,
+        global_tokens_per_minute: int,
+        global_burst: int,
+        max_concurrency: int,
+        max_queue: int,
+        enforce_quotas: bool = True
+    ):
+        self.user_refill = user_tokens_per_minute / 60
+        self.user_burst = user_burst
+        self.global_bucket = TokenBucket(global_burst, global_tokens_per_minute / 60)
+        self.user_buckets = {}
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        # Sem cotas, o consumo continua contabilizado, mas nenhuma requisição é recusada por ele
+        self.enforce_quotas = enforce_quotas
+        self.running = 0
+        self.waiting = 0
+        self.rejected = {"user_limit": 0, "global_limit": 0, "queue_full": 0}
+        # Média móvel da duração das chamadas, usada no Retry-After
+        self.avg_duration = 5.0
+        self._semaphore = None
+        self._lock = threading.Lock()
+        self._evicted_at = time.monotonic()
+
+    def _evict_idle(self, now: float):
+        # Um balde cheio equivale a um balde novo: descartá-lo não altera a cota do usuário
+        if now - self._evicted_at < self.EVICT_INTERVAL:
+            return
+        self._evicted_at = now
+        for username in [u for u, bucket in self.user_buckets.items() if bucket.is_full(now)]:
+            del self.user_buckets[username]
+
+    def _user_bucket(self, username: str) -> TokenBucket:
+        bucket = self.user_buckets.get(username)
+        if bucket is None:
+            bucket = TokenBucket(self.user_burst, self.user_refill)
+            self.user_buckets[username] = bucket
+        return bucket
+
+    def admit(self, username: str, estimated_tokens: int):
+        with self._lock:
+            if self.waiting >= self.max_queue:
+                self.rejected["queue_full"] += 1
+                retry_after = self.avg_duration * (self.waiting + self.running) / self.max_concurrency
+                raise APIError(
+                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    detail="Serviço sobrecarregado. Tente novamente em instantes",
+                    internal_code="SERVICE_OVERLOADED",
+                    headers={"Retry-After": str(max(1, math.ceil(retry_after)))}
+                )
+
+            now = time.monotonic()
+            self._evict_idle(now)
+            user_bucket = self._user_bucket(username)
+            user_wait = user_bucket.wait_time(estimated_tokens, now)
+            if user_wait > 0 and self.enforce_quotas:
+                self.rejected["user_limit"] += 1
+                raise APIError(
+                    status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                    detail="Limite de uso do usuário excedido",
+                    internal_code="USER_RATE_LIMITED",
+                    headers={"Retry-After": str(math.ceil(user_wait))}
+                )
+
+            global_wait = self.global_bucket.wait_time(estimated_tokens, now)
+            if global_wait > 0 and self.enforce_quotas:
+                self.rejected["global_limit"] += 1
+                raise APIError(
+                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    detail="Cota global do modelo esgotada. Tente novamente mais tarde",
+                    internal_code="GLOBAL_RATE_LIMITED",
+                    headers={"Retry-After": str(math.ceil(global_wait))}
+                )
+
+            for bucket in (user_bucket, self.global_bucket):
+                if self.enforce_quotas:
+                    bucket.consume(estimated_tokens)
+                else:
+                    bucket.consumed += estimated_tokens
+
+    def settle(self, username: str, estimated_tokens: int, actual_tokens: int):
+        # Corrige os baldes com o consumo real informado pelo provedor
+        if not actual_tokens:
+            return
+        diff = actual_tokens - estimated_tokens
+        with self._lock:
+            for bucket in (self._user_bucket(username), self.global_bucket):
+                bucket.tokens = min(bucket.capacity, bucket.tokens - diff)
+                bucket.consumed += diff
+
+    def refund(self, username: str, estimated_tokens: int):
+        # Devolve os tokens debitados na admissão quando a chamada ao modelo falha
+        with self._lock:
+            for bucket in (self._user_bucket(username), self.global_bucket):
+                bucket.refund(estimated_tokens)
+
+    @asynccontextmanager
+    async def slot(self):
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        self.waiting += 1
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self.waiting -= 1
+        self.running += 1
+        started = time.monotonic()
+        try:
+            yield
+        finally:
+            self.running -= 1
+            self._semaphore.release()
+            self.avg_duration = 0.8 * self.avg_duration + 0.2 * (time.monotonic() - started)
+
+    def usage(self) -> dict:
+        with self._lock:
+            return {
+                "global": self.global_bucket.snapshot(),
+                "users": {
+                    username: bucket.snapshot()
+                    for username, bucket in sorted(self.user_buckets.items())
+                },
+                "queue": {
+                    "running": self.running,
+                    "waiting": self.waiting,
+                    "max_concurrency": self.max_concurrency,
+                    "max_queue": self.max_queue,
+                    "avg_duration_seconds": round(self.avg_duration, 3)
+                },
+                "rejected": dict(self.rejected),
+                "quotas_enforced": self.enforce_quotas
+            }
+
+
+admission = AdmissionController(
+    user_tokens_per_minute=RATE_LIMIT_USER_TOKENS_PER_MINUTE,
+    user_burst=RATE_LIMIT_USER_BURST,
+    global_tokens_per_minute=RATE_LIMIT_GLOBAL_TOKENS_PER_MINUTE,
+    global_burst=RATE_LIMIT_GLOBAL_BURST,
+    max_concurrency=LLM_MAX_CONCURRENCY,
+    max_queue=LLM_MAX_QUEUE,
+    enforce_quotas=RATE_LIMIT_ENABLED
+)
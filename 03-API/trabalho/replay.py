@@ -0,0 +1,136 @@
+import argparse
+import asyncio
+import logging
+import sqlite3
+import statistics
+import time
+
+import httpx
+
+from database import SessionLocal, engine
+from models import Acordao
+
+logger = logging.getLogger("API")
+
+
+def carregar_trafego(limite: int, a_partir_de: int = 0) -> list:
+    """Textos e ementas dos acórdãos armazenados, na ordem em que foram gerados."""
+    db = SessionLocal()
+    try:
+        acordaos = (
+            db.query(Acordao)
+            .filter(Acordao.id > a_partir_de, Acordao.ementa.isnot(None))
+            .order_by(Acordao.id)
+            .limit(limite)
+            .all()
+        )
+        return [(a.id, a.texto, a.ementa) for a in acordaos if a.texto]
+    finally:
+        db.close()
+
+
+def preparar_banco(destino: str):
+    """
+    Copia o banco de acórdãos para `destino`, o banco descartável da API durante a reprodução:
+    as ementas geradas no replay não entram no banco medido nem no de origem.
+    """
+    origem = sqlite3.connect(engine.url.database)
+    copia = sqlite3.connect(destino)
+    try:
+        with copia:
+            origem.backup(copia)
+    finally:
+        copia.close()
+        origem.close()
+
+
+def _percentil(valores: list, p: float) -> float:
+    ordenados = sorted(valores)
+    return ordenados[min(len(ordenados) - 1, int(round(p / 100 * (len(ordenados) - 1))))]
+
+
+def resumir(nome: str, duracoes: list, erros: int, total_segundos: float) -> str:
+    if not duracoes:
+        return f"{nome}: nenhuma requisição bem-sucedida ({erros} erros)"
+    return (
+        f"{nome}: {len(duracoes)} ok, {erros} erros, {len(duracoes) / total_segundos:.2f} req/s | "
+        f"p50 {_percentil(duracoes, 50) * 1000:.0f} ms, p95 {_percentil(duracoes, 95) * 1000:.0f} ms, "
+        f"p99 {_percentil(duracoes, 99) * 1000:.0f} ms, média {statistics.mean(duracoes) * 1000:.0f} ms"
+    )
+
+
+async def reproduzir(
+    url: str, usuario: str, senha: str, trafego: list, concorrencia: int, verificar: bool,
+    combinado: bool = False
+):
+    """
+    Envia os acórdãos armazenados a /v1/acordao/gerar (e as ementas a /v1/ementa/verificar),
+    ou a /v1/acordao/gerar_verificar se `combinado`, de uma API em execução, normalmente com
+    LLM_TRANSPORT=replay, e mede as latências.
+    """
+    duracoes = {"gerar": [], "verificar": [], "gerar_verificar": []}
+    erros = {"gerar": 0, "verificar": 0, "gerar_verificar": 0}
+    semaforo = asyncio.Semaphore(concorrencia)
+
+    async with httpx.AsyncClient(base_url=url, timeout=None) as client:
+        resposta = await client.post("/v1/auth/login", json={"usuario": usuario, "senha": senha})
+        resposta.raise_for_status()
+        headers = {
+            "Authorization": f"Bearer {resposta.json()['access_token']}",
+            "Content-Type": "text/plain"
+        }
+
+        async def enviar(rota: str, nome: str, conteudo: str, acordao_id: int):
+            async with semaforo:
+                started = time.perf_counter()
+                r = await client.post(rota, content=conteudo.encode("utf-8"), headers=headers)
+                if r.status_code == 200:
+                    duracoes[nome].append(time.perf_counter() - started)
+                else:
+                    erros[nome] += 1
+                    logger.warning(f"{rota} falhou para o acórdão {acordao_id}: {r.status_code} {r.text[:200]}")
+
+        inicio = time.perf_counter()
+        tarefas = []
+        for acordao_id, texto, ementa in trafego:
+            if combinado:
+                tarefas.append(enviar("/v1/acordao/gerar_verificar", "gerar_verificar", texto, acordao_id))
+                continue
+            tarefas.append(enviar("/v1/acordao/gerar", "gerar", texto, acordao_id))
+            if verificar:
+                tarefas.append(enviar("/v1/ementa/verificar", "verificar", ementa, acordao_id))
+        await asyncio.gather(*tarefas)
+        total_segundos = time.perf_counter() - inicio
+
+    return [resumir(nome, duracoes[nome], erros[nome], total_segundos) for nome in duracoes if duracoes[nome] or erros[nome]]
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    parser = argparse.ArgumentParser(description="Reproduz o tráfego dos acórdãos armazenados contra a API")
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--preparar-banco", metavar="DESTINO",
+                        help="Copiar o banco de acórdãos para DESTINO (banco da API durante o replay) e sair")
+    parser.add_argument("--usuario")
+    parser.add_argument("--senha")
+    parser.add_argument("--limite", type=int, default=100)
+    parser.add_argument("--a-partir-de", type=int, default=0, help="Reproduzir acórdãos com id maior que este")
+    parser.add_argument("--concorrencia", type=int, default=4)
+    parser.add_argument("--sem-verificar", action="store_true", help="Não chamar /v1/ementa/verificar")
+    parser.add_argument("--combinado", action="store_true", help="Usar /v1/acordao/gerar_verificar (uma chamada ao modelo)")
+    args = parser.parse_args()
+
+    if args.preparar_banco:
+        preparar_banco(args.preparar_banco)
+        print(f"Banco copiado para {args.preparar_banco}: inicie a API com DATABASE_URL=sqlite:///{args.preparar_banco}")
+        raise SystemExit
+    if not args.usuario or not args.senha:
+        parser.error("--usuario e --senha são obrigatórios")
+
+    trafego = carregar_trafego(args.limite, args.a_partir_de)
+    print(f"{len(trafego)} acórdãos carregados")
+    for linha in asyncio.run(reproduzir(
+        args.url, args.usuario, args.senha, trafego, args.concorrencia, not args.sem_verificar, args.combinado
+    )):
+        print(linha)
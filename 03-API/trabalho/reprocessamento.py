@@ -0,0 +1,273 @@
+import asyncio
+import logging
+import time
+from datetime import datetime, timezone
+
+from fastapi import status
+from sqlalchemy import or_
+
+from database import SessionLocal
+from errors import APIError
+from llm import FECHADO, circuit_breaker, completar, mensagens_geracao
+from models import Acordao, EmentaAnterior, ReprocessingCampaign
+from models.acordaos import STATUS_CONCLUIDO
+from normalizacao import normalizar_texto
+from prompts import carregar_prompt
+from rate_limit import TokenBucket, admission, estimar_tokens
+from settings import MODEL_NAME, REPROCESSING_BATCH_SIZE
+from structured_logging import start_log_context, reset_log_context
+
+logger = logging.getLogger("API")
+
+PENDENTE = "pendente"
+EM_ANDAMENTO = "em_andamento"
+PAUSADA = "pausada"
+CONCLUIDA = "concluida"
+INTERROMPIDA = "interrompida"
+
+ATIVAS = (PENDENTE, EM_ANDAMENTO)
+
+
+def _agora() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def _restaurar_orcamento(campanha: ReprocessingCampaign) -> TokenBucket:
+    """Orçamento por hora da campanha, com o saldo do último checkpoint mais a reposição desde então."""
+    orcamento = TokenBucket(campanha.tokens_per_hour, campanha.tokens_per_hour / 3600)
+    if campanha.budget_tokens is not None and campanha.budget_at is not None:
+        decorrido = max(0.0, (_agora() - campanha.budget_at.replace(tzinfo=None)).total_seconds())
+        orcamento.tokens = min(orcamento.capacity, campanha.budget_tokens + decorrido * orcamento.refill_per_second)
+    return orcamento
+
+
+def _salvar_orcamento(campanha: ReprocessingCampaign, orcamento: TokenBucket):
+    # Gravado junto com o checkpoint: pausar, retomar ou reiniciar a API não devolve o saldo gasto
+    campanha.budget_tokens = orcamento.available(time.monotonic())
+    campanha.budget_at = _agora()
+
+
+def _desatualizados(db, campanha: ReprocessingCampaign):
+    return db.query(Acordao).filter(
+        Acordao.status == STATUS_CONCLUIDO,
+        or_(Acordao.prompt_version.is_(None), Acordao.prompt_version != campanha.prompt_version)
+    )
+
+
+class Reprocessador:
+    """
+    Executa em segundo plano a campanha ativa de reprocessamento, um acórdão por vez,
+    dentro do orçamento de tokens por hora. O progresso é gravado a cada acórdão
+    (last_acordao_id), e a campanha é retomada na próxima inicialização da API.
+    """
+
+    def __init__(self, batch_size: int):
+        self.batch_size = batch_size
+        self._task = None
+        self._wake = asyncio.Event()
+
+    def criar_campanha(self, db, username: str, tokens_per_hour: int) -> ReprocessingCampaign:
+        if db.query(ReprocessingCampaign).filter(ReprocessingCampaign.status.in_(ATIVAS + (PAUSADA,))).first():
+            raise APIError(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="Já existe uma campanha de reprocessamento ativa ou pausada",
+                internal_code="REPROCESSING_ALREADY_ACTIVE"
+            )
+        _, prompt_version = carregar_prompt("prompt.md")
+        campanha = ReprocessingCampaign(
+            prompt_version=prompt_version,
+            model=MODEL_NAME,
+            status=PENDENTE,
+            tokens_per_hour=tokens_per_hour,
+            created_by=username,
+            total=0,
+            processed=0,
+            failed=0,
+            tokens_used=0,
+            last_acordao_id=0
+        )
+        campanha.total = _desatualizados(db, campanha).count()
+        if campanha.total == 0:
+            raise APIError(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=f"Todos os acórdãos já usam a versão atual do prompt ({prompt_version})",
+                internal_code="NOTHING_TO_REPROCESS"
+            )
+        db.add(campanha)
+        db.commit()
+        db.refresh(campanha)
+        logger.info(f"Campanha de reprocessamento {campanha.id} criada: {campanha.total} acórdãos para o prompt {prompt_version}")
+        self._wake.set()
+        return campanha
+
+    def alterar_status(self, db, campanha_id: int, novo_status: str) -> ReprocessingCampaign:
+        campanha = db.get(ReprocessingCampaign, campanha_id)
+        if campanha is None:
+            raise APIError(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Campanha não encontrada",
+                internal_code="CAMPAIGN_NOT_FOUND"
+            )
+        permitido = {PAUSADA: ATIVAS, EM_ANDAMENTO: (PAUSADA,)}[novo_status]
+        if campanha.status not in permitido:
+            raise APIError(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=f"Campanha com status {campanha.status} não pode passar a {novo_status}",
+                internal_code="CAMPAIGN_INVALID_STATUS"
+            )
+        campanha.status = novo_status
+        db.commit()
+        db.refresh(campanha)
+        logger.info(f"Campanha de reprocessamento {campanha_id}: {novo_status}")
+        self._wake.set()
+        return campanha
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self):
+        while True:
+            self._wake.clear()
+            db = SessionLocal()
+            try:
+                campanha = (
+                    db.query(ReprocessingCampaign)
+                    .filter(ReprocessingCampaign.status.in_(ATIVAS))
+                    .order_by(ReprocessingCampaign.id)
+                    .first()
+                )
+                if campanha is not None:
+                    await self._executar(db, campanha)
+                    continue
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Erro no reprocessamento: {str(e)}")
+                await asyncio.sleep(30)
+                continue
+            finally:
+                db.close()
+            await self._wake.wait()
+
+    async def _executar(self, db, campanha: ReprocessingCampaign):
+        if campanha.status == PENDENTE:
+            campanha.status = EM_ANDAMENTO
+            db.commit()
+        logger.info(f"Campanha de reprocessamento {campanha.id} a partir do acórdão {campanha.last_acordao_id}")
+        # Orçamento próprio, separado das cotas dos usuários, retomado do último checkpoint
+        orcamento = _restaurar_orcamento(campanha)
+
+        while True:
+            lote = (
+                _desatualizados(db, campanha)
+                .filter(Acordao.id > campanha.last_acordao_id)
+                .order_by(Acordao.id)
+                .limit(self.batch_size)
+                .all()
+            )
+            if not lote:
+                campanha.status = CONCLUIDA
+                db.commit()
+                logger.info(f"Campanha de reprocessamento {campanha.id} concluída: {campanha.processed} acórdãos")
+                return
+            for acordao in lote:
+                db.refresh(campanha)
+                if campanha.status != EM_ANDAMENTO:
+                    logger.info(f"Campanha de reprocessamento {campanha.id} {campanha.status}")
+                    return
+                texto_prompt, prompt_version = carregar_prompt("prompt.md")
+                if prompt_version != campanha.prompt_version:
+                    # Gerar com outro prompt e registrar a versão da campanha seria incorreto
+                    campanha.status = INTERROMPIDA
+                    campanha.error = f"prompt.md alterado para a versão {prompt_version}"
+                    db.commit()
+                    logger.warning(f"Campanha de reprocessamento {campanha.id} interrompida: {campanha.error}")
+                    return
+                if not await self._reprocessar(db, campanha, acordao, texto_prompt, orcamento):
+                    # Falha do provedor: recomeça do checkpoint, sem pular este acórdão
+                    break
+            db.expunge_all()
+            campanha = db.get(ReprocessingCampaign, campanha.id)
+
+    async def _reprocessar(self, db, campanha, acordao, texto_prompt: str, orcamento: TokenBucket) -> bool:
+        """Reprocessa um acórdão; retorna False se deve ser tentado de novo."""
+        texto_modelo = normalizar_texto(acordao.texto or "").texto
+        tokens_estimados = estimar_tokens(texto_prompt, texto_modelo)
+        # Aguarda saldo no orçamento por hora e o circuito do modelo fechado
+        while (espera := orcamento.wait_time(tokens_estimados, time.monotonic())) > 0:
+            await asyncio.sleep(min(espera, 60))
+        while circuit_breaker.state != FECHADO:
+            await asyncio.sleep(5)
+        db.refresh(campanha)
+        if campanha.status != EM_ANDAMENTO:
+            # Pausada durante a espera
+            return False
+        orcamento.consume(tokens_estimados)
+
+        token = start_log_context(route="reprocessamento", acordao_id=acordao.id)
+        try:
+            async with admission.slot():
+                resposta = await completar(mensagens_geracao(texto_prompt, texto_modelo))
+        except APIError as e:
+            if e.internal_code in ("LLM_CIRCUIT_OPEN", "LLM_PROVIDER_ERROR"):
+                logger.warning(f"Reprocessamento do acórdão {acordao.id} adiado: {e.internal_code}")
+                # A chamada não chegou ao modelo: devolve o débito ao orçamento
+                orcamento.refund(tokens_estimados)
+                await asyncio.sleep(5)
+                return False
+            self._registrar_falha(db, campanha, acordao, e.detail, orcamento)
+            return True
+        except Exception as e:
+            self._registrar_falha(db, campanha, acordao, str(e), orcamento)
+            return True
+        finally:
+            reset_log_context(token)
+
+        tokens_reais = resposta.get("usage", {}).get("total_tokens") or tokens_estimados
+        if tokens_reais != tokens_estimados:
+            orcamento.tokens = min(orcamento.capacity, orcamento.tokens - (tokens_reais - tokens_estimados))
+        db.add(EmentaAnterior(
+            acordao_id=acordao.id,
+            campaign_id=campanha.id,
+            ementa=acordao.ementa,
+            model=acordao.model,
+            prompt_version=acordao.prompt_version,
+            feedback=acordao.feedback,
+            verificacao=acordao.verificacao
+        ))
+        acordao.ementa = resposta["choices"][0]["message"]["content"]
+        acordao.model = MODEL_NAME
+        acordao.prompt_version = campanha.prompt_version
+        # O feedback e a verificação se referiam à ementa anterior e ficam guardados com ela
+        acordao.feedback = None
+        acordao.verificacao = None
+        campanha.last_acordao_id = acordao.id
+        campanha.processed += 1
+        campanha.tokens_used += tokens_reais
+        _salvar_orcamento(campanha, orcamento)
+        # Ementa nova, histórico e checkpoint no mesmo commit
+        db.commit()
+        logger.debug(f"Acórdão {acordao.id} reprocessado pela campanha {campanha.id}")
+        return True
+
+    def _registrar_falha(self, db, campanha, acordao, erro: str, orcamento: TokenBucket):
+        db.rollback()
+        logger.error(f"Falha ao reprocessar o acórdão {acordao.id}: {erro}")
+        campanha.last_acordao_id = acordao.id
+        _salvar_orcamento(campanha, orcamento)
+        campanha.failed += 1
+        campanha.error = f"Acórdão {acordao.id}: {erro}"
+        db.commit()
+
+
+reprocessador = Reprocessador(REPROCESSING_BATCH_SIZE)
@@ -8,6 +8,7 @@ load_dotenv()
 
 # API Settings
 API_TITLE = os.getenv("API_TITLE","API de Geração de Ementas de Acórdãos")
+GZIP_MINIMUM_SIZE = int(os.getenv("GZIP_MINIMUM_SIZE", "1000"))
 
 
 # Security Settings
@@ -15,15 +16,92 @@ SECRET_KEY = os.getenv("SECRET_KEY", "sua_chave_secreta")
 INSTALL_KEY = os.getenv("INSTALL_KEY", "chave-secreta-instalacao")
 
 # Database Settings
-DATABASE_URL = "sqlite:///ementas.db"
-LOG_DATABASE_URL = "sqlite:///log.db"
+DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///ementas.db")
+LOG_DATABASE_URL = os.getenv("LOG_DATABASE_URL", "sqlite:///log.db")
+
+# Compressão dos textos dos acórdãos ("zlib" ou "zstd", que requer o pacote zstandard)
+TEXT_COMPRESSION = os.getenv("TEXT_COMPRESSION", "zlib")
+TEXT_COMPRESSION_LEVEL = int(os.getenv("TEXT_COMPRESSION_LEVEL", "6"))
+
+# Upload Store Settings: PDFs endereçados pelo SHA-256, com limite de tamanho total (LRU)
+UPLOAD_DIR = os.getenv("UPLOAD_DIR", "uploads")
+UPLOAD_MAX_BYTES = int(os.getenv("UPLOAD_MAX_BYTES", str(512 * 1024 * 1024)))
+# Máximo de textos extraídos de PDFs mantidos em cache (os mais antigos são removidos)
+PDF_TEXT_CACHE_MAX_ENTRIES = int(os.getenv("PDF_TEXT_CACHE_MAX_ENTRIES", "5000"))
 
 # Model Settings
 MODEL_NAME = os.getenv("LITELLM_MODEL", "gpt-4o-mini")
 
+# Normalização dos textos antes do modelo: linhas de topo/rodapé examinadas por página
+# e fração mínima de páginas em que uma linha deve se repetir para ser descartada
+NORMALIZACAO_LINHAS_BORDA = int(os.getenv("NORMALIZACAO_LINHAS_BORDA", "3"))
+NORMALIZACAO_LIMIAR_REPETICAO = float(os.getenv("NORMALIZACAO_LIMIAR_REPETICAO", "0.6"))
+
 # Logging Settings
 LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
 LOG_FORMAT = '%(asctime)s - %(levelname)s - %(message)s'
+LOG_JSON = os.getenv("LOG_JSON", "false").lower() == "true"
 
 # Security Settings
 TOKEN_EXPIRE_HOURS = 1
+
+# SQL Instrumentation Settings: cabeçalhos de depuração com a contagem de consultas
+# (também enviados quando a requisição traz X-Debug-Queries: 1) e limite para alertar N+1
+SQL_DEBUG_HEADER = os.getenv("SQL_DEBUG_HEADER", "false").lower() == "true"
+SQL_REPEATED_QUERY_THRESHOLD = int(os.getenv("SQL_REPEATED_QUERY_THRESHOLD", "10"))
+
+# Rate Limiting Settings (limites em tokens estimados do modelo)
+RATE_LIMIT_USER_TOKENS_PER_MINUTE = int(os.getenv("RATE_LIMIT_USER_TOKENS_PER_MINUTE", "20000"))
+RATE_LIMIT_USER_BURST = int(os.getenv("RATE_LIMIT_USER_BURST", "40000"))
+RATE_LIMIT_GLOBAL_TOKENS_PER_MINUTE = int(os.getenv("RATE_LIMIT_GLOBAL_TOKENS_PER_MINUTE", "150000"))
+RATE_LIMIT_GLOBAL_BURST = int(os.getenv("RATE_LIMIT_GLOBAL_BURST", "300000"))
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "8"))
+LLM_MAX_QUEUE = int(os.getenv("LLM_MAX_QUEUE", "16"))
+LLM_OUTPUT_TOKENS_ESTIMATE = int(os.getenv("LLM_OUTPUT_TOKENS_ESTIMATE", "1000"))
+
+# Profiling Settings (perfil sob demanda para administradores)
+PROFILE_DIR = os.getenv("PROFILE_DIR", "profiles")
+PROFILE_INTERVAL_MS = float(os.getenv("PROFILE_INTERVAL_MS", "5"))
+PROFILE_MAX_FILES = int(os.getenv("PROFILE_MAX_FILES", "50"))
+
+# Idempotency Settings
+IDEMPOTENCY_TTL_HOURS = int(os.getenv("IDEMPOTENCY_TTL_HOURS", "24"))
+IDEMPOTENCY_WAIT_SECONDS = int(os.getenv("IDEMPOTENCY_WAIT_SECONDS", "30"))
+IDEMPOTENCY_LEASE_SECONDS = int(os.getenv("IDEMPOTENCY_LEASE_SECONDS", "60"))
+
+# LLM Transport Settings. LLM_TRANSPORT: "live" (provedor), "record" (provedor, gravando em
+# LLM_CASSETTE) ou "replay" (respostas do cassete, sem provedor). LLM_REPLAY_MISS: "error" ou "sample"
+LLM_TRANSPORT = os.getenv("LLM_TRANSPORT", "live")
+LLM_CASSETTE = os.getenv("LLM_CASSETTE", "cassettes/llm.jsonl")
+LLM_REPLAY_MISS = os.getenv("LLM_REPLAY_MISS", "error")
+LLM_REPLAY_SPEED = float(os.getenv("LLM_REPLAY_SPEED", "1.0"))
+# Cotas de tokens do controle de admissão; desligadas por padrão no modo replay, em que não há
+# provedor a proteger e o usuário do replay.py não deve ser limitado (a fila de concorrência continua)
+RATE_LIMIT_ENABLED = os.getenv("RATE_LIMIT_ENABLED", "false" if LLM_TRANSPORT == "replay" else "true").lower() == "true"
+
+# LLM Circuit Breaker Settings: abre quando, nas últimas LLM_CIRCUIT_WINDOW chamadas,
+# a fração de falhas ou de chamadas acima de LLM_CIRCUIT_SLOW_SECONDS passa do limite
+LLM_TIMEOUT = float(os.getenv("LLM_TIMEOUT", "120"))
+LLM_CIRCUIT_WINDOW = int(os.getenv("LLM_CIRCUIT_WINDOW", "20"))
+LLM_CIRCUIT_MIN_CALLS = int(os.getenv("LLM_CIRCUIT_MIN_CALLS", "5"))
+LLM_CIRCUIT_ERROR_RATE = float(os.getenv("LLM_CIRCUIT_ERROR_RATE", "0.5"))
+LLM_CIRCUIT_SLOW_RATE = float(os.getenv("LLM_CIRCUIT_SLOW_RATE", "0.8"))
+LLM_CIRCUIT_SLOW_SECONDS = float(os.getenv("LLM_CIRCUIT_SLOW_SECONDS", "60"))
+LLM_CIRCUIT_OPEN_SECONDS = float(os.getenv("LLM_CIRCUIT_OPEN_SECONDS", "30"))
+LLM_CIRCUIT_MAX_OPEN_SECONDS = float(os.getenv("LLM_CIRCUIT_MAX_OPEN_SECONDS", "300"))
+
+# Reprocessing Settings (campanhas de reprocessamento após mudança do prompt)
+REPROCESSING_TOKENS_PER_HOUR = int(os.getenv("REPROCESSING_TOKENS_PER_HOUR", "200000"))
+REPROCESSING_BATCH_SIZE = int(os.getenv("REPROCESSING_BATCH_SIZE", "20"))
+
+# Health Check Settings
+HEALTH_CHECK_INTERVAL = float(os.getenv("HEALTH_CHECK_INTERVAL", "10"))
+HEALTH_CHECK_TIMEOUT = float(os.getenv("HEALTH_CHECK_TIMEOUT", "3"))
+LLM_HEALTH_URL = os.getenv("LLM_HEALTH_URL", "https://api.openai.com/v1/models")
+
+# Tracing Settings (OpenTelemetry). TRACING_EXPORTER: "none", "file" (JSON por linha) ou "otlp"
+TRACING_EXPORTER = os.getenv("TRACING_EXPORTER", "none")
+TRACING_FILE = os.getenv("TRACING_FILE", "traces.jsonl")
+TRACING_OTLP_ENDPOINT = os.getenv("TRACING_OTLP_ENDPOINT", "http://localhost:4318/v1/traces")
+TRACING_SAMPLE_RATIO = float(os.getenv("TRACING_SAMPLE_RATIO", "1.0"))
+TRACING_SERVICE_NAME = os.getenv("TRACING_SERVICE_NAME", "ementas-api")
@@ -0,0 +1,56 @@
+import json
+import logging
+from contextvars import ContextVar
+from datetime import datetime, timezone
+
+from tracing import current_trace_id
+
+# Campos estruturados gravados em colunas próprias do log.db
+LOG_FIELDS = ("request_id", "username", "route", "acordao_id", "duration_ms", "error_code", "trace_id")
+
+# Dicionário mutável por requisição: dependências executadas em threads
+# alteram o mesmo objeto, e a alteração fica visível para o restante da requisição
+_log_context: ContextVar[dict] = ContextVar("log_context", default=None)
+
+
+def start_log_context(**fields):
+    return _log_context.set(dict(fields))
+
+
+def reset_log_context(token):
+    _log_context.reset(token)
+
+
+def set_log_context(**fields):
+    context = _log_context.get()
+    if context is not None:
+        context.update(fields)
+
+
+class ContextFilter(logging.Filter):
+    """Preenche os campos estruturados do registro a partir do contexto da requisição."""
+
+    def filter(self, record):
+        context = _log_context.get() or {}
+        for field in LOG_FIELDS:
+            if getattr(record, field, None) is None:
+                setattr(record, field, context.get(field))
+        if record.trace_id is None:
+            record.trace_id = current_trace_id()
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record):
+        entry = {
+            "timestamp": datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(),
+            "level": record.levelname,
+            "message": record.getMessage()
+        }
+        for field in LOG_FIELDS:
+            value = getattr(record, field, None)
+            if value is not None:
+                entry[field] = value
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False)
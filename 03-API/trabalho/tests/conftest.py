@@ -0,0 +1,54 @@
+import os
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+
+import pytest
+
+API_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(API_DIR))
+
+# A API usa caminhos relativos (ementas.db, log.db, uploads/, prompts): os testes rodam em um
+# diretório temporário com cópias dos prompts, sem tocar nos bancos do diretório da API
+_TMP_DIR = tempfile.mkdtemp(prefix="ementas-testes-")
+for prompt in API_DIR.glob("prompt*.md"):
+    shutil.copy(prompt, _TMP_DIR)
+os.chdir(_TMP_DIR)
+
+import litellm  # noqa: E402
+
+
+def resposta_falsa(**kwargs):
+    conteudo = "EMENTA DE TESTE: " + kwargs["messages"][-1]["content"][:30]
+    return {
+        "choices": [{"message": {"content": conteudo}}],
+        "usage": {"prompt_tokens": 10, "completion_tokens": 5, "total_tokens": 15}
+    }
+
+
+async def resposta_falsa_async(**kwargs):
+    return resposta_falsa(**kwargs)
+
+
+@pytest.fixture(scope="session")
+def client():
+    # Nenhuma chamada ao provedor: o modelo responde com uma ementa fixa
+    litellm.completion = resposta_falsa
+    litellm.acompletion = resposta_falsa_async
+
+    from fastapi.testclient import TestClient
+    import main
+    from settings import INSTALL_KEY
+
+    with TestClient(main.app) as client:
+        client.post("/bootstrap", json={"install_key": INSTALL_KEY})
+        yield client
+    shutil.rmtree(_TMP_DIR, ignore_errors=True)
+
+
+@pytest.fixture(scope="session")
+def admin_headers(client):
+    resposta = client.post("/v1/auth/login", json={"usuario": "user1", "senha": "p1"})
+    assert resposta.status_code == 200, resposta.text
+    return {"Authorization": f"Bearer {resposta.json()['access_token']}"}
@@ -0,0 +1,20 @@
+def test_listagem_nao_descomprime_textos(client, admin_headers, monkeypatch):
+    import models.acordaos
+
+    gerado = client.post(
+        "/v1/acordao/gerar",
+        content=("O relator apresentou voto no sentido de dar provimento ao recurso. " * 3).encode(),
+        headers={**admin_headers, "Content-Type": "text/plain"}
+    )
+    assert gerado.status_code == 200, gerado.text
+    assert gerado.json()["texto"]
+
+    def descomprimir(*args):
+        raise AssertionError("a listagem não deveria descomprimir textos")
+
+    monkeypatch.setattr(models.acordaos, "descomprimir", descomprimir)
+    resposta = client.get("/v1/acordaos", headers=admin_headers)
+    assert resposta.status_code == 200, resposta.text
+    item = next(item for item in resposta.json()["items"] if item["id"] == gerado.json()["id"])
+    assert "texto" not in item
+    assert item["ementa"]
@@ -0,0 +1,59 @@
+def test_logs_consultas_repetidas_retornam_304(client, admin_headers):
+    # Cada consulta grava os próprios logs; eles não podem mudar a ETag da consulta seguinte
+    primeira = client.get("/v1/logs", headers=admin_headers)
+    assert primeira.status_code == 200
+    etag = primeira.headers["ETag"]
+
+    segunda = client.get("/v1/logs", headers={**admin_headers, "If-None-Match": etag})
+    assert segunda.status_code == 304
+    assert segunda.headers["ETag"] == etag
+
+
+def test_logs_etag_muda_com_novos_registros(client, admin_headers):
+    etag = client.get("/v1/logs", headers=admin_headers).headers["ETag"]
+    # Requisição a outra rota grava novos logs
+    client.get("/v1/auth/status", headers=admin_headers)
+
+    resposta = client.get("/v1/logs", headers={**admin_headers, "If-None-Match": etag})
+    assert resposta.status_code == 200
+    assert resposta.headers["ETag"] != etag
+
+
+def test_acordaos_etag_muda_com_alteracoes_em_massa(client, admin_headers):
+    from sqlalchemy import update
+
+    from database import SessionLocal
+    from models import Acordao
+
+    gerado = client.post(
+        "/v1/acordao/gerar",
+        content=("O relator apresentou voto no sentido de anular a sentença. " * 3).encode(),
+        headers={**admin_headers, "Content-Type": "text/plain"}
+    )
+    assert gerado.status_code == 200, gerado.text
+    acordao_id = gerado.json()["id"]
+
+    etag = client.get("/v1/acordaos", headers=admin_headers).headers["ETag"]
+    db = SessionLocal()
+    try:
+        # Alterações em massa não passam pelo flush da sessão
+        db.query(Acordao).filter(Acordao.id == acordao_id).update(
+            {Acordao.prompt_version: "v-em-massa"}, synchronize_session=False
+        )
+        db.commit()
+    finally:
+        db.close()
+    resposta = client.get("/v1/acordaos", headers={**admin_headers, "If-None-Match": etag})
+    assert resposta.status_code == 200
+    assert resposta.headers["ETag"] != etag
+
+    etag = resposta.headers["ETag"]
+    db = SessionLocal()
+    try:
+        db.execute(update(Acordao).where(Acordao.id == acordao_id).values(feedback="Revisada"))
+        db.commit()
+    finally:
+        db.close()
+    resposta = client.get("/v1/acordaos", headers={**admin_headers, "If-None-Match": etag})
+    assert resposta.status_code == 200
+    assert resposta.headers["ETag"] != etag
@@ -0,0 +1,36 @@
+import litellm
+import pytest
+
+import llm
+
+TEXTO = "O tribunal, por maioria, conheceu do recurso especial e negou-lhe provimento. " * 4
+
+
+def _falha(excecao):
+    async def acompletion(**kwargs):
+        raise excecao
+    return acompletion
+
+
+@pytest.mark.parametrize("excecao,status_code,internal_code", [
+    (litellm.exceptions.BadRequestError("invalid", "gpt-4o-mini", "openai"), 422, "LLM_BAD_REQUEST"),
+    (litellm.exceptions.ContentPolicyViolationError("policy", "gpt-4o-mini", "openai"), 422, "LLM_CONTENT_POLICY"),
+    (litellm.exceptions.ContextWindowExceededError("too long", "gpt-4o-mini", "openai"), 413, "LLM_CONTEXT_WINDOW_EXCEEDED"),
+    (litellm.exceptions.AuthenticationError("bad key", "openai", "gpt-4o-mini"), 502, "LLM_PROVIDER_CONFIG_ERROR"),
+    (litellm.exceptions.NotFoundError("no model", "gpt-4o-mini", "openai"), 502, "LLM_PROVIDER_CONFIG_ERROR"),
+    (litellm.exceptions.APIError(500, "odd", "openai", "gpt-4o-mini"), 502, "LLM_PROVIDER_BAD_RESPONSE"),
+])
+def test_erro_do_provedor_vira_api_error_sem_abrir_o_circuito(
+    client, admin_headers, monkeypatch, excecao, status_code, internal_code
+):
+    monkeypatch.setattr(litellm, "acompletion", _falha(excecao))
+    chamadas = len(llm.circuit_breaker.results)
+
+    resposta = client.post(
+        "/v1/acordao/gerar", content=TEXTO.encode(), headers={**admin_headers, "Content-Type": "text/plain"}
+    )
+
+    assert resposta.status_code == status_code, resposta.text
+    assert resposta.json()["internal_code"] == internal_code
+    assert len(llm.circuit_breaker.results) == chamadas
+    assert llm.circuit_breaker.state == llm.FECHADO
@@ -0,0 +1,30 @@
+import datetime
+
+
+def test_linhas_sem_created_at_entram_no_filtro_de_datas(client, admin_headers):
+    from sqlalchemy import update
+
+    from database import SessionLocal
+    from migrations import atualizar_esquema
+    from models import Acordao
+
+    # Linha anterior às colunas de metadados
+    db = SessionLocal()
+    try:
+        acordao = Acordao(ementa="Ementa legada", texto="Texto do acórdão legado.")
+        db.add(acordao)
+        db.commit()
+        db.execute(update(Acordao).where(Acordao.id == acordao.id).values(created_at=None, status=None))
+        db.commit()
+        acordao_id = acordao.id
+    finally:
+        db.close()
+
+    atualizar_esquema()
+
+    hoje = datetime.datetime.now(datetime.timezone.utc).strftime("%Y-%m-%d")
+    resposta = client.get(
+        "/v1/acordaos", params={"start_date": hoje, "end_date": hoje, "limit": 100}, headers=admin_headers
+    )
+    assert resposta.status_code == 200, resposta.text
+    assert acordao_id in {item["id"] for item in resposta.json()["items"]}
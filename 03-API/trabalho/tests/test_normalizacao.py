@@ -0,0 +1,37 @@
+import pytest
+
+from normalizacao import normalizar_paginas, normalizar_texto
+
+
+def test_numeracao_removida_apenas_nas_bordas_da_pagina():
+    paginas = [
+        "1\nO recorrente pediu os seguintes valores:\n150\n230\nConforme a tabela.\n2",
+        "Página 2 de 3\nO relator votou pelo provimento.\n- 3 -",
+    ]
+    resultado = normalizar_paginas(paginas)
+
+    linhas = resultado.texto.splitlines()
+    assert linhas == [
+        "O recorrente pediu os seguintes valores:", "150", "230", "Conforme a tabela.",
+        "O relator votou pelo provimento.",
+    ]
+    assert resultado.linhas_removidas == 4
+
+
+def test_numeracao_abaixo_de_aviso_de_assinatura():
+    texto = "Documento assinado eletronicamente por Fulano\n12\nO relator votou pelo provimento."
+    assert normalizar_texto(texto).texto == "O relator votou pelo provimento."
+
+
+@pytest.mark.parametrize("texto,esperado", [
+    ("a decisão recor-\nrida foi mantida", "a decisão recorrida foi mantida"),
+    ("levou o guarda-\nchuva", "levou o guarda-chuva"),
+    ("o ex-\nprefeito recorreu", "o ex-prefeito recorreu"),
+    ("na sexta-\nfeira seguinte", "na sexta-feira seguinte"),
+    ("cumpre fazê-\nlo agora", "cumpre fazê-lo agora"),
+    ("Trata-\nse de recurso", "Trata-se de recurso"),
+    ("com ba-\nse na lei", "com base na lei"),
+    ("o art. 5º-\nA da lei", "o art. 5º-\nA da lei"),
+])
+def test_hifenizacao(texto, esperado):
+    assert normalizar_texto(texto).texto == esperado
@@ -0,0 +1,54 @@
+import asyncio
+import time
+
+from starlette.concurrency import run_in_threadpool
+
+import profiling
+
+
+def _ocupado(segundos):
+    fim = time.perf_counter() + segundos
+    while time.perf_counter() < fim:
+        pass
+
+
+def _pilhas(profiler, funcao):
+    return sum(n for pilha, n in profiler.samples.items() if f"{funcao} (" in pilha)
+
+
+def test_perfil_inclui_threadpool_e_exclui_outras_tarefas():
+    async def outra_requisicao():
+        for _ in range(20):
+            _ocupado(0.01)
+            await asyncio.sleep(0)
+
+    async def requisicao():
+        profiler, token = profiling.start_profiler()
+        try:
+            await run_in_threadpool(_ocupado, 0.2)
+            _ocupado(0.1)
+        finally:
+            profiling.finish_profiler(token)
+            profiler.stop()
+        return profiler
+
+    async def principal():
+        # Tarefa concorrente criada fora da requisição: não deve entrar no perfil
+        concorrente = asyncio.create_task(outra_requisicao())
+        profiler = await requisicao()
+        await concorrente
+        return profiler
+
+    profiler = asyncio.run(principal())
+    assert _pilhas(profiler, "_ocupado") > 0
+    assert _pilhas(profiler, "outra_requisicao") == 0
+    # A primeira entrada de cada pilha é o nome da thread: há amostras do event loop e do threadpool
+    threads = {pilha.split(";")[0] for pilha in profiler.samples if "_ocupado" in pilha}
+    assert len(threads) == 2
+
+
+def test_perfil_sob_demanda(client, admin_headers):
+    resposta = client.get("/v1/acordaos", headers={**admin_headers, "X-Profile": "1"})
+    assert resposta.status_code == 200
+    perfil = client.get(f"/v1/admin/profiles/{resposta.headers['X-Profile-Id']}", headers=admin_headers)
+    assert perfil.status_code == 200
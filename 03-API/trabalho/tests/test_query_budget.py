@@ -0,0 +1,143 @@
+import time
+
+import pytest
+
+from query_budget import verificar_orcamento
+
+TEXTO = "O relator apresentou voto no sentido de negar provimento ao recurso interposto. " * 5
+
+
+def _pdf(linhas):
+    # PDF mínimo de uma página, com uma linha de texto por item
+    corpo = "BT /F1 12 Tf 14 TL 50 750 Td " + " ".join(f"({linha}) Tj T*" for linha in linhas) + " ET"
+    objetos = [
+        "<< /Type /Catalog /Pages 2 0 R >>",
+        "<< /Type /Pages /Kids [3 0 R] /Count 1 >>",
+        "<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Contents 4 0 R "
+        "/Resources << /Font << /F1 5 0 R >> >> >>",
+        f"<< /Length {len(corpo)} >>\nstream\n{corpo}\nendstream",
+        "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    saida = b"%PDF-1.4\n"
+    posicoes = []
+    for i, objeto in enumerate(objetos, start=1):
+        posicoes.append(len(saida))
+        saida += f"{i} 0 obj\n{objeto}\nendobj\n".encode("latin-1")
+    xref = len(saida)
+    saida += f"xref\n0 {len(objetos) + 1}\n0000000000 65535 f \n".encode()
+    saida += b"".join(f"{posicao:010d} 00000 n \n".encode() for posicao in posicoes)
+    saida += f"trailer\n<< /Size {len(objetos) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode()
+    return saida
+
+
+def _gerar(client, headers, texto):
+    resposta = client.post(
+        "/v1/acordao/gerar", content=texto.encode(), headers={**headers, "Content-Type": "text/plain"}
+    )
+    assert resposta.status_code == 200, resposta.text
+    return resposta.json()["id"]
+
+
+@pytest.fixture(scope="module")
+def dados(client, admin_headers):
+    from database import SessionLocal
+    from models import Acordao, ReprocessingCampaign
+    from reprocessamento import CONCLUIDA, EM_ANDAMENTO
+
+    acordaos = [_gerar(client, admin_headers, f"{TEXTO} Processo {i}.") for i in range(3)]
+    usuario = client.post(
+        "/v1/users", json={"username": "orcamento_alvo", "password": "senha123"}, headers=admin_headers
+    )
+    assert usuario.status_code == 200, usuario.text
+
+    db = SessionLocal()
+    try:
+        db.query(Acordao).filter(Acordao.id.in_(acordaos[:2])).update(
+            {Acordao.prompt_version: "v-antiga"}, synchronize_session=False
+        )
+        db.commit()
+    finally:
+        db.close()
+    criada = verificar_orcamento(client, "POST", "/v1/admin/reprocessamentos", json={}, headers=admin_headers)
+    assert criada.status_code == 200, criada.text
+    url = f"/v1/admin/reprocessamentos/{criada.json()['id']}"
+    for _ in range(100):
+        if client.get(url, headers=admin_headers).json()["status"] == CONCLUIDA:
+            break
+        time.sleep(0.05)
+    else:
+        pytest.fail("Campanha de reprocessamento não concluída")
+
+    # Campanha ativa gravada direto no banco: com o worker ocioso, ela continua ativa até ser pausada
+    db = SessionLocal()
+    try:
+        campanha = ReprocessingCampaign(
+            prompt_version="v-teste", model="gpt-4o-mini", status=EM_ANDAMENTO, tokens_per_hour=1,
+            created_by="user1", total=0, processed=0, failed=0, tokens_used=0, last_acordao_id=0
+        )
+        db.add(campanha)
+        db.commit()
+        campanha_id = campanha.id
+    finally:
+        db.close()
+
+    return {
+        "acordao": acordaos[0],
+        "acordao_excluir": acordaos[2],
+        "usuario": usuario.json()["id"],
+        "campanha": campanha_id,
+    }
+
+
+# (método, caminho da rota, URL, argumentos da requisição); a ordem importa para a campanha e o usuário
+CASOS = [
+    ("POST", "/v1/auth/login", "/v1/auth/login", {"json": {"usuario": "user1", "senha": "p1"}}),
+    ("POST", "/v1/auth/refresh", "/v1/auth/refresh", {}),
+    ("POST", "/v1/acordao/gerar", "/v1/acordao/gerar",
+     {"content": TEXTO.encode(), "headers": {"Content-Type": "text/plain"}}),
+    ("POST", "/v1/acordao/gerar_verificar", "/v1/acordao/gerar_verificar",
+     {"content": (TEXTO + " Verificar.").encode(), "headers": {"Content-Type": "text/plain"}}),
+    ("POST", "/v2/acordao/gerar_pdf", "/v2/acordao/gerar_pdf",
+     {"files": {"file": ("acordao.pdf", _pdf(["ACORDAO", TEXTO[:80], "Recurso improvido."]),
+                                   "application/pdf")}}),
+    ("GET", "/v1/admin/reprocessamentos", "/v1/admin/reprocessamentos", {}),
+    ("GET", "/v1/admin/reprocessamentos/{campanha_id}", "/v1/admin/reprocessamentos/{campanha}", {}),
+    ("POST", "/v1/admin/reprocessamentos/{campanha_id}/pausar",
+     "/v1/admin/reprocessamentos/{campanha}/pausar", {}),
+    ("POST", "/v1/admin/reprocessamentos/{campanha_id}/retomar",
+     "/v1/admin/reprocessamentos/{campanha}/retomar", {}),
+    ("GET", "/v1/users", "/v1/users", {}),
+    ("GET", "/v1/users/{user_id}", "/v1/users/{usuario}", {}),
+    ("POST", "/v1/users", "/v1/users", {"json": {"username": "orcamento_novo", "password": "senha123"}}),
+    ("PUT", "/v1/users/{user_id}", "/v1/users/{usuario}",
+     {"json": {"username": "orcamento_alvo", "role": "user"}}),
+    ("DELETE", "/v1/users/{user_id}", "/v1/users/{usuario}", {}),
+    ("PUT", "/v1/acordaos/{acordao_id}/feedback", "/v1/acordaos/{acordao}/feedback",
+     {"json": {"feedback": "Ementa adequada"}}),
+    ("GET", "/v1/acordaos/{acordao_id}/ementas_anteriores", "/v1/acordaos/{acordao}/ementas_anteriores",
+     {}),
+    ("DELETE", "/v1/acordaos/{acordao_id}", "/v1/acordaos/{acordao_excluir}", {}),
+    ("GET", "/v1/logs", "/v1/logs", {}),
+    ("GET", "/v1/acordaos", "/v1/acordaos", {}),
+]
+
+
+@pytest.mark.parametrize("metodo,rota,url,argumentos", CASOS, ids=[f"{c[0]} {c[1]}" for c in CASOS])
+def test_rota_dentro_do_orcamento(client, admin_headers, dados, metodo, rota, url, argumentos):
+    kwargs = {**argumentos, "headers": {**admin_headers, **argumentos.get("headers", {})}}
+    resposta = verificar_orcamento(client, metodo, url.format(**dados), **kwargs)
+    assert resposta.status_code < 400, resposta.text
+
+
+def test_todas_as_rotas_com_orcamento_sao_verificadas(client):
+    import main
+
+    declaradas = {
+        (metodo, rota.path)
+        for rota in main.app.routes
+        if getattr(getattr(rota, "endpoint", None), "query_budget", None) is not None
+        for metodo in rota.methods
+    }
+    # A criação de campanha é verificada na fixture `dados`
+    verificadas = {(c[0], c[1]) for c in CASOS} | {("POST", "/v1/admin/reprocessamentos")}
+    assert declaradas == verificadas
@@ -0,0 +1,47 @@
+import time
+
+from database import SessionLocal
+from models import Acordao
+
+TEXTO = "O colegiado, por unanimidade, deu provimento ao agravo para reformar a decisão agravada. " * 4
+
+
+def _aguardar(client, headers, condicao):
+    for _ in range(100):
+        campanhas = client.get("/v1/admin/reprocessamentos", headers=headers).json()
+        if condicao(campanhas):
+            return campanhas
+        time.sleep(0.05)
+    raise AssertionError(f"Campanhas não chegaram ao estado esperado: {campanhas}")
+
+
+def test_reprocessamento_arquiva_a_verificacao(client, admin_headers):
+    gerado = client.post(
+        "/v1/acordao/gerar_verificar",
+        content=TEXTO.encode(),
+        headers={**admin_headers, "Content-Type": "text/plain"}
+    )
+    assert gerado.status_code == 200, gerado.text
+    acordao = gerado.json()
+    assert acordao["verificacao"]
+
+    db = SessionLocal()
+    try:
+        db.query(Acordao).filter(Acordao.id == acordao["id"]).update({Acordao.prompt_version: "v-antiga"})
+        db.commit()
+    finally:
+        db.close()
+
+    # Só uma campanha ativa ou pausada por vez
+    _aguardar(client, admin_headers, lambda cs: all(c["status"] in ("concluida", "interrompida") for c in cs))
+    campanha = client.post("/v1/admin/reprocessamentos", json={}, headers=admin_headers)
+    assert campanha.status_code == 200, campanha.text
+    _aguardar(client, admin_headers, lambda cs: cs[0]["status"] == "concluida")
+
+    anteriores = client.get(f"/v1/acordaos/{acordao['id']}/ementas_anteriores", headers=admin_headers).json()
+    assert [a["verificacao"] for a in anteriores] == [acordao["verificacao"]]
+    db = SessionLocal()
+    try:
+        assert db.get(Acordao, acordao["id"]).verificacao is None
+    finally:
+        db.close()
@@ -0,0 +1,50 @@
+import asyncio
+import io
+
+from fastapi import UploadFile
+
+
+def _salvar(store, conteudo: bytes):
+    return asyncio.run(store.save(UploadFile(io.BytesIO(conteudo), filename="acordao.pdf")))
+
+
+def test_arquivo_reservado_nao_e_removido(tmp_path):
+    from uploads import UploadStore
+
+    store = UploadStore(str(tmp_path), max_bytes=150)
+    em_uso, _ = _salvar(store, b"a" * 100)
+
+    # Outra requisição grava um arquivo e estoura o limite enquanto o primeiro aguarda a extração
+    outro, _ = _salvar(store, b"b" * 100)
+    assert (tmp_path / em_uso[:2] / f"{em_uso}.pdf").exists()
+
+    # Liberado, o primeiro volta a ser candidato; o segundo continua reservado
+    store.liberar(em_uso)
+    assert not (tmp_path / em_uso[:2] / f"{em_uso}.pdf").exists()
+    assert (tmp_path / outro[:2] / f"{outro}.pdf").exists()
+
+    store.liberar(outro)
+    terceiro, _ = _salvar(store, b"c" * 100)
+    assert not (tmp_path / outro[:2] / f"{outro}.pdf").exists()
+    store.liberar(terceiro)
+
+
+def test_cache_de_texto_descarta_o_menos_usado(client, monkeypatch):
+    import uploads
+    from database import SessionLocal
+    from models import PdfTexto
+
+    monkeypatch.setattr(uploads, "PDF_TEXT_CACHE_MAX_ENTRIES", 2)
+    db = SessionLocal()
+    try:
+        db.query(PdfTexto).delete()
+        db.commit()
+        uploads.guardar_paginas(db, "antigo", ["primeira"])
+        uploads.guardar_paginas(db, "recente", ["segunda"])
+        # A leitura renova o texto mais antigo; o descartado passa a ser o que não foi lido
+        assert uploads.carregar_paginas(db, "antigo") == ["primeira"]
+        uploads.guardar_paginas(db, "novo", ["terceira"])
+
+        assert {registro.sha256 for registro in db.query(PdfTexto)} == {"antigo", "novo"}
+    finally:
+        db.close()
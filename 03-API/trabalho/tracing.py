@@ -0,0 +1,72 @@
+import json
+import logging
+import threading
+
+from opentelemetry import trace
+from opentelemetry.sdk.resources import Resource
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import BatchSpanProcessor, SpanExporter, SpanExportResult
+from opentelemetry.sdk.trace.sampling import ParentBased, TraceIdRatioBased
+
+from settings import (
+    TRACING_EXPORTER, TRACING_FILE, TRACING_OTLP_ENDPOINT,
+    TRACING_SAMPLE_RATIO, TRACING_SERVICE_NAME
+)
+
+logger = logging.getLogger("API")
+
+# Tracer "proxy": passa a usar o provider configurado assim que configure_tracing roda
+tracer = trace.get_tracer("ementas-api")
+
+
+class JsonFileSpanExporter(SpanExporter):
+    """Exporta spans como JSON, um por linha, para uso sem coletor."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def export(self, spans):
+        try:
+            with self._lock, open(self.path, "a") as f:
+                for span in spans:
+                    f.write(json.dumps(json.loads(span.to_json()), ensure_ascii=False) + "\n")
+        except OSError:
+            return SpanExportResult.FAILURE
+        return SpanExportResult.SUCCESS
+
+    def shutdown(self):
+        pass
+
+
+def configure_tracing():
+    if TRACING_EXPORTER == "none":
+        return
+
+    if TRACING_EXPORTER == "otlp":
+        # Dependência opcional: opentelemetry-exporter-otlp-proto-http
+        from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+        exporter = OTLPSpanExporter(endpoint=TRACING_OTLP_ENDPOINT)
+    else:
+        exporter = JsonFileSpanExporter(TRACING_FILE)
+
+    provider = TracerProvider(
+        resource=Resource.create({"service.name": TRACING_SERVICE_NAME}),
+        sampler=ParentBased(TraceIdRatioBased(TRACING_SAMPLE_RATIO))
+    )
+    provider.add_span_processor(BatchSpanProcessor(exporter))
+    trace.set_tracer_provider(provider)
+    logger.info(f"Tracing habilitado: exportador {TRACING_EXPORTER}, amostragem {TRACING_SAMPLE_RATIO}")
+
+
+def shutdown_tracing():
+    provider = trace.get_tracer_provider()
+    if isinstance(provider, TracerProvider):
+        provider.shutdown()
+
+
+def current_trace_id():
+    span_context = trace.get_current_span().get_span_context()
+    if not span_context.is_valid or not span_context.trace_flags.sampled:
+        return None
+    return trace.format_trace_id(span_context.trace_id)
@@ -0,0 +1,167 @@
+import datetime
+import hashlib
+import logging
+import os
+import tempfile
+import threading
+import time
+
+from fastapi import UploadFile
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import delete, select, update
+from sqlalchemy.orm import Session
+
+from compressao import comprimir, descomprimir
+from models import PdfTexto
+from settings import PDF_TEXT_CACHE_MAX_ENTRIES, UPLOAD_DIR, UPLOAD_MAX_BYTES
+
+logger = logging.getLogger("API")
+
+CHUNK_SIZE = 1024 * 1024
+
+
+class UploadStore:
+    """
+    Arquivos enviados, endereçados pelo SHA-256 do conteúdo. O mtime de cada
+    arquivo marca o último uso; acima de `max_bytes` os menos usados são removidos.
+    Um índice em memória (montado na primeira gravação) evita varrer o diretório a cada upload.
+    `save` devolve o arquivo reservado: ele não é removido até a chamada de `liberar`.
+    """
+
+    def __init__(self, root: str, max_bytes: int):
+        self.root = root
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        # caminho -> [último uso, tamanho]; None até a primeira varredura
+        self._indice = None
+        self._total = 0
+        # caminho -> número de requisições que ainda vão ler o arquivo
+        self._reservas = {}
+
+    def path(self, sha256: str) -> str:
+        return os.path.join(self.root, sha256[:2], f"{sha256}.pdf")
+
+    async def save(self, upload: UploadFile):
+        """
+        Grava o upload calculando o hash durante a leitura; devolve (sha256, tamanho).
+        O arquivo fica reservado até `liberar(sha256)`.
+        """
+        await run_in_threadpool(os.makedirs, self.root, exist_ok=True)
+        digest = hashlib.sha256()
+        size = 0
+        tmp = await run_in_threadpool(tempfile.NamedTemporaryFile, dir=self.root, suffix=".tmp", delete=False)
+        try:
+            while chunk := await upload.read(CHUNK_SIZE):
+                digest.update(chunk)
+                # Escrita em disco fora do event loop
+                await run_in_threadpool(tmp.write, chunk)
+                size += len(chunk)
+            await run_in_threadpool(tmp.close)
+        except BaseException:
+            tmp.close()
+            os.remove(tmp.name)
+            raise
+        sha256 = digest.hexdigest()
+        await run_in_threadpool(self._guardar, tmp.name, sha256, size)
+        return sha256, size
+
+    def _guardar(self, tmp_name: str, sha256: str, size: int):
+        destino = self.path(sha256)
+        os.makedirs(os.path.dirname(destino), exist_ok=True)
+        with self._lock:
+            self._carregar_indice()
+            self._reservas[destino] = self._reservas.get(destino, 0) + 1
+            if os.path.exists(destino):
+                os.remove(tmp_name)
+                self._usar(destino)
+                return
+            os.replace(tmp_name, destino)
+            self._indice[destino] = [time.time(), size]
+            self._total += size
+            self._evict()
+
+    def liberar(self, sha256: str):
+        """Desfaz a reserva feita por `save`; o arquivo volta a poder ser removido."""
+        destino = self.path(sha256)
+        with self._lock:
+            restantes = self._reservas.get(destino, 0) - 1
+            if restantes > 0:
+                self._reservas[destino] = restantes
+                return
+            self._reservas.pop(destino, None)
+            # Remoções adiadas enquanto o arquivo estava em uso
+            self._evict()
+
+    def _usar(self, caminho: str):
+        try:
+            os.utime(caminho)
+        except FileNotFoundError:
+            return
+        if self._indice is not None and caminho in self._indice:
+            self._indice[caminho][0] = time.time()
+
+    def _carregar_indice(self):
+        # Varredura única do diretório; depois o índice é mantido pelas gravações e remoções
+        if self._indice is not None:
+            return
+        self._indice = {}
+        for pasta, _, nomes in os.walk(self.root):
+            for nome in nomes:
+                if nome.endswith(".pdf"):
+                    caminho = os.path.join(pasta, nome)
+                    stat = os.stat(caminho)
+                    self._indice[caminho] = [stat.st_mtime, stat.st_size]
+        self._total = sum(size for _, size in self._indice.values())
+
+    def _evict(self):
+        if self._total <= self.max_bytes:
+            return
+        for caminho, (_, size) in sorted(self._indice.items(), key=lambda item: item[1][0]):
+            if self._total <= self.max_bytes:
+                break
+            if caminho in self._reservas:
+                # Em uso por alguma requisição (gravado agora ou aguardando extração)
+                continue
+            try:
+                os.remove(caminho)
+            except FileNotFoundError:
+                pass
+            del self._indice[caminho]
+            self._total -= size
+            logger.info(f"Upload removido do armazenamento (LRU): {os.path.basename(caminho)}")
+
+
+upload_store = UploadStore(UPLOAD_DIR, UPLOAD_MAX_BYTES)
+
+
+def _agora():
+    return datetime.datetime.now(datetime.timezone.utc)
+
+
+def carregar_paginas(db: Session, sha256: str):
+    """Páginas já extraídas deste PDF, ou None se ainda não foi processado."""
+    registro = db.get(PdfTexto, sha256)
+    if registro is None:
+        return None
+    # Leitura conta como uso: o descarte do cache segue o último uso (LRU)
+    db.execute(update(PdfTexto).where(PdfTexto.sha256 == sha256).values(last_used_at=_agora()))
+    db.commit()
+    return descomprimir(registro.codec, registro.dados).split("\f")
+
+
+def guardar_paginas(db: Session, sha256: str, paginas: list):
+    texto = "\f".join(paginas)
+    codec, dados = comprimir(texto)
+    db.merge(PdfTexto(
+        sha256=sha256,
+        paginas=len(paginas),
+        codec=codec,
+        tamanho=len(texto.encode("utf-8")),
+        dados=dados,
+        last_used_at=_agora()
+    ))
+    db.flush()
+    # Cache limitado: mantém apenas os PDF_TEXT_CACHE_MAX_ENTRIES textos usados mais recentemente
+    recentes = select(PdfTexto.sha256).order_by(PdfTexto.last_used_at.desc()).limit(PDF_TEXT_CACHE_MAX_ENTRIES)
+    db.execute(delete(PdfTexto).where(PdfTexto.sha256.not_in(recentes)))
+    db.commit()
@@ -0,0 +1,112 @@
+import argparse
+import glob
+import logging
+import os
+import sqlite3
+import statistics
+import time
+import xml.etree.ElementTree as ET
+from io import BytesIO
+
+import pandas as pd
+
+from googlenews_collector import GoogleNewsCollector, RSS_DATE_FORMAT
+
+
+def load_fixtures(cache_path=None, fixtures_dir=None):
+    """
+    Load recorded Google News RSS bodies.
+
+    Args:
+        cache_path (str, optional): Response cache (see response_cache.py); every cached RSS body is used
+        fixtures_dir (str, optional): Directory with *.xml files, e.g. written by --save-fixtures
+
+    Returns:
+        list: RSS bodies (bytes), in a stable order
+    """
+    contents = []
+    if cache_path and os.path.exists(cache_path):
+        with sqlite3.connect(cache_path) as conn:
+            rows = conn.execute("SELECT value FROM responses WHERE kind = 'rss' ORDER BY key").fetchall()
+        contents.extend(row[0] for row in rows)
+    if fixtures_dir:
+        for path in sorted(glob.glob(os.path.join(fixtures_dir, '*.xml'))):
+            with open(path, 'rb') as f:
+                contents.append(f.read())
+    return contents
+
+
+def parse_grid_baseline(contents, max_results=None):
+    """Previous implementation: full tree and one DataFrame per day, merged through dict records."""
+    all_news = []
+    for content in contents:
+        root = ET.parse(BytesIO(content)).getroot()
+        titles, links, pub_dates, sources, descriptions = [], [], [], [], []
+        for item in root.findall('.//item'):
+            titles.append(item.find('title').text if item.find('title') is not None else None)
+            links.append(item.find('link').text if item.find('link') is not None else None)
+            pub_dates.append(item.find('pubDate').text if item.find('pubDate') is not None else None)
+            sources.append(item.find('source').text if item.find('source') is not None else None)
+            descriptions.append(item.find('description').text if item.find('description') is not None else None)
+            if max_results and len(titles) >= max_results:
+                break
+        news_df = pd.DataFrame({
+            'Title': titles,
+            'Link': links,
+            'Publication Date': pub_dates,
+            'Source': sources,
+            'Description': descriptions
+        })
+        news_df['Publication Date'] = pd.to_datetime(news_df['Publication Date'], format=RSS_DATE_FORMAT)
+        news_df.sort_values(by='Publication Date', ascending=False, inplace=True)
+        all_news.extend(news_df.to_dict(orient='records'))
+    return pd.DataFrame(all_news)
+
+
+def measure(function, repeat):
+    durations = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = function()
+        durations.append(time.perf_counter() - started)
+    return result, durations
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Micro-benchmark of the Google News RSS parser on recorded responses")
+    parser.add_argument('--cache', default='data/googlenews_cache.sqlite', help="Response cache with recorded RSS bodies")
+    parser.add_argument('--fixtures', help="Directory with recorded *.xml RSS bodies")
+    parser.add_argument('--save-fixtures', help="Write the loaded RSS bodies to this directory and exit")
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--max-results', type=int, default=None)
+    args = parser.parse_args()
+
+    contents = load_fixtures(args.cache, args.fixtures)
+    if not contents:
+        parser.error("no recorded RSS found: run a collection with the cache enabled (GoogleNewsCollector.collect_news_grid) or pass --fixtures")
+    if args.save_fixtures:
+        os.makedirs(args.save_fixtures, exist_ok=True)
+        for i, content in enumerate(contents):
+            with open(os.path.join(args.save_fixtures, f'rss_{i:04d}.xml'), 'wb') as f:
+                f.write(content)
+        print(f"{len(contents)} fixtures written to {args.save_fixtures}")
+        return
+
+    logging.getLogger('googlenews_collector').setLevel(logging.WARNING)
+    collector = GoogleNewsCollector(cache_path=None)
+    # One cell per recorded body; the date only appears in the log line
+    cells = [(f'fixture {i}', pd.Timestamp('2000-01-01')) for i in range(len(contents))]
+
+    baseline, baseline_times = measure(lambda: parse_grid_baseline(contents, args.max_results), args.repeat)
+    streaming, streaming_times = measure(lambda: collector._parse_grid(cells, contents, args.max_results), args.repeat)
+
+    same = baseline.reset_index(drop=True).equals(streaming.drop(columns='topic'))
+    print(f"{len(contents)} RSS bodies, {len(streaming)} items, {sum(map(len, contents)) / 1e6:.1f} MB")
+    for name, times in (('baseline (tree + per-day frames)', baseline_times), ('iterparse + columnar', streaming_times)):
+        print(f"{name:34s} min {min(times) * 1000:8.1f} ms   median {statistics.median(times) * 1000:8.1f} ms")
+    print(f"speedup (median): {statistics.median(baseline_times) / statistics.median(streaming_times):.1f}x")
+    print(f"identical results: {same}")
+
+
+if __name__ == '__main__':
+    main()
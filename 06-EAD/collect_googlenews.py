@@ -114,25 +114,24 @@ def collect_googlenews(just_watch_date = datetime.now(), start_date=None, end_da
     just_watch_csv_filename = f'{data_directory}/justwatch_{just_watch_date}.csv'
 
     # For each content type (movie/serie) collect news from google news. Here using hidden API.
-    all_googlenews_data = []
-    google_news_collector = GoogleNewsCollector()
+    titles = []
     for index, row in pd.read_csv(just_watch_csv_filename).iterrows():
         title = row['title']
         title_type = row['type']
         if title is None or pd.isna(title):
             logger.warning(f"Skipping row {index} with missing title.")
             continue
-            
-        
-        google_news_df = google_news_collector.count_news_by_date(f"{title_type} {title}", start_date, end_date)
-        #logger.info(f"Collected news count about {title}: {google_news_df['count'].sum()}")
-        
-        google_news_df['type'] = title_type  # Add content type column : series or movies
-        google_news_df['searched_title'] = title
-        logger.info(f"Collected news count about {title}: {google_news_df}" )
-        all_googlenews_data.extend(google_news_df.to_dict(orient='records'))
+        titles.append({'topic': f"{title_type} {title}", 'type': title_type, 'searched_title': title})
+    
+    # Counts for every (title, date) pair are fetched concurrently by a bounded pool of browsers
+    with GoogleNewsCollector() as google_news_collector:
+        google_news_df = google_news_collector.count_news_grid([t['topic'] for t in titles], start_date, end_date)
+    
+    # Add content type column (series or movies) and the searched title
+    final_df = google_news_df.merge(pd.DataFrame(titles, columns=['topic', 'type', 'searched_title']), on='topic').drop(columns='topic')
+    for title, counts in final_df.groupby('searched_title', sort=False):
+        logger.info(f"Collected news count about {title}: {counts}")
         
-    final_df = pd.DataFrame(all_googlenews_data)
     #final_df.to_csv(f'{data_directory}/googlenews_{start_date}_{end_date}.csv', index=False) 
     logger.info(f"Collected {len(final_df)} Google News saved to CSV.")
     return final_df
@@ -1,26 +1,102 @@
 import pandas as pd
 import glob
-    
-    
+import json
+import os
+
+
+JUSTWATCH_FILES = 'data/justwatch_rank*.csv'
+JUSTWATCH_CACHE = 'data/justwatch_ranks.parquet'
+JUSTWATCH_MANIFEST = 'data/justwatch_ranks.manifest.json'
+
+# Explicit dtypes for the ranking snapshots; repeated strings are stored as categories
+JUSTWATCH_DTYPES = {
+    'title': 'string',
+    'rank': 'float32',
+    'rank_change': 'float32',
+    'top_rank': 'float32',
+    'platforms': 'category',
+    'type': 'category'
+}
+
+
+def _read_snapshot(file):
+    df = pd.read_csv(file, dtype=JUSTWATCH_DTYPES)
+    df['collect_date'] = file.split('_')[-1].replace('.csv', '')
+    return df
+
+
+def _with_categories(df):
+    """Re-apply the categorical dtypes (concat turns categories that differ into plain objects)."""
+    for column in ('title', 'platforms', 'type', 'collect_date'):
+        values = df[column].astype('string')
+        # collect_date is ordered, so min/max and comparisons follow the calendar
+        df[column] = values.astype(pd.CategoricalDtype(sorted(values.dropna().unique()), ordered=column == 'collect_date'))
+    return df
+
+
+def _save_cache(df, manifest):
+    tmp_file = f'{JUSTWATCH_CACHE}.tmp'
+    df.to_parquet(tmp_file, index=False)
+    os.replace(tmp_file, JUSTWATCH_CACHE)
+    with open(JUSTWATCH_MANIFEST, 'w') as f:
+        json.dump(manifest, f, indent=1)
+
+
 def get_justwatch_ranks():
     """Collect JustWatch ranking data from multiple CSV files in the 'data' directory.
-    
+
     This function reads all CSV files that match the pattern 'justwatch_rank*.csv',
     extracts the collection date from the filename, and combines all data into a single DataFrame.
-    
+    The combined data is cached in 'data/justwatch_ranks.parquet' together with the modification
+    time of each snapshot: new daily snapshots are read incrementally, and the cache is rebuilt
+    only when a snapshot already cached changes or is removed.
+
     Returns:
-        pd.DataFrame: DataFrame containing the collected JustWatch ranking data.
-    """    
-        
+        pd.DataFrame: DataFrame containing the collected JustWatch ranking data, sorted by
+        collect date and with categorical 'title', 'platforms', 'type' and 'collect_date'.
+    """
+
     # get all csv files in the directory that match the pattern
-    files = sorted(glob.glob('data/justwatch_rank*.csv'))
-    all_data = []
-    for file in files:
-        df = pd.read_csv(file)
-        df['collect_date'] = file.split('_')[-1].replace('.csv', '')
-        # concatenate all dataframes into one
-        all_data.extend(df.to_dict(orient='records'))   
-        
-    # create a new dataframe from the list of dictionaries
-    df_justwatch_ranks = pd.DataFrame(all_data)
+    files = sorted(glob.glob(JUSTWATCH_FILES))
+    mtimes = {file: os.stat(file).st_mtime_ns for file in files}
+
+    manifest = {}
+    cached = None
+    if os.path.exists(JUSTWATCH_CACHE) and os.path.exists(JUSTWATCH_MANIFEST):
+        with open(JUSTWATCH_MANIFEST) as f:
+            manifest = json.load(f)
+        if all(mtimes.get(file) == mtime for file, mtime in manifest.items()):
+            cached = pd.read_parquet(JUSTWATCH_CACHE)
+        else:
+            # A cached snapshot was changed or removed: rebuild from scratch
+            manifest = {}
+
+    new_files = [file for file in files if file not in manifest]
+    if not new_files and cached is not None:
+        return cached
+    if not files:
+        return pd.DataFrame(columns=[*JUSTWATCH_DTYPES, 'collect_date'])
+
+    frames = ([cached] if cached is not None else []) + [_read_snapshot(file) for file in new_files]
+    # single concatenation of the cached data and the new snapshots
+    df_justwatch_ranks = _with_categories(pd.concat(frames, ignore_index=True))
+    df_justwatch_ranks = df_justwatch_ranks.sort_values('collect_date', kind='stable').reset_index(drop=True)
+    manifest.update({file: mtimes[file] for file in new_files})
+    _save_cache(df_justwatch_ranks, manifest)
     return df_justwatch_ranks
+
+
+def get_rank_history(df_justwatch_ranks=None):
+    """Title-indexed view of the JustWatch rankings, for fast rank-history lookups.
+
+    Args:
+        df_justwatch_ranks (pd.DataFrame, optional): Rankings as returned by get_justwatch_ranks().
+            Loaded when not given.
+
+    Returns:
+        pd.DataFrame: Rankings indexed by title (sorted), each title's rows ordered by collect date.
+        Example: get_rank_history().loc['Dept. Q', ['collect_date', 'rank']]
+    """
+    if df_justwatch_ranks is None:
+        df_justwatch_ranks = get_justwatch_ranks()
+    return df_justwatch_ranks.sort_values(['title', 'collect_date'], kind='stable').set_index('title')
@@ -1,77 +1,187 @@
 from googlenews_collector import GoogleNewsCollector
 import collect_justwatch
+import common
 import pandas as pd
-import glob
+import pyarrow as pa
+import pyarrow.dataset as ds
+import os
+import uuid
+from datetime import datetime
+
+
+MENTIONS_DIR = "data/googlenews_mentions"
+WATERMARKS_FILE = f"{MENTIONS_DIR}/_watermarks.parquet"
+LEGACY_MENTIONS_CSV = "data/googlenews_mentions_count.csv"
+MENTIONS_COLUMNS = ["date", "count", "title", "type"]
+MENTIONS_KEY = ["date", "title", "type"]
+
+
+def _compact_mentions(df):
+    """Apply the store dtypes: datetime date, int32 count, categorical title and type."""
+    return df.astype({"count": "int32", "title": "category", "type": "category"}).assign(
+        date=pd.to_datetime(df["date"])
+    )[MENTIONS_COLUMNS]
+
+
+def _append_mentions(df):
+    """
+    Append mentions to the store, one new file per date partition.
+    Existing files are never rewritten: a backfill for a new title adds a file to old partitions.
+    Files are named after the run (timestamp first), so later runs sort after earlier ones.
+    """
+    run_id = f"{datetime.now():%Y%m%dT%H%M%S%f}-{uuid.uuid4().hex[:8]}"
+    for date, part in _compact_mentions(df).groupby("date", observed=True):
+        partition = f"{MENTIONS_DIR}/date={date:%Y-%m-%d}"
+        os.makedirs(partition, exist_ok=True)
+        part = part.drop(columns="date").reset_index(drop=True)
+        part["title"] = part["title"].cat.remove_unused_categories()
+        part["type"] = part["type"].cat.remove_unused_categories()
+        part.to_parquet(f"{partition}/part-{run_id}.parquet", index=False)
+
+
+def read_googlenews_mentions(columns=None):
+    """
+    Read the Google News mentions store (date-partitioned Parquet files in data/googlenews_mentions).
+
+    Parameters:
+    columns (list, optional): Columns to read, among 'date', 'count', 'title' and 'type'. Defaults to all.
+
+    Returns:
+    DataFrame: Mentions sorted by type, title and date, with compact dtypes
+    (datetime date, int32 count, categorical title and type). A (date, title, type) written by
+    more than one run (e.g. a run interrupted before saving its watermarks) appears once, from the latest run.
+    """
+    columns = columns or MENTIONS_COLUMNS
+    if not os.path.isdir(MENTIONS_DIR):
+        return _compact_mentions(pd.DataFrame(columns=MENTIONS_COLUMNS))[columns]
+    dataset = ds.dataset(
+        MENTIONS_DIR, format="parquet",
+        partitioning=ds.partitioning(pa.schema([("date", pa.date32())]), flavor="hive")
+    )
+    # The key columns and the file name are always read, to drop the rows repeated by another run
+    read_columns = list(dict.fromkeys(MENTIONS_KEY + columns)) + ["__filename"]
+    df = dataset.to_table(columns=read_columns).to_pandas()
+    df["date"] = pd.to_datetime(df["date"])
+    for column in ("title", "type"):
+        # Each file has its own dictionary: unify into one sorted category set
+        df[column] = df[column].astype("category")
+        df[column] = df[column].cat.set_categories(sorted(df[column].cat.categories))
+    df["run"] = df.pop("__filename").str.rsplit("/", n=1).str[-1]
+    df = df.sort_values("run", kind="stable").drop_duplicates(MENTIONS_KEY, keep="last")
+    return df.sort_values(["type", "title", "date"]).reset_index(drop=True)[columns]
+
+
+def _watermarks_from(df):
+    """Last date per (title, type) of a mentions DataFrame, with plain string keys."""
+    return (
+        df.astype({"title": str, "type": str})
+        .groupby(["title", "type"])["date"].max()
+        .rename("last_date").reset_index()
+    )
+
+
+def _load_watermarks():
+    """Last loaded date per (title, type); rebuilt from the store if the watermarks file is missing."""
+    if os.path.exists(WATERMARKS_FILE):
+        return pd.read_parquet(WATERMARKS_FILE).astype({"title": str, "type": str})
+    return _watermarks_from(read_googlenews_mentions(columns=["date", "title", "type"]))
+
+
+def _save_watermarks(watermarks):
+    os.makedirs(MENTIONS_DIR, exist_ok=True)
+    tmp_file = f"{WATERMARKS_FILE}.tmp"
+    watermarks.astype({"title": "category", "type": "category"}).to_parquet(tmp_file, index=False)
+    os.replace(tmp_file, WATERMARKS_FILE)
+
+
+def _import_legacy_mentions():
+    """One-time import of the former CSV file into the Parquet store."""
+    if os.path.isdir(MENTIONS_DIR) or not os.path.exists(LEGACY_MENTIONS_CSV):
+        return
+    df = pd.read_csv(LEGACY_MENTIONS_CSV)
+    df["date"] = pd.to_datetime(df["date"], format="%m/%d/%Y")
+    _append_mentions(df)
+    _save_watermarks(_watermarks_from(df))
+    print(f"Imported {len(df)} Google News mentions from {LEGACY_MENTIONS_CSV} into {MENTIONS_DIR}")
 
 
 def extract_googlenews_mentions(df_justwatch_ranks):
     """
     Extract Google News mentions for titles in df_justwatch_ranks.
-    This function checks if the Google News mentions data already exists. If it does, it performs an incremental load
-    by fetching only the new data since the last date in the existing data. If it does not exist, it performs a full load
-    starting from 7 days before the earliest date in df_justwatch_ranks to the current date minus one day.  
+    A watermark (last loaded date) is kept for each (title, type). Titles already in the store are loaded
+    from the day after their watermark; titles that are new to the ranking are backfilled starting 7 days
+    before the first date they appear in df_justwatch_ranks. Loads go up to the current date minus one day,
+    and only the missing (title, day) cells are fetched.
     
-    The results are saved to a CSV file named 'googlenews_mentions_count.csv' in the 'data' directory.
+    The results are appended to the date-partitioned Parquet store in 'data/googlenews_mentions'
+    (see read_googlenews_mentions). The former 'googlenews_mentions_count.csv' is imported on the first run.
     
     
     Parameters:
-    df_justwatch_ranks (DataFrame): DataFrame containing JustWatch ranks with 'title' and 'type' columns.
+    df_justwatch_ranks (DataFrame): DataFrame containing JustWatch ranks with 'title', 'type' and 'collect_date' columns.
 
     Returns:
-    None: Saves the Google News mentions to a CSV file.
+    None: Appends the Google News mentions to the Parquet store.
     """
-    gnc = GoogleNewsCollector()
-        
-    try:
-        df_googlenews_mentions = pd.read_csv("data/googlenews_mentions_count.csv")
-    except Exception:
-        df_googlenews_mentions = pd.DataFrame(columns=["date", "count", "title"])
-    
-    # Verify if is the first load or incremental load
-    if df_googlenews_mentions.empty:
-        last_date = df_justwatch_ranks['collect_date'].min()
-        # start_date = last_date - 7 days 
-        last_date = pd.to_datetime(last_date)
-        start_date = last_date - pd.Timedelta(days=7) # 7 days before last date
-        end_date = pd.to_datetime("today") - pd.Timedelta(days=1)
-        print(f"First load of Google News mentions data. Starting from {start_date} to {end_date}")
-    else: # incremental load. Only load new data
-        start_date =  pd.to_datetime(df_googlenews_mentions['date']).max()
-        start_date = start_date + pd.Timedelta(days=1)  # next day after the last date in the data
-        end_date = pd.to_datetime("today") - pd.Timedelta(days=1)
-        print(f"Incremental load of Google News mentions data. Starting from {start_date} to {end_date}")
-
-
-    if start_date > end_date:
-        print("No new data to load for Google News mentions. The last date is today or in the future.")
-    else:    
-        start_date = start_date.strftime('%Y-%m-%d')
-        end_date = end_date.strftime('%Y-%m-%d') # yesterday
-        all_data = []
-        df_justwatch_ranks_unique = df_justwatch_ranks.groupby(['type', 'title']).size().reset_index(name='count')
-        for _ , row in df_justwatch_ranks_unique.iterrows():
-            print(row['title'], row['type'])    
-            topic = row['title']
-            df = gnc.count_news_by_date(start_date=start_date, end_date=end_date, topic=topic)
-            df['title'] = topic
-            df['type'] = row['type']
-            all_data.extend(df.to_dict(orient='records'))
-            
-        # Concatenate df_googlenews_mentions with the new data
-        if not all_data:
-            print("No new data found for Google News mentions.")
-        else:
-            print(f"Found {len(all_data)} new records for Google News mentions.")
-            df_googlenews_mentions = pd.concat([df_googlenews_mentions, pd.DataFrame(all_data)], ignore_index=True) 
-            df_googlenews_mentions.to_csv("data/googlenews_mentions_count.csv", index=False)
-            print("Google News mentions data saved to data/googlenews_mentions_count.csv")  
+    _import_legacy_mentions()
+    watermarks = _load_watermarks()
+    end_date = pd.to_datetime("today").normalize() - pd.Timedelta(days=1)  # yesterday
+
+    titles = (
+        df_justwatch_ranks.astype({"title": str, "type": str})
+        .assign(collect_date=pd.to_datetime(df_justwatch_ranks["collect_date"].astype(str)))
+        .groupby(["title", "type"])["collect_date"].min()
+        .rename("first_date").reset_index()
+        .merge(watermarks, on=["title", "type"], how="left")
+    )
+    # Day after the watermark, or 7 days before the title entered the ranking
+    titles["start_date"] = (titles["last_date"] + pd.Timedelta(days=1)).fillna(titles["first_date"] - pd.Timedelta(days=7))
+
+    cells = [
+        (row.title, row.type, day)
+        for row in titles.itertuples(index=False)
+        for day in pd.date_range(row.start_date, end_date)
+    ]
+    if not cells:
+        print("No new data to load for Google News mentions. Every title is up to date.")
+        return
+    new_titles = titles["last_date"].isna().sum()
+    print(f"Loading {len(cells)} Google News mention counts for {len(titles)} titles ({new_titles} new) up to {end_date:%Y-%m-%d}")
+
+    # Every missing (title, day) cell is fetched concurrently by a bounded pool of browsers
+    with GoogleNewsCollector() as gnc:
+        df_counts = gnc.count_news_cells([(title, f"{day:%Y-%m-%d}") for title, _, day in cells])
+    df_new = pd.DataFrame(
+        [(title, title_type, f"{day:%Y-%m-%d}") for title, title_type, day in cells], columns=["title", "type", "date"]
+    ).merge(df_counts.rename(columns={"topic": "title"}), on=["title", "date"])
+    df_new["date"] = pd.to_datetime(df_new["date"])
+
+    # A failed count is not a zero: the title is only loaded up to the day before its first failure,
+    # so the watermark stops there and the next run fetches the rest again (successes come from the cache)
+    failed = df_new["count"].isna()
+    if failed.any():
+        first_failure = df_new[failed].groupby(["title", "type"])["date"].min().rename("first_failure").reset_index()
+        df_new = df_new.merge(first_failure, on=["title", "type"], how="left")
+        df_new = df_new[~(df_new["date"] >= df_new["first_failure"])].drop(columns="first_failure")
+        print(f"Could not extract {failed.sum()} Google News mention counts for {len(first_failure)} titles; "
+              f"they will be retried on the next run")
+    if df_new.empty:
+        return
+    _append_mentions(df_new)
+
+    # Watermarks are saved after the partitions: an interrupted run repeats its own cells on the next run,
+    # and read_googlenews_mentions keeps only the latest copy of each
+    watermarks = pd.concat([watermarks, _watermarks_from(df_new)])
+    _save_watermarks(watermarks.groupby(["title", "type"])["last_date"].max().reset_index())
+    print(f"Found {len(df_new)} new records for Google News mentions, saved to {MENTIONS_DIR}")
             
 
 def daily_pipeline(extract_justwatch=True):
     """
     Run the daily pipeline to extract Google News mentions.
     
-    This function loads the JustWatch ranks data, extracts Google News mentions, and saves the results to a CSV file.
+    This function loads the JustWatch ranks data, extracts Google News mentions, and appends the results to the
+    Parquet mentions store.
     
     Returns:
     None
@@ -84,15 +194,11 @@ def daily_pipeline(extract_justwatch=True):
     else:
         print("ignoring JustWatch ranks extraction...") 
         
-    # Load JustWatch ranks data
-    files = glob.glob("data/justwatch_rank_*.csv")
-    if not files:
+    # Load JustWatch ranks data (cached; only new daily snapshots are read)
+    df_justwatch_ranks = common.get_justwatch_ranks()
+    if df_justwatch_ranks.empty:
         print("No JustWatch ranks data found.")
         return
     
-    
-    df_justwatch_ranks = pd.concat([pd.read_csv(f) for f in files], ignore_index=True)
-    
     # Extract Google News mentions
     extract_googlenews_mentions(df_justwatch_ranks)
-
@@ -1,4 +1,5 @@
-import requests
+import asyncio
+import httpx
 from io import BytesIO
 import xml.etree.ElementTree as ET
 import pandas as pd
@@ -22,31 +23,74 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
+from concurrent.futures import ThreadPoolExecutor
+
+from response_cache import ResponseCache
+from webdriver_pool import WebDriverPool
+
+
+# Responses worth retrying: rate limiting and server errors
+RETRY_STATUS = {429, 500, 502, 503, 504}
+
+# RSS child element -> DataFrame column
+RSS_FIELDS = {
+    'title': 'Title',
+    'link': 'Link',
+    'pubDate': 'Publication Date',
+    'source': 'Source',
+    'description': 'Description'
+}
+RSS_DATE_FORMAT = '%a, %d %b %Y %H:%M:%S %Z'
+
+
+def _run_async(coro):
+    """Run a coroutine from synchronous code, also when an event loop is already running (e.g. Jupyter)."""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        return executor.submit(asyncio.run, coro).result()
 
 class GoogleNewsVolumeAnalyzer:
     """
     Classe para analisar o volume de notícias no Google News para tópicos específicos.
-    Mantém uma única instância do driver para reutilização.
+    Mantém um pool limitado de drivers reutilizáveis, criados apenas no primeiro uso,
+    e consulta a grade tópico × dia em paralelo.
+    Deve ser fechada com `close()` ou usada como context manager.
     """
     
-    def __init__(self, debug=False):
-        """Inicializa o analisador com configurações do driver."""
-        self.driver = None
-        self._setup_driver()
+    def __init__(self, debug=False, max_drivers=4, delay=1.0, cache=None):
+        """
+        Inicializa o analisador com configurações do driver.
+
+        Args:
+            debug (bool): Salvar screenshot quando a contagem não puder ser extraída
+            max_drivers (int): Número máximo de navegadores abertos ao mesmo tempo
+            delay (float): Pausa, em segundos, de cada driver após cada busca, para evitar sobrecarga
+            cache (ResponseCache, optional): Cache persistente das contagens por (tópico, dia)
+        """
         self.debug = debug  # Ativar modo de depuração se necessário
+        self.delay = delay
+        self.cache = cache
+        self.pool = WebDriverPool(self._setup_driver, max_drivers=max_drivers)
     
     def _setup_driver(self):
-        """Configura e inicializa o driver Chrome."""
+        """Configura e inicializa um driver Chrome."""
         chrome_options = Options()
         chrome_options.add_argument("--headless")
         chrome_options.add_argument("--no-sandbox")
         chrome_options.add_argument("--disable-dev-shm-usage")
         
-        self.driver = webdriver.Chrome(options=chrome_options)
+        return webdriver.Chrome(options=chrome_options)
+    
+    def _search_url(self, topic, date_str):
+        #sbd:0 = permite usar resultados repetidos
+        return f"https://www.google.com/search?q={topic}&sca_esv=996e5555f717663f&tbs=cdr:1,cd_min:{date_str},cd_max:{date_str},sbd:0&tbm=nws&sxsrf=AE3TifOkB74DjbLFJS9M0T87LgrPvDvXKA:1750394179061&source=lnt&sa=X&ved=2ahUKEwim7om6lv-NAxX8pZUCHcD9AQ8QpwV6BAgDEBk&biw=1536&bih=756&dpr=1.25"
     
     def get_results_count(self, search_url):
         """
-        Extrai o número de resultados de uma busca no Google News.
+        Extrai o número de resultados de uma busca no Google News, com um driver do pool.
         
         Args:
             search_url (str): URL da busca no Google News
@@ -54,15 +98,29 @@ class GoogleNewsVolumeAnalyzer:
         Returns:
             int: Número de resultados encontrados, ou 0 se não conseguir extrair
         """
+        count = self._extract_results_count(search_url)
+        return count if count is not None else 0
+    
+    def _extract_results_count(self, search_url):
+        # None indica falha na extração (não deve ser gravado no cache)
         try:
-            self.driver.get(search_url)
-            WebDriverWait(self.driver, 20).until(
-                EC.presence_of_element_located((By.ID, "result-stats"))
-            )
-            
-            # Tentar extrair número de resultados
-            results_info = self.driver.find_element(By.ID, "result-stats")
-            results_text = results_info.text
+            with self.pool.driver() as driver:
+                try:
+                    driver.get(search_url)
+                    WebDriverWait(driver, 20).until(
+                        EC.presence_of_element_located((By.ID, "result-stats"))
+                    )
+                    
+                    # Tentar extrair número de resultados
+                    results_info = driver.find_element(By.ID, "result-stats")
+                    results_text = results_info.text
+                except Exception:
+                    if self.debug:
+                        driver.save_screenshot('googlenews_debug.png')
+                    raise
+                finally:
+                    # Pequena pausa para evitar sobrecarga, mantendo o driver ocupado
+                    time.sleep(self.delay)
             
             # Extrair apenas números do texto (ex: "Cerca de 1.234 resultados")
             numbers = re.findall(r'[\d,\.]+', results_text)
@@ -75,72 +133,117 @@ class GoogleNewsVolumeAnalyzer:
             
         except Exception as e:
             print(f"Erro ao extrair contagem: {e}")
-            if self.debug:
-                self.driver.save_screenshot('googlenews_debug.png')
-            return 0
+            return None
     
-    def get_daily_results_count(self, topic, start_date, end_date):
+    def get_results_cells(self, cells):
         """
-        Coleta a quantidade de resultados dia a dia para um tópico específico.
+        Coleta a quantidade de resultados de uma lista arbitrária de pares (tópico, dia).
+        As células são consultadas em paralelo, limitadas ao tamanho do pool.
         
         Args:
-            topic (str): Tópico a ser pesquisado
+            cells (list): Pares (tópico, data no formato 'MM/DD/YYYY')
+            
+        Returns:
+            list: Contagens, na mesma ordem de `cells`; None nas células cuja contagem não pôde ser
+            extraída (que não são gravadas no cache e devem ser consultadas de novo)
+        """
+        def count_cell(cell):
+            topic, date_str = cell
+            count = self.cache.get('count', cell) if self.cache else None
+            if count is None:
+                count = self._extract_results_count(self._search_url(topic, date_str))
+                if count is None:
+                    logger.warning(f"{topic} - Data: {date_str} - contagem não extraída")
+                    return None
+                if self.cache:
+                    # Dias passados ficam no cache permanentemente; o dia atual expira
+                    self.cache.put('count', cell, count, last_day=datetime.strptime(date_str, '%m/%d/%Y'))
+            logger.info(f"{topic} - Data: {date_str} - Resultados: {count}")
+            return count
+        
+        if not cells:
+            return []
+        with ThreadPoolExecutor(max_workers=self.pool.max_drivers) as executor:
+            # map preserva a ordem das células, independente da ordem de conclusão
+            return list(executor.map(count_cell, cells))
+    
+    def get_results_grid(self, topics, start_date, end_date):
+        """
+        Coleta a quantidade de resultados dia a dia para vários tópicos.
+        A grade tópico × dia é consultada em paralelo (ver `get_results_cells`).
+        
+        Args:
+            topics (list): Tópicos a serem pesquisados
             start_date (str): Data inicial no formato 'MM/DD/YYYY'
             end_date (str): Data final no formato 'MM/DD/YYYY'
             
         Returns:
-            dict: Dicionário com data como chave e contagem como valor
+            dict: Para cada tópico, lista de dicionários {'date', 'count'} em ordem de data
+            ('count' é None quando a contagem não pôde ser extraída)
         """
         # Converter strings de data para objetos datetime
         start = datetime.strptime(start_date, '%m/%d/%Y')
         end = datetime.strptime(end_date, '%m/%d/%Y')
+        dates = [(start + timedelta(days=i)).strftime('%m/%d/%Y') for i in range((end - start).days + 1)]
+        cells = [(topic, date_str) for topic in dict.fromkeys(topics) for date_str in dates]
         
-        results = []
-        current_date = start
-        
-        while current_date <= end:
-            date_str = current_date.strftime('%m/%d/%Y')
-            
-            # Criar URL para busca específica do dia
-            #sbd:0 = permite usar resultados repetidos
-            search_url = f"https://www.google.com/search?q={topic}&sca_esv=996e5555f717663f&tbs=cdr:1,cd_min:{date_str},cd_max:{date_str},sbd:0&tbm=nws&sxsrf=AE3TifOkB74DjbLFJS9M0T87LgrPvDvXKA:1750394179061&source=lnt&sa=X&ved=2ahUKEwim7om6lv-NAxX8pZUCHcD9AQ8QpwV6BAgDEBk&biw=1536&bih=756&dpr=1.25"
-            
-            # Obter contagem de resultados para o dia
-            count = self.get_results_count(search_url)
-            results.append({'date': date_str, 'count': count})
-            
-            print(f"Data: {date_str} - Resultados: {count}")
-            
-            # Avançar para o próximo dia
-            current_date += timedelta(days=1)
-            
-            # Pequena pausa para evitar sobrecarga
-            time.sleep(1)
+        results = {topic: [] for topic, _ in cells}
+        for (topic, date_str), count in zip(cells, self.get_results_cells(cells)):
+            results[topic].append({'date': date_str, 'count': count})
         
         return results
     
+    def get_daily_results_count(self, topic, start_date, end_date):
+        """
+        Coleta a quantidade de resultados dia a dia para um tópico específico.
+        
+        Args:
+            topic (str): Tópico a ser pesquisado
+            start_date (str): Data inicial no formato 'MM/DD/YYYY'
+            end_date (str): Data final no formato 'MM/DD/YYYY'
+            
+        Returns:
+            list: Lista de dicionários {'date', 'count'} em ordem de data
+        """
+        return self.get_results_grid([topic], start_date, end_date).get(topic, [])
+    
     def close(self):
-        """Fecha o driver."""
-        if self.driver:
-            self.driver.quit()
-            self.driver = None
+        """Fecha os drivers do pool (o cache, se houver, pertence a quem o criou)."""
+        self.pool.close()
     
-    def __del__(self):
-        """Destrutor para garantir que o driver seja fechado."""
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
         self.close()
 
 class GoogleNewsCollector:
-    def __init__(self, language="en-US", country="US", debug=False):
+    def __init__(self, language="en-US", country="US", debug=False, max_drivers=4, max_concurrency=8, timeout=30,
+                 cache_path="data/googlenews_cache.sqlite", cache_ttl=3600, max_retries=3, backoff=1.0):
         """
         Initialize the Google News collector with language and country preferences.
+        No browser is started here: the volume analyzer opens its drivers on first use,
+        so the RSS methods never launch Chrome. Call `close()` (or use the collector as
+        a context manager) to quit the drivers.
         
         Args:
             language (str): Language code (e.g., "en-US", "pt-BR")
             country (str): Country code (e.g., "US", "BR")  
             debug (bool): Whether to enable debug mode for verbose logging
+            max_drivers (int): Maximum number of concurrent browsers used for result counts
+            max_concurrency (int): Maximum number of concurrent RSS requests (and pooled connections)
+            timeout (float): Timeout in seconds for each RSS request
+            cache_path (str, optional): SQLite file caching RSS bodies and result counts; None disables the cache
+            cache_ttl (float): Lifetime in seconds of cached responses that include the current day
+            max_retries (int): Retries of each RSS request after a transport error, 429 or 5xx response
+            backoff (float): Initial wait in seconds between retries, doubled after each attempt
 
         """
         self.debug = debug
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff = backoff
         self.language = language
         self.country = country
         
@@ -150,7 +253,21 @@ class GoogleNewsCollector:
         else:
             self.lang_param = f"hl={language}&gl={country}&ceid={country}:en"
             
-        self.googlenews_analyzer = GoogleNewsVolumeAnalyzer()  # Initialize the volume analyzer
+        # Past days never change: their responses are kept permanently
+        self.cache = ResponseCache(cache_path, today_ttl=cache_ttl) if cache_path else None
+        self.googlenews_analyzer = GoogleNewsVolumeAnalyzer(max_drivers=max_drivers, cache=self.cache)  # Drivers are created lazily
+    
+    def close(self):
+        """Quit the browsers opened by the volume analyzer, if any, and close the cache."""
+        self.googlenews_analyzer.close()
+        if self.cache:
+            self.cache.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
     
     def count_news_by_date(self, topic, start_date, end_date, max_results=None, topic_type=None):
         """
@@ -174,46 +291,211 @@ class GoogleNewsCollector:
         topic_results = self.googlenews_analyzer.get_daily_results_count(topic, start_dt.strftime('%m/%d/%Y') , end_dt.strftime('%m/%d/%Y'))
         
         return pd.DataFrame(topic_results)
+    
+    def count_news_grid(self, topics, start_date, end_date):
+        """
+        Count the daily number of news articles for several topics at once.
+        The whole topic-by-date grid is fetched concurrently by the driver pool.
         
-    def collect_news_by_date(self, topic, start_date, end_date, max_results=None, topic_type=None):
+        Args:
+            topics (list): The topics to search for
+            start_date (str): Start date in the format 'YYYY-MM-DD'
+            end_date (str): End date in the format 'YYYY-MM-DD'
+            
+        Returns:
+            pandas.DataFrame: Columns 'date' ('MM/DD/YYYY'), 'count' and 'topic', ordered by topic and date
+            ('count' is missing for the cells whose count could not be extracted)
         """
-        Collect news about a specific topic from Google News within a date range.
+        start_dt = datetime.strptime(start_date, '%Y-%m-%d')
+        end_dt = datetime.strptime(end_date, '%Y-%m-%d')
+        grid = self.googlenews_analyzer.get_results_grid(topics, start_dt.strftime('%m/%d/%Y'), end_dt.strftime('%m/%d/%Y'))
+        rows = [{**cell, 'topic': topic} for topic, cells in grid.items() for cell in cells]
+        return pd.DataFrame(rows, columns=['date', 'count', 'topic'])
+    
+    def count_news_cells(self, cells):
+        """
+        Count the number of news articles for arbitrary (topic, day) pairs, e.g. only the
+        days still missing for each topic. All pairs are fetched concurrently by the driver pool.
+        
         Args:
-            topic (str): The topic to search for
+            cells (list): (topic, date) pairs, date in the format 'YYYY-MM-DD'; duplicates are fetched once
+            
+        Returns:
+            pandas.DataFrame: Columns 'date' ('YYYY-MM-DD'), 'count' and 'topic', in the order of `cells`;
+            'count' is None for the cells whose count could not be extracted
+        """
+        cells = list(dict.fromkeys(cells))
+        counts = self.googlenews_analyzer.get_results_cells(
+            [(topic, datetime.strptime(day, '%Y-%m-%d').strftime('%m/%d/%Y')) for topic, day in cells]
+        )
+        return pd.DataFrame({
+            'date': [day for _, day in cells],
+            'count': counts,
+            'topic': [topic for topic, _ in cells]
+        }, columns=['date', 'count', 'topic'])
+        
+    def _rss_url(self, topic, after=None, before=None):
+        """Build the Google News RSS search URL, optionally restricted to a date window."""
+        # Encode the topic for URL
+        encoded_topic = topic.replace(" ", "%20")
+        query = f"'{encoded_topic}'"
+        if after is not None:
+            query += f"+after:{after}+before:{before}"
+        return f"https://news.google.com/rss/search?q={query}&{self.lang_param}"
+    
+    async def _fetch_all(self, urls):
+        # One client per batch: connections are kept alive and reused across all the URLs
+        limits = httpx.Limits(max_connections=self.max_concurrency, max_keepalive_connections=self.max_concurrency)
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        async with httpx.AsyncClient(limits=limits, timeout=self.timeout, follow_redirects=True) as client:
+            async def fetch(url):
+                for attempt in range(self.max_retries + 1):
+                    async with semaphore:
+                        try:
+                            response = await client.get(url)
+                            response.raise_for_status()
+                            return response.content
+                        except httpx.HTTPStatusError as e:
+                            if e.response.status_code not in RETRY_STATUS or attempt == self.max_retries:
+                                raise
+                            retry_after = e.response.headers.get('Retry-After', '')
+                            wait = float(retry_after) if retry_after.isdigit() else self.backoff * 2 ** attempt
+                        except httpx.TransportError:
+                            if attempt == self.max_retries:
+                                raise
+                            wait = self.backoff * 2 ** attempt
+                    # Wait outside the semaphore so other URLs keep using the connections
+                    logger.warning(f"Retrying {url} in {wait:.1f}s (attempt {attempt + 1} of {self.max_retries})")
+                    await asyncio.sleep(wait)
+            # A failed URL does not cancel the others: its exception takes its place in the results
+            return await asyncio.gather(*(fetch(url) for url in urls), return_exceptions=True)
+    
+    def fetch_rss(self, urls):
+        """
+        Fetch several RSS URLs concurrently, at most `max_concurrency` at a time.
+        Transport errors, 429 and 5xx responses are retried with exponential backoff.
+        
+        Args:
+            urls (list): URLs to fetch
+            
+        Returns:
+            list: Response bodies (bytes), in the same order as `urls`; a URL that still
+            fails after the retries gets its exception (httpx.HTTPError) instead
+        """
+        return _run_async(self._fetch_all(urls))
+    
+    def _fetch_rss_cached(self, requests):
+        """
+        Fetch RSS bodies through the cache: only the misses go to the network, in one concurrent batch.
+        
+        Args:
+            requests (list): (query, after, before, url) tuples; after/before are 'YYYY-MM-DD' or None
+            
+        Returns:
+            list: Response bodies (bytes), in the same order as `requests`; failed requests
+            get their exception instead and are not cached
+        """
+        keys = [(query, after, before, self.language, self.country) for query, after, before, _ in requests]
+        contents = [self.cache.get('rss', key) if self.cache else None for key in keys]
+        missing = [i for i, content in enumerate(contents) if content is None]
+        if missing:
+            fetched = self.fetch_rss([requests[i][3] for i in missing])
+            for i, content in zip(missing, fetched):
+                contents[i] = content
+                if isinstance(content, Exception):
+                    logger.warning(f"Google News RSS failed for {requests[i][0]} ({requests[i][1]}): {content}")
+                elif self.cache:
+                    after = requests[i][1]
+                    # The window [after, before) covers the day `after`
+                    self.cache.put('rss', keys[i], content, last_day=datetime.strptime(after, '%Y-%m-%d') if after else None)
+        if self.cache:
+            logger.info(f"Google News RSS: {len(requests) - len(missing)} cached, {len(missing)} fetched")
+        return contents
+    
+    def collect_news_grid(self, topics, start_date, end_date, max_results=None, topic_type=None):
+        """
+        Collect news about several topics from Google News within a date range.
+        The whole topic-by-date grid is fetched concurrently over a shared connection pool.
+        
+        Args:
+            topics (list): The topics to search for
             start_date (str): Start date in the format 'YYYY-MM-DD'
             end_date (str): End date in the format 'YYYY-MM-DD'
-            max_results (int, optional): Maximum number of results to return
+            max_results (int, optional): Maximum number of results to return per topic and day
+            topic_type (str, optional): Prepended to every topic in the search
+            
         Returns:
-            pandas.DataFrame: DataFrame containing news articles
+            pandas.DataFrame: DataFrame containing news articles plus a 'topic' column,
+            ordered by topic and date regardless of the order in which responses arrive.
+            Cells whose request failed are left out and listed, as (topic, date) pairs,
+            in `df.attrs['failed_cells']`; the other cells are kept (and cached)
         """
         # Validate date format
         start_dt = datetime.strptime(start_date, '%Y-%m-%d')
         end_dt = datetime.strptime(end_date, '%Y-%m-%d') 
 
-        # If topic_type is provided, prepend it to the topic
-        if topic_type:
-            topic = f"{topic_type} {topic}"
-        # Encode the topic for URL
-        encoded_topic = topic.replace(" ", "%20")
-
-        # Initialize an empty DataFrame to store all results
-        all_news = []
-        
-        # Loop through each date in the range 
-        for date in pd.date_range(start=start_dt, end=end_dt):
-            # Prepare the URL with the topic and language parameters
+        cells = [(topic, date) for topic in dict.fromkeys(topics) for date in pd.date_range(start=start_dt, end=end_dt)]
+        requests = []
+        for topic, date in cells:
+            # If topic_type is provided, prepend it to the topic
+            query = f"{topic_type} {topic}" if topic_type else topic
             # Get 2 days of news for each date
             before_dt = date + timedelta(days=1)  # Add one day to include the end date
-            url = f"https://news.google.com/rss/search?q='{encoded_topic}'+after:{date.strftime('%Y-%m-%d')}+before:{before_dt.strftime('%Y-%m-%d')}&{self.lang_param}"
-            # Make the request
-            response = requests.get(url)
-            response.raise_for_status()
-            df = self.parse_news(response.content, max_results=max_results)
-            logger.info(f"Collected #{len(df)} Google News for topic: {topic} on date range: {date.strftime('%Y-%m-%d')} to {before_dt.strftime('%Y-%m-%d')}")
-            all_news.extend(df.to_dict(orient='records'))
+            after, before = date.strftime('%Y-%m-%d'), before_dt.strftime('%Y-%m-%d')
+            requests.append((query, after, before, self._rss_url(query, after, before)))
+        contents = self._fetch_rss_cached(requests)
+        
+        return self._parse_grid(cells, contents, max_results=max_results)
+        
+    def _parse_grid(self, cells, contents, max_results=None):
+        """
+        Parse the RSS bodies of a topic-by-date grid into a single DataFrame.
+        
+        Args:
+            cells (list): (topic, date) pairs, in request order
+            contents (list): RSS bodies, one per cell; exceptions mark failed cells
+            max_results (int, optional): Maximum number of items per cell
             
+        Returns:
+            pandas.DataFrame: News articles plus a 'topic' column; failed cells in `attrs['failed_cells']`
+        """
+        # All days are parsed into the same columns; the DataFrame is built once at the end
+        columns = self._empty_columns()
+        topic_column = []
+        cell_column = []
+        failed_cells = []
+        for i, ((topic, date), content) in enumerate(zip(cells, contents)):
+            if isinstance(content, Exception):
+                failed_cells.append((topic, date))
+                continue
+            count = self._parse_items(content, columns, max_results=max_results)
+            logger.info(f"Collected #{count} Google News for topic: {topic} on date: {date.strftime('%Y-%m-%d')}")
+            topic_column.extend([topic] * count)
+            cell_column.extend([i] * count)
         
-        return pd.DataFrame(all_news)
+        news_df = self._news_frame(columns)
+        news_df['topic'] = topic_column
+        # Topic and day in request order, newest first within each day
+        news_df['cell'] = cell_column
+        news_df.sort_values(by=['cell', 'Publication Date'], ascending=[True, False], kind='stable', inplace=True)
+        news_df = news_df.drop(columns='cell').reset_index(drop=True)
+        news_df.attrs['failed_cells'] = failed_cells
+        return news_df
+        
+    def collect_news_by_date(self, topic, start_date, end_date, max_results=None, topic_type=None):
+        """
+        Collect news about a specific topic from Google News within a date range.
+        The days are fetched concurrently (see `collect_news_grid`).
+        Args:
+            topic (str): The topic to search for
+            start_date (str): Start date in the format 'YYYY-MM-DD'
+            end_date (str): End date in the format 'YYYY-MM-DD'
+            max_results (int, optional): Maximum number of results to return
+        Returns:
+            pandas.DataFrame: DataFrame containing news articles
+        """
+        df = self.collect_news_grid([topic], start_date, end_date, max_results=max_results, topic_type=topic_type)
+        return df.drop(columns='topic', errors='ignore')
         
     def collect_news(self, topic, max_results=None):
         """
@@ -228,63 +510,64 @@ class GoogleNewsCollector:
         """
         logger.info(f"Accessing Google News for topic: {topic} in {self.language} ({self.country})")
         # Prepare the URL with the topic and language parameters
-        encoded_topic = topic.replace(" ", "%20")
-        url = f"https://news.google.com/rss/search?q='{encoded_topic}'&{self.lang_param}"
+        content, = self._fetch_rss_cached([(topic, None, None, self._rss_url(topic))])
+        if isinstance(content, Exception):
+            raise content
         
-        # Make the request
-        response = requests.get(url)
-        response.raise_for_status()
+        return self.parse_news(content, max_results=max_results)
+    
+    def _parse_items(self, content, columns, max_results=None):
+        """
+        Stream the <item> elements of an RSS body into column lists, without building the full tree.
         
-        return self.parse_news(response.content, max_results=max_results)
+        Args:
+            content (bytes): The RSS response body
+            columns (dict): Column name -> list, as returned by `_empty_columns`; values are appended
+            max_results (int, optional): Maximum number of items to read
+            
+        Returns:
+            int: Number of items appended
+        """
+        count = 0
+        for _, elem in ET.iterparse(BytesIO(content), events=('end',)):
+            if elem.tag != 'item':
+                continue
+            # One pass over the children instead of two find() calls per field
+            values = dict.fromkeys(RSS_FIELDS)
+            for child in elem:
+                if child.tag in values:
+                    values[child.tag] = child.text
+            for tag, column in RSS_FIELDS.items():
+                columns[column].append(values[tag])
+            elem.clear()
+            count += 1
+            if max_results and count >= max_results:
+                break
+        return count
+    
+    @staticmethod
+    def _empty_columns():
+        return {column: [] for column in RSS_FIELDS.values()}
+    
+    @staticmethod
+    def _news_frame(columns):
+        """Build the news DataFrame from column lists, parsing all publication dates at once."""
+        news_df = pd.DataFrame(columns)
+        news_df['Publication Date'] = pd.to_datetime(news_df['Publication Date'], format=RSS_DATE_FORMAT)
+        return news_df
     
     def parse_news(self, content, max_results=None):
         """
         Parse the XML response from Google News and extract relevant information.
         Args:
-            response (requests.Response): The response object from the request
+            content (bytes): The RSS response body
             max_results (int, optional): Maximum number of results to return
         Returns:
             pandas.DataFrame: DataFrame containing news articles
         """
-        # Parse the XML content
-        root = ET.parse(BytesIO(content)).getroot()
-        
-        # Create lists to store the data
-        titles = []
-        links = []
-        pub_dates = []
-        sources = []
-        descriptions = []
-        
-        # Find all item elements (news articles)
-        for item in root.findall('.//item'):
-            title = item.find('title').text if item.find('title') is not None else None
-            link = item.find('link').text if item.find('link') is not None else None
-            pub_date = item.find('pubDate').text if item.find('pubDate') is not None else None
-            source = item.find('source').text if item.find('source') is not None else None
-            description = item.find('description').text if item.find('description') is not None else None
-            
-            titles.append(title)
-            links.append(link)
-            pub_dates.append(pub_date)
-            sources.append(source)
-            descriptions.append(description)
-            
-            if max_results and len(titles) >= max_results:
-                break
-        
-        # Create a DataFrame
-        news_df = pd.DataFrame({
-            'Title': titles,
-            'Link': links,
-            'Publication Date': pub_dates,
-            'Source': sources,
-            'Description': descriptions
-        })
-        
-        # Convert 'Publication Date' column to datetime format
-        news_df['Publication Date'] = pd.to_datetime(news_df['Publication Date'], 
-                                                    format='%a, %d %b %Y %H:%M:%S %Z')
+        columns = self._empty_columns()
+        self._parse_items(content, columns, max_results=max_results)
+        news_df = self._news_frame(columns)
         
         # Sort by publication date (newest first)
         news_df.sort_values(by='Publication Date', ascending=False, inplace=True)
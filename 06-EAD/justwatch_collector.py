@@ -5,20 +5,45 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException
 from selenium.webdriver.chrome.options import Options
+from concurrent.futures import ThreadPoolExecutor
+import lxml.html
 import pandas as pd
 import time
 
+from webdriver_pool import WebDriverPool
+
+
+def _has_class(name):
+    """XPath predicate equivalent to the CSS class selector `.name`."""
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+
+# XPath equivalents of the CSS selectors of the ranking table (lxml needs no extra package for XPath)
+RANKING_XPATHS = {
+    'row': f"//table[{_has_class('list')}]//*[{_has_class('list__row')}]",
+    'rank': f".//*[{_has_class('title-ranking-list__rank')} and {_has_class('title-ranking-list__rank--condensed')}]",
+    'rank_change': f".//*[{_has_class('arrow-container')}]//p",
+    'title': f".//*[{_has_class('list__row__item__content__title')}]/span",
+    'top_rank': f".//td[{_has_class('top-rank')}]",
+    'platforms': f".//*[{_has_class('offers-display')}]//img/@title"
+}
+
 class JustWatchCollector:
-    def __init__(self, country="br", content_type="series", headless=True):
+    def __init__(self, country="br", content_type="series", headless=True, max_drivers=4, field_timeout=2):
         """
         Initialize the JustWatch collector.
         
         Args:
             country (str): Country code (e.g., "br", "us")
             content_type (str): Type of content ("series" or "movies")
+            max_drivers (int): Maximum number of concurrent browsers for the title detail pages
+            field_timeout (float): Seconds to wait for each detail-page field once the title is rendered
+                (rank, IMDb score, etc. are rendered lazily, after the heading)
         """
         
         self.__TIME2SLEEP__ = 0.5
+        self.max_drivers = max_drivers
+        self.field_timeout = field_timeout
         self.country = country
         self.content_type = content_type
         self.url = f"https://www.justwatch.com/{country}/{content_type}"
@@ -47,11 +72,11 @@ class JustWatchCollector:
             'imdb_score': '.imdb-score'
         }
 
-    def get_data(self, driver, css_selector, attribute='text'):
-        """Helper function to extract data using CSS selectors."""
+    def get_data(self, driver, css_selector, attribute='text', timeout=5):
+        """Helper function to extract data using CSS selectors, waiting up to `timeout` seconds."""
         data = [""]
         try:
-            elements = WebDriverWait(driver, 5).until(
+            elements = WebDriverWait(driver, timeout).until(
                 EC.presence_of_all_elements_located((By.CSS_SELECTOR, css_selector))
             )
             if attribute != 'text':
@@ -68,24 +93,86 @@ class JustWatchCollector:
         driver.find_element(By.TAG_NAME, 'body').send_keys(Keys.PAGE_DOWN)
         time.sleep(self.__TIME2SLEEP__)
 
+    def _setup_driver(self):
+        """Create a Chrome driver with the collector options (used by the detail-page pool)."""
+        return webdriver.Chrome(options=self.chrome_options)
+
+    def _collect_links(self, driver, max_titles, max_scrolls):
+        """
+        Scroll the title grid and collect the detail-page links, in rank order.
+
+        Args:
+            driver (WebDriver): Driver already on the title grid page
+            max_titles (int): Maximum number of links to collect
+            max_scrolls (int): Maximum number of scrolls to attempt
+
+        Returns:
+            list: Unique detail-page URLs, in the order they appear in the grid
+        """
+        links = []
+        scroll_count = 0
+        while len(links) < max_titles and scroll_count < max_scrolls:
+            link_elements = driver.find_elements(By.CSS_SELECTOR, 'div.title-list-grid__item .title-list-grid__item--link')
+            for link_element in link_elements[len(links):]:
+                link = link_element.get_attribute('href')
+                if link and link not in links:
+                    links.append(link)
+                if len(links) >= max_titles:
+                    break
+
+            print(f"Collected {len(links)} links so far.")
+            if len(links) < max_titles:
+                self.scroll_down(driver)
+                scroll_count += 1
+        return links[:max_titles]
+
+    def _scrape_title(self, pool, link):
+        """
+        Extract the detail-page fields of one title with a driver borrowed from the pool.
+
+        Args:
+            pool (WebDriverPool): Pool of detail-page drivers
+            link (str): Detail-page URL
+
+        Returns:
+            dict: Field -> text (comma-joined when several elements match), or None on error
+        """
+        try:
+            with pool.driver() as driver:
+                driver.get(link)
+                # Wait for the heading, then give each field a short wait of its own: the other fields
+                # are rendered lazily after it, and a missing selector costs field_timeout, not 5 s
+                WebDriverWait(driver, 5).until(
+                    EC.presence_of_element_located((By.CSS_SELECTOR, self.css_selectors['title']))
+                )
+                data = {
+                    item: ",".join(self.get_data(driver, css_selector, attribute='text', timeout=self.field_timeout))
+                    for item, css_selector in self.css_selectors.items()
+                }
+                time.sleep(self.__TIME2SLEEP__)
+            print(f"Extracted data for title: {link}")
+            return data
+        except Exception as e:
+            print(f"Error processing item {link}: {str(e)}")
+            return None
+
     def collect_titles(self, max_titles=100, max_scrolls=20):
         """
         Collect titles from JustWatch.
+
+        The grid is scrolled first to collect the detail-page links; the detail pages are then
+        scraped concurrently by a pool of up to `max_drivers` browsers.
         
         Args:
             max_titles (int): Maximum number of titles to collect
             max_scrolls (int): Maximum number of scrolls to attempt
             
         Returns:
-            pandas.DataFrame: DataFrame containing collected titles
+            pandas.DataFrame: DataFrame containing collected titles, in rank order
         """
-        # Initialize WebDrivers
+        # Initialize WebDriver for the grid; detail-page drivers are created lazily by the pool
         driver = webdriver.Chrome(options=self.chrome_options)
-        driver_detail = webdriver.Chrome(options=self.chrome_options)
-        
-        data_result = {}
-        titles = []
-        scroll_count = 0
+        pool = WebDriverPool(self._setup_driver, max_drivers=self.max_drivers)
 
         try:
             # Navigate to JustWatch
@@ -96,53 +183,15 @@ class JustWatchCollector:
             WebDriverWait(driver, 5).until(
                 EC.presence_of_element_located((By.CSS_SELECTOR, ".title-list-grid__item"))
             )
-            
-            while len(titles) < max_titles and scroll_count < max_scrolls:
-                # Find all title elements
-                title_elements = driver.find_elements(By.CSS_SELECTOR, 'div.title-list-grid__item')
-                current_count = len(titles)
-                
-                for element in title_elements[current_count:]:
-                    try:
-                        # Get title link
-                        link_element = WebDriverWait(element, 5).until(
-                            EC.presence_of_element_located((By.CSS_SELECTOR, '.title-list-grid__item--link'))
-                        )
-                        link = link_element.get_attribute('href')
-                        
-                        # Navigate to title detail page
-                        driver_detail.get(link)
-                        time.sleep(self.__TIME2SLEEP__)
-                        
-                        # Extract data
-                        for item, css_selector in self.css_selectors.items():
-                            if item not in data_result:
-                                data_result[item] = []
-                            data_result[item].append(",".join(
-                                self.get_data(driver_detail, css_selector, attribute='text')
-                            ))
-                        
-                        titles = data_result['title']
-                        print(f"Extracted data for title #{len(titles)}: {link}")
-                        
-                        if len(titles) >= max_titles:
-                            break
-                            
-                    except Exception as e:
-                        print(f"Error processing item: {str(e)}")
-                
-                # Handle scrolling
-                if len(titles) == current_count:
-                    self.scroll_down(driver)
-                    scroll_count += 1
-                elif len(titles) < max_titles:
-                    self.scroll_down(driver)
-                    scroll_count += 1
-                
-                print(f"Collected {len(titles)} items so far.")
-                
+            links = self._collect_links(driver, max_titles, max_scrolls)
+
+            with ThreadPoolExecutor(max_workers=self.max_drivers) as executor:
+                # map keeps the rank order of the links, whatever the completion order
+                rows = [row for row in executor.map(lambda link: self._scrape_title(pool, link), links) if row is not None]
+            print(f"Extracted data for {len(rows)} of {len(links)} titles.")
+
             # Create DataFrame
-            results_df = pd.DataFrame(data_result)
+            results_df = pd.DataFrame(rows, columns=list(self.css_selectors))
             self.adjust_data(results_df)
             return results_df
             
@@ -153,7 +202,7 @@ class JustWatchCollector:
             
         finally:
             driver.quit()
-            driver_detail.quit()
+            pool.close()
 
     def collect_ranking(self, type, rank_freq="daily", max_titles=20):
         """
@@ -170,13 +219,6 @@ class JustWatchCollector:
             pandas.DataFrame: DataFrame containing collected rankings
         """
         driver = webdriver.Chrome(options=self.chrome_options)
-        data_result = {
-            'title': [],
-            'rank': [],
-            'rank_change': [],
-            'top_rank': [],
-            'platforms': [] 
-        }
         
         try:
             # Navigate to JustWatch ranking page
@@ -191,37 +233,14 @@ class JustWatchCollector:
                 raise ValueError("Type must be either 'movies' or 'tv-shows'")
                 
             driver.get(url)
-            time.sleep(10)
             print(f"Accessing URL: {url}")
-            driver.get_screenshot_as_file("screenshot.png")
-            # Wait for the page to load
+            # Wait for the ranking rows to be rendered, instead of a fixed sleep
             WebDriverWait(driver, 60).until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, "table.list"))
+                EC.presence_of_element_located((By.CSS_SELECTOR, "table.list .list__row"))
             )
-            
-            # Collect titles and ranks
-            title_elements = driver.find_elements(By.CSS_SELECTOR, "table.list .list__row")
-            for element in title_elements[:max_titles]:
-                try:
-                    rank = self.get_data(element, ".title-ranking-list__rank.title-ranking-list__rank--condensed") or ""
-                    rank_change = self.get_data(element, ".arrow-container p") or ""
-                    title = self.get_data(element, ".list__row__item__content__title>span") or ""
-                    top_rank = self.get_data(element, "td.top-rank") or ""
-                    platforms = self.get_data(element, ".offers-display img",  attribute='title')
-                    
-                    data_result['title'].append(title[0])
-                    data_result['rank'].append(rank[0])
-                    data_result['rank_change'].append(rank_change[0])
-                    data_result['top_rank'].append(top_rank[0])
-                    data_result['platforms'].append(platforms)
-                    
-                except Exception as e:
-                    print(f"Error processing element: {str(e)}")
-            # Scroll down to load more titles if necessary
-            self.scroll_down(driver)
-            time.sleep(self.__TIME2SLEEP__)
-            # Create DataFrame
-            results_df = pd.DataFrame(data_result)
+
+            # Grab the rendered page once and parse all rows in-process
+            results_df = self.parse_ranking(driver.page_source, max_titles=max_titles)
             results_df = self.adjust_data_ranking(results_df)
             return results_df
             
@@ -235,6 +254,38 @@ class JustWatchCollector:
             driver.quit()
             
     
+    def parse_ranking(self, html, max_titles=20):
+        """
+        Parse a rendered JustWatch ranking page (e.g. `driver.page_source` or a saved HTML file).
+        
+        Args:
+            html (str): HTML of the ranking page
+            max_titles (int): Maximum number of titles to parse
+            
+        Returns:
+            pandas.DataFrame: Raw ranking rows ('title', 'rank', 'rank_change', 'top_rank', 'platforms'),
+            to be adjusted with adjust_data_ranking
+        """
+        def first_text(row, xpath):
+            elements = row.xpath(xpath)
+            return elements[0].text_content().strip() if elements else ""
+
+        data_result = {
+            'title': [],
+            'rank': [],
+            'rank_change': [],
+            'top_rank': [],
+            'platforms': []
+        }
+        root = lxml.html.fromstring(html)
+        for row in root.xpath(RANKING_XPATHS['row'])[:max_titles]:
+            data_result['title'].append(first_text(row, RANKING_XPATHS['title']))
+            data_result['rank'].append(first_text(row, RANKING_XPATHS['rank']))
+            data_result['rank_change'].append(first_text(row, RANKING_XPATHS['rank_change']))
+            data_result['top_rank'].append(first_text(row, RANKING_XPATHS['top_rank']))
+            data_result['platforms'].append(row.xpath(RANKING_XPATHS['platforms']))
+        return pd.DataFrame(data_result)
+
     def adjust_data(self, df):
         """
         Adjust the DataFrame to ensure data consistency and format.
@@ -0,0 +1,116 @@
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import defaultdict
+from datetime import date, datetime
+
+logger = logging.getLogger(__name__)
+
+
+class ResponseCache:
+    """
+    Persistent cache (SQLite) for Google News responses.
+
+    Responses about past days never change, so they are stored permanently. Responses that
+    include the current day (or no day at all) expire after `today_ttl` seconds.
+    Hits and misses are counted per kind of response (e.g. 'rss', 'count').
+    Safe to use from several threads. After `close` the database is reopened on the next lookup.
+    """
+
+    def __init__(self, path="data/googlenews_cache.sqlite", today_ttl=3600):
+        """
+        Args:
+            path (str): SQLite database file
+            today_ttl (float): Lifetime in seconds of responses that include the current day
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self.today_ttl = today_ttl
+        self.stats = defaultdict(lambda: {'hits': 0, 'misses': 0})
+        self._lock = threading.Lock()
+        self._conn = None
+        with self._lock:
+            self._connection()
+
+    def _connection(self):
+        # Opened on first use and again after close(); callers hold the lock
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "kind TEXT NOT NULL, key TEXT NOT NULL, value BLOB, fetched_at REAL NOT NULL, expires_at REAL, "
+                "PRIMARY KEY (kind, key))"
+            )
+            self._conn.commit()
+        return self._conn
+
+    @staticmethod
+    def _key(key):
+        return json.dumps(key, ensure_ascii=False)
+
+    def get(self, kind, key):
+        """
+        Look up a cached response.
+
+        Args:
+            kind (str): Kind of response (e.g. 'rss', 'count')
+            key (tuple): Identifies the request (e.g. (topic, day))
+
+        Returns:
+            The cached value, or None if missing or expired
+        """
+        with self._lock:
+            row = self._connection().execute(
+                "SELECT value, expires_at FROM responses WHERE kind = ? AND key = ?", (kind, self._key(key))
+            ).fetchone()
+            if row is None or (row[1] is not None and row[1] < time.time()):
+                self.stats[kind]['misses'] += 1
+                return None
+            self.stats[kind]['hits'] += 1
+            return row[0]
+
+    def put(self, kind, key, value, last_day=None):
+        """
+        Store a response.
+
+        Args:
+            kind (str): Kind of response (e.g. 'rss', 'count')
+            key (tuple): Identifies the request
+            value (bytes | int | str): Response to store
+            last_day (date, optional): Last day covered by the response. Responses that end
+                before today are stored permanently; the others expire after `today_ttl`.
+        """
+        if isinstance(last_day, datetime):
+            last_day = last_day.date()
+        now = time.time()
+        expires_at = None if last_day is not None and last_day < date.today() else now + self.today_ttl
+        with self._lock:
+            conn = self._connection()
+            conn.execute(
+                "INSERT OR REPLACE INTO responses (kind, key, value, fetched_at, expires_at) VALUES (?, ?, ?, ?, ?)",
+                (kind, self._key(key), value, now, expires_at)
+            )
+            conn.commit()
+
+    def summary(self):
+        """Hit/miss statistics as text, e.g. "rss: 28 hits, 2 misses (93% hit rate)"."""
+        parts = []
+        for kind, counts in sorted(self.stats.items()):
+            total = counts['hits'] + counts['misses']
+            rate = counts['hits'] / total if total else 0
+            parts.append(f"{kind}: {counts['hits']} hits, {counts['misses']} misses ({rate:.0%} hit rate)")
+        return "; ".join(parts) or "no lookups"
+
+    def close(self):
+        """Log the statistics and close the database; a later `get` or `put` reopens it."""
+        with self._lock:
+            if self._conn is None:
+                return
+            self._conn.close()
+            self._conn = None
+        logger.info(f"Google News cache {self.path}: {self.summary()}")
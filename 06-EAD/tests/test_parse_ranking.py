@@ -0,0 +1,60 @@
+from pathlib import Path
+
+import pytest
+
+from justwatch_collector import JustWatchCollector
+
+FIXTURE = Path(__file__).parent / "fixtures" / "justwatch_ranking_tv-shows.html"
+
+
+@pytest.fixture(scope="module")
+def html():
+    return FIXTURE.read_text(encoding="utf-8")
+
+
+@pytest.fixture(scope="module")
+def collector():
+    # No browser is started until a collect_* method runs
+    return JustWatchCollector(country="us")
+
+
+def test_parse_ranking_reads_every_row_in_rank_order(collector, html):
+    df = collector.parse_ranking(html, max_titles=100)
+
+    assert list(df.columns) == ["title", "rank", "rank_change", "top_rank", "platforms"]
+    # The header and the ad row are not ranking rows
+    assert len(df) == 10
+    assert df["rank"].tolist() == [str(rank) for rank in range(1, 11)]
+    assert df["title"].tolist()[:4] == ["Dept. Q", "Murderbot", "Revival", "Stick"]
+    assert df.loc[0, "platforms"] == ["Netflix", "Netflix Standard with Ads"]
+
+
+def test_parse_ranking_rank_change_with_and_without_arrow(collector, html):
+    df = collector.parse_ranking(html).set_index("title")
+
+    assert df.loc["Murderbot", "rank_change"] == "2"
+    assert df.loc["Stick", "rank_change"] == "-2"
+    # Titles whose rank did not change have no .arrow-container
+    assert df.loc["Dept. Q", "rank_change"] == ""
+    assert df.loc["Poker Face", "rank_change"] == ""
+
+    adjusted = collector.adjust_data_ranking(df.reset_index()).set_index("title")
+    assert adjusted.loc["Dept. Q", "rank_change"] == 0
+    assert adjusted.loc["Stick", "rank_change"] == -2
+
+
+def test_parse_ranking_title_without_platforms(collector, html):
+    df = collector.parse_ranking(html).set_index("title")
+
+    assert df.loc["MobLand", "platforms"] == []
+    adjusted = collector.adjust_data_ranking(df.reset_index()).set_index("title")
+    assert adjusted.loc["MobLand", "platforms"] == ""
+    assert adjusted.loc["Andor", "platforms"] == "Disney Plus, Hulu"
+
+
+@pytest.mark.parametrize("max_titles", [0, 1, 3, 10, 20])
+def test_parse_ranking_max_titles(collector, html, max_titles):
+    df = collector.parse_ranking(html, max_titles=max_titles)
+
+    assert len(df) == min(max_titles, 10)
+    assert df["rank"].tolist() == [str(rank) for rank in range(1, min(max_titles, 10) + 1)]
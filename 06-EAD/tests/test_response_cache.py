@@ -0,0 +1,17 @@
+from datetime import date, timedelta
+
+from response_cache import ResponseCache
+
+
+def test_get_and_put_after_close_reopen_the_database(tmp_path):
+    cache = ResponseCache(str(tmp_path / "cache.sqlite"))
+    yesterday = date.today() - timedelta(days=1)
+    cache.put('count', ("topic", "01/01/2025"), 12, last_day=yesterday)
+    cache.close()
+
+    assert cache.get('count', ("topic", "01/01/2025")) == 12
+    cache.put('count', ("topic", "01/02/2025"), 7, last_day=yesterday)
+    cache.close()
+    cache.close()
+
+    assert ResponseCache(str(tmp_path / "cache.sqlite")).get('count', ("topic", "01/02/2025")) == 7
@@ -0,0 +1,108 @@
+import logging
+import queue
+import threading
+from contextlib import contextmanager
+
+from selenium.common.exceptions import NoSuchElementException, TimeoutException, WebDriverException
+
+logger = logging.getLogger(__name__)
+
+
+class WebDriverPool:
+    """
+    Pool limitado de drivers Selenium reutilizáveis.
+
+    Os drivers são criados sob demanda (nenhum navegador é aberto antes do primeiro uso),
+    até `max_drivers` simultâneos, e devolvidos ao pool após cada uso. Um driver que falha
+    com erro do navegador é descartado e substituído no próximo uso.
+    O pool deve ser fechado explicitamente com `close()` ou usado como context manager.
+    """
+
+    def __init__(self, create_driver, max_drivers=4):
+        """
+        Args:
+            create_driver (callable): Função sem argumentos que cria um novo driver
+            max_drivers (int): Número máximo de drivers abertos ao mesmo tempo
+        """
+        self.create_driver = create_driver
+        self.max_drivers = max_drivers
+        self._idle = queue.LifoQueue()
+        self._drivers = []
+        self._slots = threading.BoundedSemaphore(max_drivers)
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def _start(self):
+        driver = self.create_driver()
+        with self._lock:
+            self._drivers.append(driver)
+        logger.info(f"WebDriver iniciado ({len(self._drivers)}/{self.max_drivers})")
+        return driver
+
+    def _discard(self, driver):
+        with self._lock:
+            if driver in self._drivers:
+                self._drivers.remove(driver)
+        try:
+            driver.quit()
+        except Exception:
+            pass
+
+    def _release(self, driver):
+        if self._closed:
+            self._discard(driver)
+        else:
+            self._idle.put(driver)
+
+    @contextmanager
+    def driver(self):
+        """
+        Empresta um driver do pool, aguardando se todos estiverem em uso.
+
+        Yields:
+            WebDriver: Driver exclusivo enquanto o bloco `with` estiver ativo
+        """
+        if self._closed:
+            raise RuntimeError("WebDriverPool já foi fechado")
+        self._slots.acquire()
+        try:
+            try:
+                driver = self._idle.get_nowait()
+            except queue.Empty:
+                driver = self._start()
+            try:
+                yield driver
+            except (TimeoutException, NoSuchElementException):
+                # Elemento ausente na página: o navegador continua utilizável
+                self._release(driver)
+                raise
+            except WebDriverException:
+                # Sessão perdida ou navegador travado
+                logger.warning("WebDriver descartado após erro do navegador")
+                self._discard(driver)
+                raise
+            except BaseException:
+                self._release(driver)
+                raise
+            else:
+                self._release(driver)
+        finally:
+            self._slots.release()
+
+    def close(self):
+        """Fecha todos os drivers abertos pelo pool."""
+        self._closed = True
+        with self._lock:
+            drivers, self._drivers = self._drivers, []
+        for driver in drivers:
+            try:
+                driver.quit()
+            except Exception as e:
+                logger.warning(f"Erro ao fechar WebDriver: {e}")
+        self._idle = queue.LifoQueue()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()